@@ -0,0 +1,104 @@
+"""
+ファイルアクセス回数のベンチマーク
+
+ImageModel単体でのサムネイル生成と、os.scandirのスキャン結果を引き継ぐLoadWorkerの経路で、
+画像サイズ・ファイルサイズを含めて取得するまでのシステムコール数・時間を比較する。
+LoadWorkerは1枚あたり open 1回で、statはスキャン時（DirEntry）の1回のみになっていることを確認する。
+
+使い方:
+    python benchmarks/bench_file_access.py [画像フォルダ]
+    （フォルダ省略時は一時フォルダにテスト画像を生成）
+"""
+import builtins
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PIL import Image
+from PyQt6.QtGui import QGuiApplication
+from src.models.image_model import ImageModel
+from src.controllers.load_worker import LoadWorker
+from src.utils.constants import SUPPORTED_FORMATS
+from src.utils.scanner import scan_folder
+
+
+class AccessCounter:
+    """builtins.open と os.stat の呼び出し回数を数える"""
+
+    def __init__(self):
+        self.counts = Counter()
+        self._open = builtins.open
+        self._stat = os.stat
+
+    def __enter__(self):
+        def counting_open(file, *args, **kwargs):
+            self.counts["open"] += 1
+            return self._open(file, *args, **kwargs)
+
+        def counting_stat(path, *args, **kwargs):
+            self.counts["stat"] += 1
+            return self._stat(path, *args, **kwargs)
+
+        builtins.open = counting_open
+        os.stat = counting_stat
+        return self
+
+    def __exit__(self, *exc):
+        builtins.open = self._open
+        os.stat = self._stat
+
+
+def create_sample_images(folder: Path, count: int = 50):
+    """テスト用のJPEGを生成"""
+    for i in range(count):
+        Image.new('RGB', (4000, 3000), (i * 5 % 256, 120, 200)).save(folder / f"sample_{i:04d}.jpg", quality=90)
+
+
+def run_benchmark(folder: Path, thumbnail_size: int = 200):
+    files = sorted(str(p) for p in folder.iterdir() if p.suffix.lower() in SUPPORTED_FORMATS)
+    print(f"対象: {len(files)}枚 ({folder})")
+
+    # ImageModel単体: load_thumbnailで画像サイズも取得、file_sizeは参照時にstat
+    with AccessCounter() as counter:
+        start = time.perf_counter()
+        for file_path in files:
+            image = ImageModel(file_path)
+            image.load_thumbnail(thumbnail_size)
+            image.size, image.file_size
+        elapsed = time.perf_counter() - start
+    print(f"ImageModel + load_thumbnail : {elapsed:.2f}s  open={counter.counts['open']}  stat={counter.counts['stat']}")
+
+    # LoadWorker: スキャン時のstatとサムネイル生成時のヘッダを再利用
+    worker = LoadWorker(folder_path=str(folder), thumbnail_size=thumbnail_size, worker_mode="serial",
+                        use_disk_cache=False, exif_preview=False)
+    with AccessCounter() as counter:
+        start = time.perf_counter()
+        entries = scan_folder(str(folder))
+        images, _ = worker._load_images(entries)
+        elapsed = time.perf_counter() - start
+    print(f"scan_folder + LoadWorker    : {elapsed:.2f}s  open={counter.counts['open']}  stat={counter.counts['stat']}"
+          f"（+ DirEntry.stat {len(entries)}回）")
+    assert all(image.size != (0, 0) and image.file_size > 0 for image in images)
+
+
+def main():
+    app = QGuiApplication(sys.argv)
+
+    if len(sys.argv) > 1:
+        run_benchmark(Path(sys.argv[1]))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = Path(tmp)
+        create_sample_images(folder)
+        run_benchmark(folder)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+ImageModelのメモリ使用量・生成時間のベンチマーク
+
+大量（デフォルト10万件）のImageModelを生成し、1件あたりのメモリと生成時間を計測する。
+ファイルは実在しなくてよい（ヘッダ解析は size を参照するまで行われない）。
+
+使い方:
+    python benchmarks/bench_image_model.py [件数]
+"""
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.models.image_model import ImageModel
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    folder = os.path.join(os.path.sep, "photos", "2025", "trip")
+    paths = [os.path.join(folder, f"IMG_{i:06d}.jpg") for i in range(count)]
+
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+
+    start = time.perf_counter()
+    images = [ImageModel(path, file_size=0, image_size=(0, 0)) for path in paths]
+    elapsed = time.perf_counter() - start
+
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    used = after - before
+    print(f"件数: {count:,}")
+    print(f"生成時間: {elapsed:.3f}s（1件あたり {elapsed / count * 1e6:.2f}µs）")
+    print(f"メモリ: {used / 1024 / 1024:.1f} MB（1件あたり {used / count:.0f} bytes、ピーク {peak / 1024 / 1024:.1f} MB）")
+    assert len(images) == count
+
+
+if __name__ == "__main__":
+    main()
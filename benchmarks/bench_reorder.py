@@ -0,0 +1,58 @@
+"""
+並べ替え・削除のベンチマーク
+
+大量（デフォルト10万件）の画像から離れた位置の 5,000件 を選び、
+まとめて移動・Undo・Redo・削除・削除のUndo にかかる時間を計測する。
+ビューへの通知は含まない（ImageController のみ）。
+
+使い方:
+    python benchmarks/bench_reorder.py [件数] [選択件数]
+"""
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.controllers.image_controller import ImageController
+from src.models.image_model import ImageModel
+
+
+def measure(label: str, func):
+    start = time.perf_counter()
+    func()
+    print(f"{label:<20} {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    selected = int(sys.argv[2]) if len(sys.argv) > 2 else 5_000
+    folder = os.path.join(os.path.sep, "photos", "bench")
+
+    controller = ImageController()
+    controller.images = [ImageModel(os.path.join(folder, f"IMG_{i:06d}.jpg"), file_size=0, image_size=(0, 0))
+                         for i in range(count)]
+    controller._update_indices()
+    before = list(controller.images)
+
+    # 全体に散らばった選択（連続しない）
+    step = max(2, count // selected)
+    indices = list(range(1, count, step))[:selected]
+
+    print(f"件数: {count:,} / 選択: {len(indices):,}")
+    measure("先頭へ移動", lambda: controller.reorder_multiple(indices, 0))
+    measure("Undo", controller.undo)
+    measure("Redo", controller.redo)
+    measure("Undo", controller.undo)
+    measure("末尾へ移動", lambda: controller.reorder_multiple(indices, count))
+    measure("Undo", controller.undo)
+    measure("削除", lambda: controller.delete_images(indices))
+    measure("削除のUndo", controller.undo)
+
+    assert [img.file_path for img in controller.images] == [img.file_path for img in before]
+    assert all(img.index == i for i, img in enumerate(controller.images))
+
+
+if __name__ == "__main__":
+    main()
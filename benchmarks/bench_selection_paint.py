@@ -0,0 +1,171 @@
+"""
+選択切り替え時の描画時間のベンチマーク
+
+全選択・全解除を切り替えたときの1フレーム分（選択状態の反映 + 全セルの描画）の時間を、
+以前のセルごとのウィジェット（選択のたびに setStyleSheet を2回呼ぶ）と、
+ThumbnailDelegate による描画（生成済みのペン・ブラシを使い回す）で比較する。
+表示中のセル数として 1,000件・10,000件 を計測する（各セルを同じ大きさの画像に描画）。
+
+使い方:
+    python benchmarks/bench_selection_paint.py [件数 ...]
+"""
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication, QWidget, QLabel, QVBoxLayout, QStyleOptionViewItem
+from PyQt6.QtCore import Qt, QRect
+from PyQt6.QtGui import QImage, QPainter
+from src.models.image_model import ImageModel
+from src.models.selection_model import SelectionModel
+from src.views.thumbnail_grid import ThumbnailListModel, ThumbnailDelegate
+
+THUMBNAIL_SIZE = 48
+REPEAT = 3
+
+
+class StyleSheetCell(QWidget):
+    """以前の ThumbnailWidget と同じ方法（setStyleSheet）で選択状態を表すセル"""
+
+    def __init__(self, image: ImageModel, index: int):
+        super().__init__()
+        self.is_selected = False
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(5, 5, 5, 5)
+        self.thumbnail_label = QLabel()
+        self.thumbnail_label.setFixedSize(THUMBNAIL_SIZE, THUMBNAIL_SIZE)
+        layout.addWidget(self.thumbnail_label, alignment=Qt.AlignmentFlag.AlignCenter)
+
+        name_label = QLabel(image.filename)
+        name_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        name_label.setStyleSheet("font-size: 9pt;")
+        layout.addWidget(name_label)
+
+        number_label = QLabel(f"{index + 1:03d}")
+        number_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        number_label.setStyleSheet("font-size: 8pt; color: #666;")
+        layout.addWidget(number_label)
+
+        self.setLayout(layout)
+        self.update_style()
+
+    def update_style(self):
+        if self.is_selected:
+            self.thumbnail_label.setStyleSheet("""
+                QLabel {
+                    border: 5px solid #2196F3;
+                    border-radius: 4px;
+                    background-color: white;
+                }
+            """)
+            self.setStyleSheet("""
+                StyleSheetCell {
+                    background-color: #E3F2FD;
+                    border-radius: 8px;
+                }
+            """)
+        else:
+            self.thumbnail_label.setStyleSheet("""
+                QLabel {
+                    border: 2px solid #E0E0E0;
+                    border-radius: 2px;
+                    background-color: white;
+                }
+            """)
+            self.setStyleSheet("""
+                StyleSheetCell {
+                    background-color: white;
+                }
+                StyleSheetCell:hover {
+                    background-color: #F5F5F5;
+                }
+            """)
+
+    def set_selected(self, selected: bool):
+        self.is_selected = selected
+        self.update_style()
+
+
+def bench_stylesheet(app: QApplication, images: list[ImageModel]) -> float:
+    """setStyleSheet 方式の1フレームの時間（秒、切り替えの平均）"""
+    cells = [StyleSheetCell(image, i) for i, image in enumerate(images)]
+    for cell in cells:
+        cell.adjustSize()
+    canvas = QImage(cells[0].size(), QImage.Format.Format_ARGB32_Premultiplied)
+
+    # 初回の polish を計測から除外
+    for cell in cells:
+        cell.render(canvas)
+
+    elapsed = 0.0
+    for i in range(REPEAT * 2):
+        selected = i % 2 == 0
+        start = time.perf_counter()
+        for cell in cells:
+            cell.set_selected(selected)
+        app.processEvents()
+        for cell in cells:
+            cell.render(canvas)
+        elapsed += time.perf_counter() - start
+
+    for cell in cells:
+        cell.deleteLater()
+    app.processEvents()
+    return elapsed / (REPEAT * 2)
+
+
+def bench_delegate(app: QApplication, images: list[ImageModel]) -> float:
+    """ThumbnailDelegate 方式の1フレームの時間（秒、切り替えの平均）"""
+    model = ThumbnailListModel()
+    model.set_images(images)
+    delegate = ThumbnailDelegate(thumbnail_size=THUMBNAIL_SIZE)
+    delegate.lazy_load = False
+    selection = SelectionModel()
+
+    cell = delegate.cell_size()
+    canvas = QImage(cell, QImage.Format.Format_ARGB32_Premultiplied)
+    option = QStyleOptionViewItem()
+    option.rect = QRect(0, 0, cell.width(), cell.height())
+    option.palette = app.palette()
+    indexes = [model.index(row) for row in range(len(images))]
+
+    elapsed = 0.0
+    for i in range(REPEAT * 2):
+        start = time.perf_counter()
+        changed = selection.select_all(len(images)) if i % 2 == 0 else selection.clear()
+        for row in changed:
+            images[row].selected = row in selection
+        painter = QPainter(canvas)
+        for index in indexes:
+            delegate.paint(painter, option, index)
+        painter.end()
+        elapsed += time.perf_counter() - start
+
+    return elapsed / (REPEAT * 2)
+
+
+def main():
+    counts = [int(arg) for arg in sys.argv[1:]] or [1_000, 10_000]
+    app = QApplication.instance() or QApplication(sys.argv)
+    folder = os.path.join(os.path.sep, "photos", "bench")
+
+    print(f"サムネイルサイズ: {THUMBNAIL_SIZE}px（切り替え {REPEAT * 2} 回の平均）")
+    for count in counts:
+        images = [ImageModel(os.path.join(folder, f"IMG_{i:06d}.jpg"), file_size=0, image_size=(0, 0))
+                  for i in range(count)]
+
+        before = bench_stylesheet(app, images)
+        after = bench_delegate(app, images)
+        print(
+            f"{count:>6,}件: setStyleSheet {before * 1000:8.1f} ms / "
+            f"描画 {after * 1000:7.1f} ms （{before / after:.1f}倍）"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+並べ替えのベンチマーク
+
+大量（デフォルト10万件）の画像を名前順（自然順）・複数キーで並べ替える時間を計測する。
+初回（自然順のキーを作成）と2回目以降（ImageModelにキャッシュしたキーを使う）を比べ、
+比較用に作成済みのキーのリストだけを sorted した時間（ソート自体の時間）も示す。
+ファイルは実在しなくてよい（更新日時・画像サイズはスキャン・ヘッダの値として与える）。
+
+使い方:
+    python benchmarks/bench_sort.py [件数]
+"""
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.models.image_model import ImageModel
+from src.models.image_sort import sorted_images
+
+
+def measure(label: str, func):
+    start = time.perf_counter()
+    func()
+    print(f"{label:<28} {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    folder = os.path.join(os.path.sep, "photos", "bench")
+
+    random.seed(0)
+    images = [
+        ImageModel(
+            os.path.join(folder, f"IMG_{random.randrange(count * 10)}_{i % 7}.jpg"),
+            file_size=random.randrange(1 << 20),
+            image_size=random.choice([(4000, 3000), (3000, 4000), (1920, 1080), (1080, 1080)]),
+            mtime_ns=random.randrange(1 << 40)
+        )
+        for i in range(count)
+    ]
+
+    print(f"件数: {count:,}")
+    measure("名前（初回、キー作成を含む）", lambda: sorted_images(images, [("name", True)]))
+    measure("名前（2回目、キャッシュ）", lambda: sorted_images(images, [("name", False)]))
+    keys = [image.name_key for image in images]
+    measure("参考: キーのリストのみ sorted", lambda: sorted(keys))
+    measure("更新日時 → 名前", lambda: sorted_images(images, [("mtime", False), ("name", True)]))
+    measure("縦横比 → 画素数 → 名前", lambda: sorted_images(
+        images, [("aspect", True), ("pixels", False), ("name", True)]
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 """SortSnap メインエントリーポイント"""
+import multiprocessing
 import sys
 import time
 from PyQt6.QtWidgets import QApplication
@@ -27,4 +28,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # PyInstaller等でexe化した場合、読み込みのプロセスプールのワーカーがGUIを起動し直さないようにする
+    multiprocessing.freeze_support()
     main()
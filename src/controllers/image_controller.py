@@ -1,9 +1,27 @@
 """画像操作コントローラー"""
-import os
-from pathlib import Path
+from array import array
+from typing import NamedTuple
 from src.models.image_model import ImageModel
+from src.models.image_sort import sorted_images
 from src.models.history_model import HistoryModel
-from src.utils.constants import SUPPORTED_FORMATS
+from src.models.tombstone_store import TombstoneStore
+from src.utils.scanner import scan_folder, scan_files
+
+
+class ImageChange(NamedTuple):
+    """
+    画像リストの変更内容（ビューへの差分通知用）
+
+    kind:
+        "move": rows[0]〜rows[-1]（連続）を destination に移動（destinationは移動後の先頭位置）
+        "remove": rows（連続）を削除
+        "insert": rows（連続、挿入後の位置）に挿入
+        "reorder": 件数はそのままで並び順が変わった（ソート・離れた複数画像の移動など）
+        "reset": リスト全体が入れ替わった（離れた複数範囲の削除・挿入を含む）
+    """
+    kind: str
+    rows: tuple[int, ...] = ()
+    destination: int = -1
 
 
 class ImageController:
@@ -11,9 +29,40 @@ class ImageController:
 
     def __init__(self):
         self.images: list[ImageModel] = []
-        self.history: HistoryModel = HistoryModel()
+        self.tombstones: TombstoneStore = TombstoneStore()  # 削除した画像（Undo用）
+        self.history: HistoryModel = HistoryModel(on_discard=self._on_history_discard)
+        self.journal = None  # 変更を追記する SessionJournal（Noneの場合は記録しない）
         self.original_order: list[ImageModel] = []
 
+        # 変更通知の受け取り先 listener(change, done)
+        # 変更の直前に done=False、直後に done=True で呼ばれる
+        self._listeners: list = []
+
+    def add_listener(self, listener):
+        """
+        画像リストの変更通知を受け取る関数を登録
+
+        Args:
+            listener: listener(change: ImageChange, done: bool)
+        """
+        self._listeners.append(listener)
+
+    def _notify(self, change: ImageChange, done: bool):
+        """変更を通知"""
+        for listener in self._listeners:
+            listener(change, done)
+
+    def _record(self, kind: str, numbers, names: list[str] = None):
+        """画像リストの変更を作業記録に追記"""
+        if self.journal is not None:
+            self.journal.record(kind, numbers, names)
+
+    def _on_history_discard(self, action: dict):
+        """履歴から破棄された記録（削除・削除した画像を戻した元の順序）が保持していた画像を手放す"""
+        tombstone = action["data"].get("tombstone")
+        if tombstone is not None:
+            self.tombstones.release(tombstone)
+
     def load_from_folder(self, folder_path: str) -> list[ImageModel]:
         """
         フォルダから画像を読み込み
@@ -29,49 +78,15 @@ class ImageController:
             NotADirectoryError: 指定されたパスがディレクトリでない場合
             PermissionError: フォルダへのアクセス権限がない場合
         """
-        self.images.clear()
-        self.history.clear()
-        self.original_order.clear()
-
-        folder = Path(folder_path)
-
-        # フォルダの存在確認
-        if not folder.exists():
-            raise FileNotFoundError(f"フォルダが見つかりません: {folder_path}")
-
-        # ディレクトリ確認
-        if not folder.is_dir():
-            raise NotADirectoryError(f"指定されたパスはフォルダではありません: {folder_path}")
+        # 列挙と同時にstatを取得し、ファイルサイズはそのまま使う
+        entries = scan_folder(folder_path)
 
-        try:
-            # glob使用時は角括弧などをエスケープする必要がある
-            # より確実な方法として、iterdir()で全ファイルを取得してフィルタリング
-            image_files = []
-            for file_path in folder.iterdir():
-                if file_path.is_file():
-                    ext = file_path.suffix.lower()
-                    if ext in SUPPORTED_FORMATS:
-                        image_files.append(str(file_path))
+        self._reset_images(entries)
 
-            # ソート
-            image_files = sorted(image_files)
-
-            # ImageModelを作成
-            for i, file_path in enumerate(image_files):
-                try:
-                    image = ImageModel(file_path)
-                    image.index = i
-                    self.images.append(image)
-                except Exception as e:
-                    print(f"画像読み込みエラー: {file_path}, {e}")
-
-            # 元の順序を保存
-            self.original_order = self.images.copy()
-
-            return self.images
+        # 元の順序を保存
+        self.original_order = self.images.copy()
 
-        except PermissionError as e:
-            raise PermissionError(f"フォルダへのアクセス権限がありません: {folder_path}") from e
+        return self.images
 
     def load_from_files(self, file_paths: list[str]) -> list[ImageModel]:
         """
@@ -83,25 +98,10 @@ class ImageController:
         Returns:
             画像モデルのリスト
         """
-        self.images.clear()
-        self.history.clear()
-        self.original_order.clear()
+        # 対応形式のみフィルタ（存在しないファイルは除外）
+        entries = scan_files(file_paths)
 
-        # 対応形式のみフィルタ
-        valid_files = []
-        for file_path in file_paths:
-            ext = os.path.splitext(file_path)[1].lower()
-            if ext in SUPPORTED_FORMATS:
-                valid_files.append(file_path)
-
-        # ImageModelを作成
-        for i, file_path in enumerate(valid_files):
-            try:
-                image = ImageModel(file_path)
-                image.index = i
-                self.images.append(image)
-            except Exception as e:
-                print(f"画像読み込みエラー: {file_path}, {e}")
+        self._reset_images(entries)
 
         # 元の順序を保存
         self.original_order = self.images.copy()
@@ -128,17 +128,12 @@ class ImageController:
             "type": "reorder",
             "data": {
                 "from_index": from_index,
-                "to_index": to_index,
-                "order": [img.file_path for img in self.images]
+                "to_index": to_index
             }
         })
 
         # 順序を変更
-        image = self.images.pop(from_index)
-        self.images.insert(to_index, image)
-
-        # インデックスを更新
-        self._update_indices()
+        self._move_rows(from_index, from_index, to_index)
 
     def reorder_multiple(self, indices: list[int], to_index: int):
         """
@@ -152,36 +147,18 @@ class ImageController:
             return
 
         # インデックスを昇順ソート
-        sorted_indices = sorted(set(indices))
+        sorted_indices = array('I', sorted(set(indices)))
 
         # 履歴に記録
         self.history.push({
             "type": "reorder_multiple",
             "data": {
                 "indices": sorted_indices,
-                "to_index": to_index,
-                "order": [img.file_path for img in self.images]
+                "to_index": to_index
             }
         })
 
-        # 移動する画像を取得
-        moving_images = [self.images[i] for i in sorted_indices]
-
-        # 降順で削除（インデックスがずれないように）
-        for i in reversed(sorted_indices):
-            self.images.pop(i)
-
-        # 挿入位置を調整（削除した画像の数だけずれる）
-        # to_indexより前にいくつ削除したかをカウント
-        deleted_before = sum(1 for i in sorted_indices if i < to_index)
-        adjusted_to_index = to_index - deleted_before
-
-        # 移動する画像を一括挿入
-        for i, image in enumerate(moving_images):
-            self.images.insert(adjusted_to_index + i, image)
-
-        # インデックスを更新
-        self._update_indices()
+        self._move_multiple(sorted_indices, to_index)
 
     def delete_images(self, indices: list[int]):
         """
@@ -190,28 +167,20 @@ class ImageController:
         Args:
             indices: 削除するインデックスのリスト
         """
-        if not indices:
+        rows = array('I', sorted(i for i in set(indices) if 0 <= i < len(self.images)))
+        if not rows:
             return
 
-        # 削除する画像を記録
-        deleted_images = [(i, self.images[i]) for i in sorted(indices, reverse=True)]
-
-        # 履歴に記録
+        # 削除実行（削除した画像はキャッシュごと保持し、履歴には位置と保持した番号を記録）
+        removed = self._remove_rows(rows)
         self.history.push({
             "type": "delete",
             "data": {
-                "deleted_images": [(i, img.file_path) for i, img in deleted_images]
+                "rows": rows,
+                "tombstone": self.tombstones.park(removed)
             }
         })
 
-        # 削除実行
-        for i in sorted(indices, reverse=True):
-            if 0 <= i < len(self.images):
-                self.images.pop(i)
-
-        # インデックスを更新
-        self._update_indices()
-
     def sort_by_name(self, ascending: bool = True):
         """
         ファイル名順にソート（履歴に記録）
@@ -219,43 +188,53 @@ class ImageController:
         Args:
             ascending: 昇順かどうか
         """
-        # 履歴に記録
-        self.history.push({
-            "type": "sort",
-            "data": {
-                "order": [img.file_path for img in self.images],
-                "ascending": ascending
-            }
-        })
+        self.sort_by([("name", ascending)])
 
-        # 自然順ソート
-        import re
-        def natural_sort_key(img: ImageModel):
-            return [int(text) if text.isdigit() else text.lower()
-                    for text in re.split(r'(\d+)', img.filename)]
-
-        self.images.sort(key=natural_sort_key, reverse=not ascending)
+    def sort_by(self, keys: list[tuple[str, bool]]):
+        """
+        複数キーで安定ソート（履歴に記録）
 
-        # インデックスを更新
-        self._update_indices()
+        Args:
+            keys: (キーの名前, 昇順かどうか) のリスト（先頭ほど優先、キーは image_sort.SORT_KEYS）
+        """
+        self._sort(sorted_images(self.images, keys), {"keys": list(keys)})
 
     def restore_original_order(self):
-        """元の順序に戻す"""
+        """
+        元の順序に戻す（履歴に記録）
+
+        削除済みの画像も読み込み時の画像オブジェクトのまま戻す。削除済みの画像を末尾に
+        挿入してから全体を並べ替えるため、履歴には挿入した画像（保持した番号）と
+        並べ替え配列を記録する。
+        """
         if not self.original_order:
             return
 
-        # 履歴に記録
-        self.history.push({
-            "type": "sort",
-            "data": {
-                "order": [img.file_path for img in self.images],
-                "restore": True
-            }
-        })
+        present = {id(img) for img in self.images}
+        missing = [img for img in self.original_order if id(img) not in present]
+        data = {"restore": True}
+        if missing:
+            data["tombstone"] = self.tombstones.park(missing)
+            self._insert_rows(len(self.images), missing)
+
+        rank = {id(img): i for i, img in enumerate(self.original_order)}
+        end = len(rank)
+        order = sorted(self.images, key=lambda img: rank.get(id(img), end))
+        self._sort(order, data)
 
-        # 元の順序に復元
-        self.images = self.original_order.copy()
-        self._update_indices()
+    def _sort(self, order: list[ImageModel], data: dict):
+        """
+        並び順全体を変更（並べ替え配列を履歴に記録）
+
+        Args:
+            order: 新しい並び順の画像リスト（件数・内容は同じ）
+            data: 履歴に一緒に記録する内容
+        """
+        # 新しい各位置に来る画像の現在の位置
+        permutation = array('I', [img.index for img in order])
+        data["permutation"] = permutation
+        self.history.push({"type": "sort", "data": data})
+        self._permute(0, permutation)
 
     def undo(self) -> bool:
         """
@@ -272,27 +251,30 @@ class ImageController:
         data = action["data"]
 
         if action_type == "reorder":
-            # 順序を復元
-            self._restore_order(data["order"])
+            # 移動した1枚を元の位置に戻す
+            self._move_rows(data["to_index"], data["to_index"], data["from_index"])
 
         elif action_type == "reorder_multiple":
-            # 複数画像の順序を復元
-            self._restore_order(data["order"])
+            # 移動したまとまりを元の位置に戻す（移動の逆置換）
+            indices = data["indices"]
+            first = self._multiple_destination(indices, data["to_index"])
+            if indices[-1] - indices[0] + 1 == len(indices):
+                self._move_rows(first, first + len(indices) - 1, indices[0])
+            else:
+                start, permutation = self._multiple_permutation(indices, first)
+                self._permute(start, _inverse_permutation(start, permutation))
 
         elif action_type == "delete":
-            # 削除された画像を復元
-            for i, file_path in data["deleted_images"]:
-                try:
-                    image = ImageModel(file_path)
-                    self.images.insert(i, image)
-                except Exception as e:
-                    print(f"画像復元エラー: {file_path}, {e}")
+            # 削除した画像オブジェクトをそのまま元の位置に戻す（前から順に挿入）
+            self._insert_runs(_contiguous_runs(data["rows"], self.tombstones.get(data["tombstone"])))
 
         elif action_type == "sort":
-            # 順序を復元
-            self._restore_order(data["order"])
+            # 並べ替えの逆置換で順序を復元（元の順序に戻すときに戻した削除済みの画像は末尾から外す）
+            self._permute(0, _inverse_permutation(0, data["permutation"]))
+            if "tombstone" in data:
+                count = len(self.tombstones.get(data["tombstone"]))
+                self._remove_rows(range(len(self.images) - count, len(self.images)))
 
-        self._update_indices()
         return True
 
     def redo(self) -> bool:
@@ -312,62 +294,246 @@ class ImageController:
         if action_type == "reorder":
             # 元のfrom_indexとto_indexを使って再度並べ替え
             # ただし、履歴に追加しないように直接操作
-            from_index = data["from_index"]
-            to_index = data["to_index"]
-            image = self.images.pop(from_index)
-            self.images.insert(to_index, image)
+            self._move_rows(data["from_index"], data["from_index"], data["to_index"])
 
         elif action_type == "reorder_multiple":
             # 複数画像の順序変更を再実行
-            indices = data["indices"]
-            to_index = data["to_index"]
-
-            # 移動する画像を取得
-            moving_images = [self.images[i] for i in indices]
-
-            # 降順で削除
-            for i in reversed(indices):
-                self.images.pop(i)
-
-            # 挿入位置を調整
-            deleted_before = sum(1 for i in indices if i < to_index)
-            adjusted_to_index = to_index - deleted_before
-
-            # 移動する画像を一括挿入
-            for i, image in enumerate(moving_images):
-                self.images.insert(adjusted_to_index + i, image)
+            self._move_multiple(data["indices"], data["to_index"])
 
         elif action_type == "delete":
             # 再度削除
-            for i, file_path in sorted(data["deleted_images"], reverse=True):
-                if 0 <= i < len(self.images):
-                    self.images.pop(i)
+            self._remove_rows(data["rows"])
 
         elif action_type == "sort":
-            if "restore" in data:
-                self.images = self.original_order.copy()
-            elif "ascending" in data:
-                self.sort_by_name(data["ascending"])
-                return True  # sort_by_nameが既にインデックス更新する
+            # 記録した並べ替えを再適用（ソートし直さない）
+            if "tombstone" in data:
+                self._insert_rows(len(self.images), list(self.tombstones.get(data["tombstone"])))
+            self._permute(0, data["permutation"])
 
-        self._update_indices()
         return True
 
-    def _update_indices(self):
-        """インデックスを更新"""
-        for i, img in enumerate(self.images):
-            img.index = i
+    def _move_multiple(self, sorted_indices: list[int], to_index: int):
+        """
+        複数の画像をまとめて移動（移動先に連続して並べる）
+
+        Args:
+            sorted_indices: 移動する画像のインデックス（昇順）
+            to_index: 移動先のインデックス
+        """
+        # 移動元が連続している場合は1回の移動として通知
+        first, last = sorted_indices[0], sorted_indices[-1]
+        destination = self._multiple_destination(sorted_indices, to_index)
+        if last - first + 1 == len(sorted_indices):
+            self._move_rows(first, last, destination)
+            return
+
+        self._permute(*self._multiple_permutation(sorted_indices, destination))
+
+    def _multiple_permutation(self, sorted_indices: list[int], destination: int) -> tuple[int, array]:
+        """
+        まとめて移動したときに位置が変わる範囲と、その範囲の並び（移動前の位置の配列）
+
+        移動しない画像の位置は移動する画像の間の区間（range）をつなげて作り、
+        移動先の位置で移動する画像の位置を差し込む。
 
-    def _restore_order(self, file_paths: list[str]):
+        Args:
+            sorted_indices: 移動する画像のインデックス（昇順）
+            destination: 移動後の先頭位置
+
+        Returns:
+            (範囲の先頭位置, 範囲内の各位置に来る画像の移動前の位置)
         """
-        順序を復元
+        count = len(sorted_indices)
+        start = min(sorted_indices[0], destination)
+        end = max(sorted_indices[-1] + 1, destination + count)
+
+        rest = array('I')
+        prev = start
+        for i in sorted_indices:
+            rest.extend(range(prev, i))
+            prev = i + 1
+        rest.extend(range(prev, end))
+
+        offset = destination - start
+        return start, rest[:offset] + array('I', sorted_indices) + rest[offset:]
+
+    def _multiple_destination(self, sorted_indices: list[int], to_index: int) -> int:
+        """まとめて移動した画像の移動後の先頭位置"""
+        # to_indexより前にいくつ取り出したかだけずれる
+        deleted_before = sum(1 for i in sorted_indices if i < to_index)
+        remaining = len(self.images) - len(sorted_indices)
+        return max(0, min(to_index - deleted_before, remaining))
+
+    def _move_rows(self, first: int, last: int, destination: int):
+        """
+        連続した画像を移動（差分を通知）
 
         Args:
-            file_paths: ファイルパスのリスト
+            first: 移動する先頭のインデックス
+            last: 移動する末尾のインデックス
+            destination: 移動後の先頭のインデックス
+        """
+        if first == destination:
+            return
+
+        change = ImageChange("move", tuple(range(first, last + 1)), destination)
+        self._notify(change, False)
+
+        moving = self.images[first:last + 1]
+        del self.images[first:last + 1]
+        self.images[destination:destination] = moving
+
+        # 位置が変わった範囲だけインデックスを振り直す
+        self._update_indices(min(first, destination), max(last, destination + len(moving) - 1) + 1)
+        self._record("move", (first, last, destination))
+        self._notify(change, True)
+
+    def _permute(self, start: int, permutation: array):
+        """
+        範囲内の画像を並べ替え（位置が変わった範囲だけインデックスを振り直して通知）
+
+        Args:
+            start: 範囲の先頭位置
+            permutation: 範囲内の各位置に来る画像の並べ替え前の位置
+        """
+        if not permutation:
+            return
+
+        end = start + len(permutation)
+        change = ImageChange("reorder")
+        self._notify(change, False)
+        self.images[start:end] = list(map(self.images.__getitem__, permutation))
+        self._update_indices(start, end)
+        self._record("permute", array('I', (start,)) + array('I', permutation))
+        self._notify(change, True)
+
+    def _remove_rows(self, rows) -> list[ImageModel]:
+        """
+        画像を削除（差分を通知）
+
+        連続した1範囲なら削除として通知し、離れた複数の範囲は残す区間をつなげて
+        リストを1回で作り直し、全体の入れ替えとして通知する。
+
+        Args:
+            rows: 削除するインデックス
+
+        Returns:
+            削除した画像のリスト（元の順序）
+        """
+        rows = sorted(i for i in set(rows) if 0 <= i < len(self.images))
+        if not rows:
+            return []
+        removed = [self.images[i] for i in rows]
+
+        runs = _contiguous_runs(rows, rows)
+        if len(runs) == 1:
+            change = ImageChange("remove", tuple(rows))
+            self._notify(change, False)
+            del self.images[rows[0]:rows[-1] + 1]
+        else:
+            change = ImageChange("reset")
+            self._notify(change, False)
+            kept = []
+            prev = 0
+            for start, run in runs:
+                kept.extend(self.images[prev:start])
+                prev = start + len(run)
+            kept.extend(self.images[prev:])
+            self.images[:] = kept
+
+        self._update_indices(rows[0])
+        self._record("remove", rows)
+        self._notify(change, True)
+        return removed
+
+    def _insert_rows(self, row: int, images: list[ImageModel]):
+        """
+        画像を連続して挿入（差分を通知）
+
+        Args:
+            row: 挿入位置
+            images: 挿入する画像
+        """
+        if not images:
+            return
+
+        row = max(0, min(row, len(self.images)))
+        change = ImageChange("insert", tuple(range(row, row + len(images))))
+        self._notify(change, False)
+        self.images[row:row] = images
+        self._update_indices(row)
+        self._record("insert", range(row, row + len(images)), [img.filename for img in images])
+        self._notify(change, True)
+
+    def _insert_runs(self, runs: list[tuple[int, list[ImageModel]]]):
+        """
+        離れた複数の範囲に挿入（既存の区間と挿入する画像をつなげてリストを1回で作り直す）
+
+        Args:
+            runs: (挿入後の先頭位置, 画像のリスト) のリスト（位置の昇順）
+        """
+        if len(runs) <= 1:
+            for row, images in runs:
+                self._insert_rows(row, images)
+            return
+
+        change = ImageChange("reset")
+        self._notify(change, False)
+
+        merged = []
+        prev = 0
+        for row, images in runs:
+            take = max(0, row - len(merged))
+            merged.extend(self.images[prev:prev + take])
+            prev += take
+            merged.extend(images)
+        merged.extend(self.images[prev:])
+        self.images[:] = merged
+
+        self._update_indices(runs[0][0])
+        self._record(
+            "insert",
+            [row + offset for row, images in runs for offset in range(len(images))],
+            [img.filename for _, images in runs for img in images]
+        )
+        self._notify(change, True)
+
+    def _reset_images(self, entries: list):
+        """
+        スキャン結果から画像リストを作り直す（履歴はクリア）
+
+        Args:
+            entries: スキャン結果のリスト
         """
-        # ファイルパスでソート
-        path_to_image = {img.file_path: img for img in self.images}
-        self.images = [path_to_image[path] for path in file_paths if path in path_to_image]
+        change = ImageChange("reset")
+        self._notify(change, False)
+
+        self.images.clear()
+        self.history.clear()
+        self.original_order.clear()
+
+        # ImageModelを作成
+        for i, entry in enumerate(entries):
+            try:
+                image = ImageModel(entry.path, file_size=entry.size, mtime_ns=entry.mtime_ns)
+                image.index = i
+                self.images.append(image)
+            except Exception as e:
+                print(f"画像読み込みエラー: {entry.path}, {e}")
+
+        self._notify(change, True)
+
+    def _update_indices(self, start: int = 0, end: int = None):
+        """
+        インデックスを更新
+
+        Args:
+            start: 更新する先頭の位置
+            end: 更新する末尾の次の位置（Noneの場合は最後まで）
+        """
+        end = len(self.images) if end is None else min(end, len(self.images))
+        for i in range(start, end):
+            self.images[i].index = i
 
     def get_selected_images(self) -> list[ImageModel]:
         """選択された画像のリストを取得"""
@@ -393,3 +559,40 @@ class ImageController:
         for i in range(start, end + 1):
             if 0 <= i < len(self.images):
                 self.images[i].selected = True
+
+
+def _inverse_permutation(start: int, permutation: array) -> array:
+    """
+    並べ替えを元に戻す並び（範囲の先頭位置 start からの位置の配列）
+
+    Args:
+        start: 範囲の先頭位置
+        permutation: 範囲内の各位置に来る画像の並べ替え前の位置
+
+    Returns:
+        並べ替え後の範囲を元に戻すための permutation
+    """
+    inverse = array('I', permutation)
+    for position, source in enumerate(permutation, start):
+        inverse[source - start] = position
+    return inverse
+
+
+def _contiguous_runs(rows: list[int], items: list) -> list[tuple[int, list]]:
+    """
+    昇順のインデックスを連続した範囲ごとにまとめる
+
+    Args:
+        rows: インデックス（昇順）
+        items: 各インデックスに対応する要素
+
+    Returns:
+        (範囲の先頭インデックス, その範囲の要素のリスト) のリスト
+    """
+    runs = []
+    for row, item in zip(rows, items):
+        if runs and runs[-1][0] + len(runs[-1][1]) == row:
+            runs[-1][1].append(item)
+        else:
+            runs.append((row, [item]))
+    return runs
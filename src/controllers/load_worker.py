@@ -1,8 +1,21 @@
 """非同期画像読み込みワーカー"""
+import os
+import threading
+import time
+from typing import NamedTuple
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed, wait, FIRST_COMPLETED
 from PyQt6.QtCore import QThread, pyqtSignal
-from pathlib import Path
-from src.models.image_model import ImageModel
-from src.utils.constants import SUPPORTED_FORMATS
+from src.models.image_model import ImageModel, decode_thumbnail, extract_exif_thumbnail
+from src.models.thumbnail_cache import ThumbnailDiskCache, encode_thumbnail_blob, decode_thumbnail_blob
+from src.utils.constants import (
+    DEFAULT_LOAD_WORKERS, LOAD_WORKER_MODES, DEFAULT_LOAD_WORKER_MODE,
+    DEFAULT_THUMBNAIL_CACHE_MAX_MB,
+    STREAM_BATCH_MAX, STREAM_BATCH_INTERVAL_MS, VIEWPORT_PREFETCH_PAGES
+)
+from src.utils.scanner import ScanEntry, scan_folder, scan_files
+
+# 未完了を表す番兵（失敗時の結果Noneと区別する）
+_PENDING = object()
 
 
 class LoadWorker(QThread):
@@ -11,92 +24,548 @@ class LoadWorker(QThread):
     # シグナル
     progress = pyqtSignal(int, str)  # (現在の処理数, ファイル名)
     finished = pyqtSignal(list)  # (ImageModelのリスト)
+    batch_ready = pyqtSignal(list)  # (追加するImageModelのリスト、サムネイル未生成) - ストリーミング時のみ
+    thumbnails_ready = pyqtSignal(list)  # (サムネイルを生成したImageModelのリスト) - ストリーミング時のみ
     error = pyqtSignal(str)  # エラーメッセージ
+    thumbnail_refined = pyqtSignal(object, bytes, int, int, object)  # (ImageModel, RGBバイト列, 幅, 高さ, 画像サイズ or None)
 
-    def __init__(self, folder_path: str = None, file_paths: list[str] = None, thumbnail_size: int = 200):
+    def __init__(
+        self,
+        folder_path: str = None,
+        file_paths: list[str] = None,
+        entries: list[ScanEntry] = None,
+        thumbnail_size: int = 200,
+        max_workers: int = DEFAULT_LOAD_WORKERS,
+        worker_mode: str = DEFAULT_LOAD_WORKER_MODE,
+        use_disk_cache: bool = True,
+        disk_cache_max_bytes: int = DEFAULT_THUMBNAIL_CACHE_MAX_MB * 1024 * 1024,
+        exif_preview: bool = False,
+        streaming: bool = False
+    ):
         """
         Args:
             folder_path: フォルダパス（フォルダモード）
             file_paths: ファイルパスのリスト（ファイルモード）
+            entries: スキャン済みのエントリ（指定時はフォルダ・ファイルの再スキャンを省略）
             thumbnail_size: サムネイルサイズ
+            max_workers: デコードの並列数（0以下はCPUコア数に合わせて自動）
+            worker_mode: "thread"（GILを解放するPillowのデコードをスレッドで並列化）、
+                         "process"（プロセスプール）、"serial"（並列化しない）
+            use_disk_cache: ディスクキャッシュを使用するか
+            disk_cache_max_bytes: ディスクキャッシュの上限バイト数
+            exif_preview: EXIF埋め込みサムネイルで先に表示し、完了後にバックグラウンドで高画質化するか
+            streaming: 全画像を batch_ready で先に通知し、サムネイルは表示範囲を優先して
+                       生成しながら thumbnails_ready で順次通知するか
         """
         super().__init__()
         self.folder_path = folder_path
         self.file_paths = file_paths
+        self.entries = entries
         self.thumbnail_size = thumbnail_size
+        self.max_workers = max_workers if max_workers > 0 else (os.cpu_count() or 1)
+        self.worker_mode = worker_mode if worker_mode in LOAD_WORKER_MODES else DEFAULT_LOAD_WORKER_MODE
+        self.use_disk_cache = use_disk_cache
+        self.disk_cache_max_bytes = disk_cache_max_bytes
+        self.exif_preview = exif_preview
+        self.streaming = streaming
+
+        # 表示中の範囲（GUIスレッドから set_visible_range で更新）
+        self._visible_lock = threading.Lock()
+        self._visible_range: tuple[int, int] = None
+        self._visible_version = 0
+
+    def set_visible_range(self, first: int, last: int):
+        """
+        表示中の範囲を設定（GUIスレッドから呼び出す）
+
+        未着手のサムネイル生成はこの範囲に近いものから順に行う
+
+        Args:
+            first: 先頭のインデックス
+            last: 末尾のインデックス
+        """
+        with self._visible_lock:
+            self._visible_range = (first, last)
+            self._visible_version += 1
+
+    def _get_visible_range(self) -> tuple[tuple[int, int] | None, int]:
+        """(表示中の範囲 or None, 更新回数) を返す"""
+        with self._visible_lock:
+            return self._visible_range, self._visible_version
 
     def run(self):
         """読み込み処理を実行"""
         try:
-            images = []
+            # スキャン済みのエントリがあればそれを使う（再列挙・再statしない）
+            if self.entries is not None:
+                entries = self.entries
 
             # フォルダモード
-            if self.folder_path:
-                folder = Path(self.folder_path)
-
-                # フォルダの存在確認
-                if not folder.exists():
-                    self.error.emit(f"フォルダが見つかりません: {self.folder_path}")
-                    return
-
-                # ディレクトリ確認
-                if not folder.is_dir():
-                    self.error.emit(f"指定されたパスはフォルダではありません: {self.folder_path}")
-                    return
-
-                # 画像ファイルを検出
-                image_files = []
+            elif self.folder_path:
                 try:
-                    for file_path in folder.iterdir():
-                        if file_path.is_file():
-                            ext = file_path.suffix.lower()
-                            if ext in SUPPORTED_FORMATS:
-                                image_files.append(str(file_path))
-                except PermissionError as e:
-                    self.error.emit(f"フォルダへのアクセス権限がありません: {self.folder_path}")
+                    entries = scan_folder(self.folder_path)
+                except (FileNotFoundError, NotADirectoryError, PermissionError) as e:
+                    self.error.emit(str(e))
                     return
 
-                # ソート
-                image_files = sorted(image_files)
-
             # ファイルモード
             elif self.file_paths:
-                image_files = []
-                for file_path in self.file_paths:
-                    ext = Path(file_path).suffix.lower()
-                    if ext in SUPPORTED_FORMATS:
-                        image_files.append(file_path)
+                entries = scan_files(self.file_paths)
 
             else:
                 self.error.emit("フォルダパスまたはファイルパスが指定されていません")
                 return
 
             # 画像がない場合
-            if not image_files:
+            if not entries:
                 self.finished.emit([])
                 return
 
             # ImageModelを作成し、サムネイルを事前生成
-            for i, file_path in enumerate(image_files):
-                try:
-                    # ImageModel作成
-                    image = ImageModel(file_path)
-                    image.index = i
+            if self.streaming:
+                images, pending_refine = self._stream_images(entries)
+            else:
+                images, pending_refine = self._load_images(entries)
+
+            # 中断された場合は結果を通知しない（新しい読み込みに置き換え済み）
+            if self.isInterruptionRequested():
+                return
+
+            # 完了
+            self.finished.emit(images)
+
+            # EXIFプレビューで表示したものを高画質化
+            if pending_refine:
+                self._refine_thumbnails(pending_refine)
+
+        except Exception as e:
+            self.error.emit(f"予期しないエラー: {str(e)}")
+
+    def _load_images(self, entries: list[ScanEntry]) -> tuple[list[ImageModel], list[tuple]]:
+        """
+        サムネイルをワーカープールで並列生成
+
+        ディスクキャッシュにヒットしたものはキャッシュから復元し、
+        それ以外はプールで並列にデコード・縮小する（EXIFプレビュー有効時は
+        埋め込みサムネイルを先に使う）。
+        完了した順にプログレスを通知し、結果は元のソート順で返す。
+
+        Args:
+            entries: スキャン結果のリスト（ソート済み）
+
+        Returns:
+            (ImageModelのリスト（元の順序）, 高画質化が必要な (ImageModel, ScanEntry) のリスト)
+        """
+        disk_cache = self._open_disk_cache()
+        store = disk_cache is not None and disk_cache.enabled
+
+        try:
+            # キャッシュのキーにはスキャン時のstatを使う
+            cached: dict[str, tuple] = {}
+            if store:
+                cached = disk_cache.get_many(
+                    [(entry.path, entry.mtime_ns, entry.size) for entry in entries],
+                    self.thumbnail_size
+                )
+
+            tasks = [
+                (entry.path, self.thumbnail_size, cached.get(entry.path), store, self.exif_preview)
+                for entry in entries
+            ]
+            results: list = [_PENDING] * len(entries)
+
+            # 先頭から連続して完了した分をImageModel化する
+            images = []
+            pending_refine = []
+            state = {"next": 0}
+
+            def flush():
+                while state["next"] < len(entries) and results[state["next"]] is not _PENDING:
+                    i = state["next"]
+                    image = self._create_image(entries[i], results[i], len(images))
+                    if image is not None:
+                        images.append(image)
+                        if results[i] is not None and results[i].is_preview:
+                            pending_refine.append((image, entries[i]))
+                    state["next"] += 1
+
+            def on_result(i: int, result, done: int):
+                results[i] = result
+                self.progress.emit(done, entries[i].name)
+                flush()
+
+            self._run_tasks(tasks, on_result)
+            flush()
 
-                    # サムネイル生成（ここで時間がかかる）
-                    image.load_thumbnail(self.thumbnail_size)
+            # 新しく生成したサムネイルをキャッシュに保存
+            if store:
+                disk_cache.put_many([
+                    (entry.path, entry.mtime_ns, entry.size, self.thumbnail_size, result.blob, result.image_size)
+                    for entry, result in zip(entries, results)
+                    if result is not None and result is not _PENDING and result.blob is not None
+                ])
 
-                    images.append(image)
+        finally:
+            if disk_cache is not None:
+                disk_cache.close()
+
+        return images, pending_refine
+
+    def _stream_images(self, entries: list[ScanEntry]) -> tuple[list[ImageModel], list[tuple]]:
+        """
+        全画像のImageModelを先に通知し、サムネイルは表示範囲を優先して生成（ストリーミング用）
+
+        ImageModelはサムネイルなしで作成して batch_ready で通知し、グリッドにはすぐ全件が並ぶ。
+        サムネイルは set_visible_range で指定された範囲に近いものから生成し、
+        生成できた分を thumbnails_ready でまとめて通知する。
+
+        Args:
+            entries: スキャン結果のリスト（ソート済み）
+
+        Returns:
+            (ImageModelのリスト（元の順序）, 高画質化が必要な (ImageModel, ScanEntry) のリスト)
+        """
+        images = []
+        image_entries = []
+        for entry in entries:
+            image = self._create_image(entry, None, len(images))
+            if image is not None:
+                images.append(image)
+                image_entries.append(entry)
 
-                    # プログレス更新
-                    self.progress.emit(i + 1, image.filename)
+        for start in range(0, len(images), STREAM_BATCH_MAX):
+            self.batch_ready.emit(images[start:start + STREAM_BATCH_MAX])
+
+        disk_cache = self._open_disk_cache()
+        store = disk_cache is not None and disk_cache.enabled
+
+        try:
+            cached: dict[str, tuple] = {}
+            if store:
+                cached = disk_cache.get_many(
+                    [(entry.path, entry.mtime_ns, entry.size) for entry in image_entries],
+                    self.thumbnail_size
+                )
+
+            tasks = [
+                (entry.path, self.thumbnail_size, cached.get(entry.path), store, self.exif_preview)
+                for entry in image_entries
+            ]
+            results: list = [None] * len(tasks)
+
+            pending_refine = []
+            ready = []
+            state = {"last_emit": time.monotonic()}
+
+            def on_result(i: int, result, done: int):
+                image = images[i]
+                if result is not None:
+                    results[i] = result
+                    image.set_thumbnail_data(self.thumbnail_size, result.data, result.width, result.height)
+                    if result.image_size:
+                        image.size = result.image_size
+                    if result.is_preview:
+                        pending_refine.append((image, image_entries[i]))
+                    ready.append(image)
+                self.progress.emit(done, image.filename)
+
+                elapsed_ms = (time.monotonic() - state["last_emit"]) * 1000
+                if ready and (len(ready) >= STREAM_BATCH_MAX or elapsed_ms >= STREAM_BATCH_INTERVAL_MS):
+                    self.thumbnails_ready.emit(list(ready))
+                    ready.clear()
+                    state["last_emit"] = time.monotonic()
+
+            self._run_tasks(tasks, on_result, positions=list(range(len(tasks))))
+            if ready:
+                self.thumbnails_ready.emit(list(ready))
+
+            if store:
+                disk_cache.put_many([
+                    (entry.path, entry.mtime_ns, entry.size, self.thumbnail_size, result.blob, result.image_size)
+                    for entry, result in zip(image_entries, results)
+                    if result is not None and result.blob is not None
+                ])
+
+        finally:
+            if disk_cache is not None:
+                disk_cache.close()
+
+        return images, pending_refine
+
+    def _create_image(self, entry: ScanEntry, result, index: int) -> ImageModel | None:
+        """
+        生成結果からImageModelを作成
+
+        ファイルサイズ・更新日時はスキャン時のstat、画像サイズはサムネイル生成時に読んだヘッダから設定し、
+        ファイルを開き直さない
+
+        Args:
+            entry: スキャン結果
+            result: _generate_thumbnail の結果（失敗時はNone）
+            index: 並び順のインデックス
 
+        Returns:
+            ImageModel（作成に失敗した場合はNone）
+        """
+        file_path = entry.path
+        try:
+            image = ImageModel(
+                file_path,
+                file_size=entry.size,
+                image_size=result.image_size if result is not None else None,
+                mtime_ns=entry.mtime_ns
+            )
+            if result is not None:
+                image.set_thumbnail_data(self.thumbnail_size, result.data, result.width, result.height)
+            image.index = index
+
+            # 並べ替えの自然順のキーもワーカー側で作っておく（UIスレッドでのソート時に作らない）
+            image.name_key
+            return image
+
+        except Exception as e:
+            print(f"画像読み込みエラー: {file_path}, {e}")
+            return None
+
+    def _refine_thumbnails(self, pending_refine: list[tuple]):
+        """
+        EXIFプレビューで表示した画像をフルデコードで高画質化（バックグラウンド）
+
+        1枚完了するごとに thumbnail_refined を通知する。
+        表示範囲に近いものから処理し、requestInterruption() で中断できる。
+
+        Args:
+            pending_refine: (ImageModel, ScanEntry) のリスト
+        """
+        disk_cache = self._open_disk_cache()
+        store = disk_cache is not None and disk_cache.enabled
+        cache_entries = []
+
+        tasks = [(image.file_path, self.thumbnail_size, None, store, False) for image, _ in pending_refine]
+
+        def on_result(i: int, result, done: int):
+            if result is None:
+                return
+            image, entry = pending_refine[i]
+            self.thumbnail_refined.emit(image, result.data, result.width, result.height, result.image_size)
+            if store and result.blob is not None:
+                cache_entries.append(
+                    (entry.path, entry.mtime_ns, entry.size, self.thumbnail_size, result.blob, result.image_size)
+                )
+
+        try:
+            self._run_tasks(tasks, on_result, positions=[image.index for image, _ in pending_refine])
+            if store:
+                disk_cache.put_many(cache_entries)
+        finally:
+            if disk_cache is not None:
+                disk_cache.close()
+
+    def _open_disk_cache(self) -> ThumbnailDiskCache | None:
+        """ディスクキャッシュを開く（無効時はNone）"""
+        if not self.use_disk_cache:
+            return None
+        return ThumbnailDiskCache(max_bytes=self.disk_cache_max_bytes)
+
+    def _run_tasks(self, tasks: list[tuple], on_result, positions: list[int] = None):
+        """
+        サムネイル生成タスクを実行（設定に応じて直列またはワーカープール）
+
+        Args:
+            tasks: _generate_thumbnail の引数タプルのリスト
+            on_result: 完了ごとに呼ばれるコールバック (インデックス, 結果 or None, 完了数)
+            positions: 各タスクのグリッド上の位置（指定時は表示範囲に近いものから実行）
+        """
+        if positions is not None:
+            self._run_prioritized(tasks, positions, on_result)
+            return
+
+        if self.worker_mode == "serial" or self.max_workers <= 1 or len(tasks) <= 1:
+            for i, task in enumerate(tasks):
+                if self.isInterruptionRequested():
+                    return
+                try:
+                    result = _generate_thumbnail(*task)
                 except Exception as e:
-                    print(f"画像読み込みエラー: {file_path}, {e}")
+                    print(f"サムネイル生成エラー: {task[0]}, {e}")
+                    result = None
+                on_result(i, result, i + 1)
+            return
+
+        executor_class = ProcessPoolExecutor if self.worker_mode == "process" else ThreadPoolExecutor
+        executor = executor_class(max_workers=self.max_workers)
+        try:
+            futures = {executor.submit(_generate_thumbnail, *task): i for i, task in enumerate(tasks)}
+
+            for done, future in enumerate(as_completed(futures), start=1):
+                if self.isInterruptionRequested():
+                    return
+                i = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"サムネイル生成エラー: {tasks[i][0]}, {e}")
+                    result = None
+                on_result(i, result, done)
+        finally:
+            # 中断時は未着手のタスクを破棄
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _run_prioritized(self, tasks: list[tuple], positions: list[int], on_result):
+        """
+        表示範囲に近いタスクから順に実行
+
+        プールには同時実行数の2倍までしか投入せず、残りは手元で保留する。
+        表示範囲が変わったら、まだ開始していないタスクを取り消して優先順位を付け直す
+        （画面外のタスクがプールの待ち行列を占有しない）。
+
+        Args:
+            tasks: _generate_thumbnail の引数タプルのリスト
+            positions: 各タスクのグリッド上の位置
+            on_result: 完了ごとに呼ばれるコールバック (インデックス, 結果 or None, 完了数)
+        """
+        task_at = {position: i for i, position in enumerate(positions)}
+        total = max(positions) + 1 if positions else 0
+        pending = set(range(len(tasks)))
+
+        serial = self.worker_mode == "serial" or self.max_workers <= 1
+        executor = None
+        if not serial:
+            executor_class = ProcessPoolExecutor if self.worker_mode == "process" else ThreadPoolExecutor
+            executor = executor_class(max_workers=self.max_workers)
+        limit = 1 if serial else self.max_workers * 2
+
+        inflight = {}  # Future -> タスクのインデックス
+        version = None
+        order = iter(())
+        done = 0
+
+        try:
+            while pending or inflight:
+                if self.isInterruptionRequested():
+                    return
+
+                # 表示範囲が変わったら未着手のタスクを戻して並べ直す
+                visible, current = self._get_visible_range()
+                if current != version:
+                    version = current
+                    order = _priority_order(visible, total)
+                    for future, i in list(inflight.items()):
+                        if future.cancel():
+                            del inflight[future]
+                            pending.add(i)
+
+                while pending and len(inflight) < limit:
+                    i = next((task_at[p] for p in order if p in task_at and task_at[p] in pending), None)
+                    if i is None:
+                        # 位置が重複している場合など、優先順から漏れたものは番号順に処理
+                        i = min(pending)
+                    pending.discard(i)
+
+                    if executor is None:
+                        # 直列の場合は1枚ごとに表示範囲を確認し直す
+                        try:
+                            result = _generate_thumbnail(*tasks[i])
+                        except Exception as e:
+                            print(f"サムネイル生成エラー: {tasks[i][0]}, {e}")
+                            result = None
+                        done += 1
+                        on_result(i, result, done)
+                        break
+
+                    inflight[executor.submit(_generate_thumbnail, *tasks[i])] = i
+
+                if not inflight:
                     continue
 
-            # 完了
-            self.finished.emit(images)
+                # 表示範囲の変化と中断に反応できるよう短い間隔で待つ
+                completed, _ = wait(inflight, timeout=0.05, return_when=FIRST_COMPLETED)
+                for future in completed:
+                    i = inflight.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        print(f"サムネイル生成エラー: {tasks[i][0]}, {e}")
+                        result = None
+                    done += 1
+                    on_result(i, result, done)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
 
+
+def _priority_order(visible: tuple[int, int] | None, total: int):
+    """
+    サムネイルを生成する位置の優先順
+
+    表示範囲 → 前後の近傍（先読み、近い順） → 残り（先頭から）の順に返す。
+    重複して返すことがあるため、呼び出し側で処理済みのものを読み飛ばす。
+
+    Args:
+        visible: 表示中の範囲 (先頭, 末尾)（不明な場合はNone）
+        total: 位置の総数
+
+    Yields:
+        グリッド上の位置
+    """
+    if visible is not None:
+        first, last = max(0, visible[0]), min(total - 1, visible[1])
+        if first <= last:
+            yield from range(first, last + 1)
+
+            margin = (last - first + 1) * VIEWPORT_PREFETCH_PAGES
+            for distance in range(1, margin + 1):
+                if last + distance < total:
+                    yield last + distance
+                if first - distance >= 0:
+                    yield first - distance
+
+    yield from range(total)
+
+
+class ThumbnailResult(NamedTuple):
+    """サムネイル生成結果（プロセスプールから返せるようQtに依存しない）"""
+    data: bytes  # RGB888のバイト列
+    width: int
+    height: int
+    image_size: tuple | None  # 元画像のサイズ（不明な場合はNone）
+    blob: bytes | None  # ディスクキャッシュ保存用のJPEGバイト列
+    is_preview: bool  # EXIF埋め込みサムネイル（要高画質化）かどうか
+
+
+def _generate_thumbnail(
+    file_path: str,
+    size: int,
+    cached: tuple = None,
+    store: bool = False,
+    allow_preview: bool = False
+) -> ThumbnailResult:
+    """
+    サムネイルを生成（ワーカープールから呼び出す）
+
+    Args:
+        file_path: 画像ファイルのパス
+        size: サムネイルのサイズ
+        cached: ディスクキャッシュから取得した (JPEGのバイト列, 元画像のサイズ)
+        store: ディスクキャッシュ保存用にエンコードするか
+        allow_preview: EXIF埋め込みサムネイルを使ってよいか
+
+    Returns:
+        ThumbnailResult
+    """
+    if cached is not None:
+        blob, image_size = cached
+        try:
+            return ThumbnailResult(*decode_thumbnail_blob(blob), image_size, None, False)
         except Exception as e:
-            self.error.emit(f"予期しないエラー: {str(e)}")
+            print(f"サムネイルキャッシュの復元エラー: {file_path}, {e}")
+
+    # 埋め込みサムネイル（プレビュー）はキャッシュに保存しない
+    if allow_preview:
+        preview = extract_exif_thumbnail(file_path, size)
+        if preview is not None:
+            return ThumbnailResult(*preview, None, True)
+
+    data, width, height, image_size = decode_thumbnail(file_path, size)
+    blob = encode_thumbnail_blob(data, width, height) if store else None
+    return ThumbnailResult(data, width, height, image_size, blob, False)
@@ -0,0 +1,98 @@
+"""表示中のセルに不足しているサムネイルのバックグラウンド生成"""
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from PyQt6.QtCore import QObject, pyqtSignal
+from src.models.image_model import ImageModel, decode_thumbnail
+from src.utils.constants import THUMBNAIL_DECODER_WORKERS, THUMBNAIL_DECODER_QUEUE_MAX
+
+
+class ThumbnailDecoder(QObject):
+    """
+    要求された解像度のサムネイルをスレッドプールで生成する
+
+    描画中に解像度が足りないセル（ズーム後・メモリから破棄された後など）が要求し、
+    GUIスレッドは生成を待たずに手持ちの解像度で描画を続ける。
+    新しい要求（＝今表示されているセル）から順に処理し、待ちが上限を超えたら
+    古い要求（スクロールで画面外に出たセル）から破棄する（再び表示されれば要求し直される）。
+    """
+
+    # (ImageModel, サイズ, (RGBバイト列, 幅, 高さ, 元画像のサイズ) or None) - 失敗時はNone
+    decoded = pyqtSignal(object, int, object)
+
+    # ワーカースレッドからの完了通知（GUIスレッドで受け取る）
+    _finished = pyqtSignal(object, int, object)
+
+    def __init__(self, parent=None, max_workers: int = THUMBNAIL_DECODER_WORKERS):
+        """
+        Args:
+            parent: 親オブジェクト
+            max_workers: 並列数
+        """
+        super().__init__(parent)
+        self.max_workers = max_workers
+        self._executor: ThreadPoolExecutor = None
+        self._queue: deque[tuple[ImageModel, int]] = deque()
+        self._requested: set[tuple[str, int]] = set()  # 待ち・実行中の (絶対パス, サイズ)
+        self._inflight = 0
+        self._finished.connect(self._on_finished)
+
+    def request(self, image: ImageModel, size: int):
+        """
+        サムネイルの生成を要求（生成待ち・生成中のものは無視）
+
+        Args:
+            image: 画像
+            size: サムネイルサイズ（解像度）
+        """
+        key = (image.file_path, size)
+        if key in self._requested:
+            return
+
+        self._requested.add(key)
+        self._queue.append((image, size))
+        if len(self._queue) > THUMBNAIL_DECODER_QUEUE_MAX:
+            old_image, old_size = self._queue.popleft()
+            self._requested.discard((old_image.file_path, old_size))
+
+        self._dispatch()
+
+    def cancel_pending(self):
+        """生成待ちの要求を破棄（生成中のものは完了まで続く）"""
+        for image, size in self._queue:
+            self._requested.discard((image.file_path, size))
+        self._queue.clear()
+
+    def shutdown(self):
+        """生成待ちを破棄してスレッドプールを終了"""
+        self.cancel_pending()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _dispatch(self):
+        """空いているワーカーに新しい要求から投入"""
+        while self._queue and self._inflight < self.max_workers:
+            image, size = self._queue.pop()
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+
+            self._inflight += 1
+            future = self._executor.submit(decode_thumbnail, image.file_path, size)
+            future.add_done_callback(
+                lambda f, image=image, size=size: self._finished.emit(image, size, f)
+            )
+
+    def _on_finished(self, image: ImageModel, size: int, future):
+        """生成完了時（GUIスレッド）"""
+        self._inflight -= 1
+        self._requested.discard((image.file_path, size))
+
+        if not future.cancelled():
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"サムネイル生成エラー: {image.file_path}, {e}")
+                result = None
+            self.decoded.emit(image, size, result)
+
+        self._dispatch()
@@ -21,6 +21,15 @@ class ConfigModel:
         "show_save_confirmation": True,
         "show_delete_confirmation": True,  # 削除確認ダイアログを表示するか
         "thumbnail_size": 200,
+        "load_workers": 0,  # サムネイル生成の並列数（0: 自動）
+        "load_worker_mode": "thread",  # "thread" | "process" | "serial"
+        "thumbnail_cache_enabled": True,  # サムネイルのディスクキャッシュ
+        "thumbnail_cache_max_mb": 512,  # ディスクキャッシュの上限（MB）
+        "thumbnail_memory_mb": 512,  # メモリ上のサムネイルの上限（MB）
+        "exif_preview": True,  # EXIF埋め込みサムネイルで先行表示
+        "stream_loading": True,  # 読み込み中も準備できた画像から順次表示
+        "session_journal": True,  # 並べ替え作業を記録し、同じフォルダを開いたら続きから再開
+        "stall_watchdog_ms": 50,  # UIの停止をログに記録する閾値（ミリ秒、0: 無効）
         "window_size": [1920, 1080],
         "window_position": None,
         "enable_animations": True
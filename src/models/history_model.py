@@ -1,14 +1,28 @@
 """Undo/Redo履歴管理モデル"""
+import sys
+from collections import deque
 from datetime import datetime
 from src.utils.constants import MAX_HISTORY
 
 
 class HistoryModel:
-    """Undo/Redo履歴を管理するモデル"""
+    """
+    Undo/Redo履歴を管理するモデル
 
-    def __init__(self):
-        self.undo_stack: list = []
+    各アクションは画像リスト全体ではなく、逆操作できる差分（移動元・移動先の位置、
+    削除した位置、ソートの並べ替え配列など）だけを持つ。
+    Undoスタックは上限付きの deque で、古いものから自動的に破棄される。
+    """
+
+    def __init__(self, on_discard=None):
+        """
+        Args:
+            on_discard: 履歴から破棄されたアクションを受け取る関数 on_discard(action)
+                        （アクションが参照している資源の解放用）
+        """
+        self.undo_stack: deque = deque(maxlen=MAX_HISTORY)
         self.redo_stack: list = []
+        self.on_discard = on_discard
 
     def push(self, action: dict):
         """
@@ -17,7 +31,7 @@ class HistoryModel:
         Args:
             action: アクション辞書
                 {
-                    "type": "delete" | "reorder" | "sort",
+                    "type": "delete" | "reorder" | "reorder_multiple" | "sort",
                     "timestamp": "2025-10-06 14:30:15",
                     "data": {...}
                 }
@@ -25,14 +39,14 @@ class HistoryModel:
         # タイムスタンプを追加
         action["timestamp"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-        # Undoスタックに追加
+        # Undoスタックに追加（最大履歴数を超えたら古いものから破棄される）
+        if len(self.undo_stack) == self.undo_stack.maxlen:
+            self._discard(self.undo_stack[0])
         self.undo_stack.append(action)
 
-        # 最大履歴数を超えたら古いものを削除
-        if len(self.undo_stack) > MAX_HISTORY:
-            self.undo_stack.pop(0)
-
         # Redoスタックをクリア（新しいアクションが追加されたら）
+        for discarded in self.redo_stack:
+            self._discard(discarded)
         self.redo_stack.clear()
 
     def undo(self) -> dict:
@@ -85,9 +99,18 @@ class HistoryModel:
 
     def clear(self):
         """履歴をクリア"""
+        for action in self.undo_stack:
+            self._discard(action)
+        for action in self.redo_stack:
+            self._discard(action)
         self.undo_stack.clear()
         self.redo_stack.clear()
 
+    def _discard(self, action: dict):
+        """破棄するアクションを通知"""
+        if self.on_discard is not None:
+            self.on_discard(action)
+
     def get_undo_count(self) -> int:
         """Undo可能な回数を取得"""
         return len(self.undo_stack)
@@ -95,3 +118,32 @@ class HistoryModel:
     def get_redo_count(self) -> int:
         """Redo可能な回数を取得"""
         return len(self.redo_stack)
+
+    def memory_bytes(self) -> int:
+        """履歴が保持しているメモリの概算（バイト）"""
+        return sum(_action_bytes(action) for action in self.undo_stack) + \
+            sum(_action_bytes(action) for action in self.redo_stack)
+
+    def log_stats(self, logger, label: str = ""):
+        """
+        統計情報をログに出力
+
+        Args:
+            logger: Logger
+            label: ログの先頭に付ける説明（契機など）
+        """
+        prefix = f"{label}: " if label else ""
+        logger.info(
+            f"{prefix}履歴 Undo {len(self.undo_stack)}件 / Redo {len(self.redo_stack)}件, "
+            f"{self.memory_bytes() / 1024:.1f} KB"
+        )
+
+
+def _action_bytes(action: dict) -> int:
+    """アクション1件のメモリの概算（辞書・配列・文字列の本体を含む）"""
+    size = sys.getsizeof(action) + sys.getsizeof(action["data"]) + sys.getsizeof(action["timestamp"])
+    for value in action["data"].values():
+        size += sys.getsizeof(value)
+        if isinstance(value, (list, tuple)):
+            size += sum(sys.getsizeof(item) for item in value if isinstance(item, str))
+    return size
@@ -1,41 +1,313 @@
 """画像データモデル"""
+import io
 import os
-from pathlib import Path
+import struct
+import sys
 from PIL import Image
 from PyQt6.QtGui import QPixmap, QImage
+from src.models.thumbnail_store import get_thumbnail_store
+from src.utils.constants import EXIF_HEADER_READ_BYTES, EXIF_THUMBNAIL_MIN_RATIO
+
+
+def decode_thumbnail(file_path: str, size: int) -> tuple[bytes, int, int, tuple]:
+    """
+    画像をデコードしてサムネイルのRGBバイト列を生成
+
+    Qtに依存しないため、スレッドプール・プロセスプールのどちらからでも呼び出せる。
+    元画像のサイズも同じファイルハンドルのヘッダから取得して返す。
+
+    Args:
+        file_path: 画像ファイルのパス
+        size: サムネイルのサイズ
+
+    Returns:
+        (RGB888のバイト列, 幅, 高さ, 元画像のサイズ)
+    """
+    # Pillowでリサイズ（高速）
+    with Image.open(file_path) as img:
+        # draft()で縮小される前に元画像のサイズを記録
+        image_size = img.size
+
+        # JPEGはDCT領域で1/2・1/4・1/8に縮小してデコード（フル解像度のデコードを回避）
+        # 以降のモード変換・縮小は小さい画像に対して行われる
+        if img.format == 'JPEG':
+            img.draft('RGB', (size, size))
+
+        # RGB変換（透過情報を削除）
+        if img.mode in ('RGBA', 'LA', 'P'):
+            background = Image.new('RGB', img.size, (255, 255, 255))
+            if img.mode == 'P':
+                img = img.convert('RGBA')
+            background.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
+            img = background
+        elif img.mode != 'RGB':
+            img = img.convert('RGB')
+
+        # サムネイル生成（アスペクト比維持）
+        # BILINEAR: LANCZOS より高速で十分な品質
+        img.thumbnail((size, size), Image.Resampling.BILINEAR)
+
+        return img.tobytes('raw', 'RGB'), img.width, img.height, image_size
+
+
+def extract_exif_thumbnail(file_path: str, size: int) -> tuple[bytes, int, int, tuple] | None:
+    """
+    JPEGのEXIF（APP1）に埋め込まれたサムネイルを取り出す
+
+    ファイル先頭のヘッダ部分だけを読み込むため、フルデコードより大幅に速い。
+    埋め込みサムネイルが小さすぎる場合はNoneを返す。
+
+    Args:
+        file_path: 画像ファイルのパス
+        size: サムネイルのサイズ
+
+    Returns:
+        (RGB888のバイト列, 幅, 高さ, 元画像のサイズ or None)、または None
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            header = f.read(EXIF_HEADER_READ_BYTES)
+
+        jpeg_bytes = _find_exif_thumbnail_bytes(header)
+        if jpeg_bytes is None:
+            return None
+
+        # 元画像のサイズも読み込み済みのヘッダ（SOFマーカー）から取得
+        try:
+            with Image.open(io.BytesIO(header)) as original:
+                image_size = original.size
+        except Exception:
+            image_size = None
+
+        with Image.open(io.BytesIO(jpeg_bytes)) as img:
+            if max(img.size) < size * EXIF_THUMBNAIL_MIN_RATIO:
+                return None
+
+            img = img.convert('RGB')
+
+            # 目標サイズに合わせる（小さい場合は拡大してレイアウトを揃える）
+            scale = size / max(img.size)
+            new_size = (max(1, round(img.width * scale)), max(1, round(img.height * scale)))
+            img = img.resize(new_size, Image.Resampling.BILINEAR)
+
+            return img.tobytes('raw', 'RGB'), img.width, img.height, image_size
+
+    except Exception:
+        return None
+
+
+def _find_exif_thumbnail_bytes(header: bytes) -> bytes | None:
+    """
+    JPEGヘッダのAPP1セグメントからIFD1のサムネイル（JPEG）を探す
+
+    Args:
+        header: ファイル先頭のバイト列
+
+    Returns:
+        埋め込みサムネイルのJPEGバイト列、または None
+    """
+    if header[:2] != b'\xff\xd8':
+        return None
+
+    pos = 2
+    while pos + 4 <= len(header):
+        if header[pos] != 0xFF:
+            return None
+        marker = header[pos + 1]
+        if marker == 0xFF:
+            # フィルバイト
+            pos += 1
+            continue
+        if marker in (0xD9, 0xDA):
+            # EOI / SOS（以降にAPP1はない）
+            return None
+
+        segment_length = struct.unpack('>H', header[pos + 2:pos + 4])[0]
+        if marker == 0xE1 and header[pos + 4:pos + 10] == b'Exif\x00\x00':
+            tiff = header[pos + 10:pos + 2 + segment_length]
+            return _read_ifd1_thumbnail(tiff)
+
+        pos += 2 + segment_length
+
+    return None
+
+
+def _read_ifd1_thumbnail(tiff: bytes) -> bytes | None:
+    """
+    TIFF構造のIFD1からJPEGInterchangeFormat（0x0201/0x0202）を読み取る
+
+    Args:
+        tiff: TIFFヘッダから始まるEXIFデータ
+
+    Returns:
+        埋め込みサムネイルのJPEGバイト列、または None
+    """
+    if tiff[:2] == b'II':
+        endian = '<'
+    elif tiff[:2] == b'MM':
+        endian = '>'
+    else:
+        return None
+
+    try:
+        # IFD0をスキップしてIFD1へ
+        ifd0 = struct.unpack(endian + 'I', tiff[4:8])[0]
+        count = struct.unpack(endian + 'H', tiff[ifd0:ifd0 + 2])[0]
+        next_pos = ifd0 + 2 + count * 12
+        ifd1 = struct.unpack(endian + 'I', tiff[next_pos:next_pos + 4])[0]
+        if ifd1 == 0:
+            return None
+
+        offset = length = None
+        count = struct.unpack(endian + 'H', tiff[ifd1:ifd1 + 2])[0]
+        for i in range(count):
+            entry = tiff[ifd1 + 2 + i * 12:ifd1 + 14 + i * 12]
+            tag, value_type = struct.unpack(endian + 'HH', entry[:4])
+            if value_type == 3:  # SHORT
+                value = struct.unpack(endian + 'H', entry[8:10])[0]
+            else:
+                value = struct.unpack(endian + 'I', entry[8:12])[0]
+
+            if tag == 0x0201:
+                offset = value
+            elif tag == 0x0202:
+                length = value
+
+        if not offset or not length or offset + length > len(tiff):
+            return None
+
+        data = tiff[offset:offset + length]
+        return data if data[:2] == b'\xff\xd8' else None
+
+    except struct.error:
+        return None
 
 
 class ImageModel:
-    """画像データを管理するモデル"""
-
-    def __init__(self, file_path: str):
-        self.file_path: str = str(Path(file_path).absolute())
-        self.filename: str = os.path.basename(file_path)
-        self.extension: str = os.path.splitext(self.filename)[1].lower()
-        self.size: tuple = (0, 0)
-        self.file_size: int = 0
-        self.thumbnail: QPixmap = None
+    """
+    画像データを管理するモデル
+
+    大量の画像（10万件規模）を保持できるよう __slots__ でインスタンス辞書を持たない。
+    ファイルサイズ・更新日時・画像サイズは初めて参照されたときに読み込む（遅延読み込み）。
+    並べ替えに使う自然順のキーも初めて参照されたときに作って保持する。
+    サムネイル自体は共有のThumbnailStoreに置き、ここでは最後に生成したサイズだけを持つ。
+    """
+
+    __slots__ = (
+        "file_path", "filename", "extension", "index", "selected",
+        "_size", "_file_size", "_mtime_ns", "_name_key", "_thumbnail_size"
+    )
+
+    def __init__(self, file_path: str, file_size: int = None, image_size: tuple = None,
+                 mtime_ns: int = None):
+        """
+        Args:
+            file_path: 画像ファイルのパス
+            file_size: ファイルサイズ（スキャン時のstatを再利用する場合）
+            image_size: 画像サイズ（サムネイル生成時に読んだヘッダを再利用する場合）
+            mtime_ns: 更新日時（ナノ秒、スキャン時のstatを再利用する場合）
+        """
+        # パスは履歴・キャッシュのキーとしても使われるためインターンして共有する
+        self.file_path: str = sys.intern(os.path.abspath(file_path))
+        self.filename: str = os.path.basename(self.file_path)
+        self.extension: str = sys.intern(os.path.splitext(self.filename)[1].lower())
         self.index: int = 0
         self.selected: bool = False
 
-        # サムネイルキャッシュ（サイズごとに保存）
-        self._thumbnail_cache: dict[int, QPixmap] = {}
+        # 未取得の場合はNone（参照時に読み込む）
+        self._size: tuple = tuple(image_size) if image_size else None
+        self._file_size: int = file_size
+        self._mtime_ns: int = mtime_ns
+        self._name_key: tuple = None
 
-        # ファイル情報を取得
-        self._load_file_info()
+        # 最後に生成したサムネイルのサイズ（未生成の場合はNone）
+        self._thumbnail_size: int = None
 
-    def _load_file_info(self):
-        """ファイル情報を読み込み"""
-        try:
-            # ファイルサイズ
-            self.file_size = os.path.getsize(self.file_path)
+    @property
+    def thumbnail(self) -> QPixmap | None:
+        """
+        最後に生成したサイズのサムネイル（破棄されている場合は他の解像度、なければNone）
 
-            # 画像サイズ
-            with Image.open(self.file_path) as img:
-                self.size = img.size
+        ホバー判定・ドラッグ画像などの参照用で、キャッシュの統計・LRUの順序には影響しない
+        （描画時は thumbnail_at を使う）。
+        """
+        if self._thumbnail_size is None:
+            return None
+        return get_thumbnail_store().peek_best(self.file_path, self._thumbnail_size)[0]
 
-        except Exception as e:
-            print(f"ファイル情報の読み込みエラー: {self.file_path}, {e}")
+    def thumbnail_at(self, size: int) -> tuple[QPixmap | None, int]:
+        """
+        指定の解像度のサムネイル（ない場合は生成済みの他の解像度で代用）
+
+        Args:
+            size: サムネイルサイズ（解像度）
+
+        Returns:
+            (QPixmap or None, 実際のサイズ)（生成済みのものがない場合は (None, 0)）
+        """
+        if self._thumbnail_size is None:
+            return None, 0
+        return get_thumbnail_store().get_best(self.file_path, size)
+
+    @property
+    def size(self) -> tuple:
+        """画像サイズ（初回参照時にヘッダを解析）"""
+        if self._size is None:
+            self._size = (0, 0)
+            try:
+                with Image.open(self.file_path) as img:
+                    self._size = img.size
+            except Exception as e:
+                print(f"ファイル情報の読み込みエラー: {self.file_path}, {e}")
+        return self._size
+
+    @size.setter
+    def size(self, value: tuple):
+        self._size = tuple(value) if value else None
+
+    @property
+    def known_size(self) -> tuple | None:
+        """取得済みの画像サイズ（未取得の場合はNone。ファイルは読まない）"""
+        return self._size
+
+    @property
+    def file_size(self) -> int:
+        """ファイルサイズ（初回参照時にstat）"""
+        if self._file_size is None:
+            self._file_size = 0
+            try:
+                self._file_size = os.path.getsize(self.file_path)
+            except Exception as e:
+                print(f"ファイル情報の読み込みエラー: {self.file_path}, {e}")
+        return self._file_size
+
+    @file_size.setter
+    def file_size(self, value: int):
+        self._file_size = value
+
+    @property
+    def mtime_ns(self) -> int:
+        """更新日時（ナノ秒、初回参照時にstat）"""
+        if self._mtime_ns is None:
+            self._mtime_ns = 0
+            try:
+                self._mtime_ns = os.stat(self.file_path).st_mtime_ns
+            except Exception as e:
+                print(f"ファイル情報の読み込みエラー: {self.file_path}, {e}")
+        return self._mtime_ns
+
+    @property
+    def name_key(self) -> tuple:
+        """ファイル名の自然順のキー（初回参照時に作成）"""
+        if self._name_key is None:
+            from src.models.image_sort import natural_key
+            self._name_key = natural_key(self.filename)
+        return self._name_key
+
+    @property
+    def has_thumbnail(self) -> bool:
+        """サムネイルを生成済みか（ストアから破棄されていても生成済みとみなす）"""
+        return self._thumbnail_size is not None
 
     def load_thumbnail(self, size: int = 200) -> bool:
         """
@@ -48,41 +320,36 @@ class ImageModel:
             成功したかどうか
         """
         # キャッシュ確認
-        if size in self._thumbnail_cache:
-            self.thumbnail = self._thumbnail_cache[size]
+        if get_thumbnail_store().contains(self.file_path, size):
+            self._thumbnail_size = size
             return True
 
         try:
-            # Pillowでリサイズ（高速）
-            with Image.open(self.file_path) as img:
-                # RGB変換（透過情報を削除）
-                if img.mode in ('RGBA', 'LA', 'P'):
-                    background = Image.new('RGB', img.size, (255, 255, 255))
-                    if img.mode == 'P':
-                        img = img.convert('RGBA')
-                    background.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
-                    img = background
-                elif img.mode != 'RGB':
-                    img = img.convert('RGB')
-
-                # サムネイル生成（アスペクト比維持）
-                # BILINEAR: LANCZOS より高速で十分な品質
-                img.thumbnail((size, size), Image.Resampling.BILINEAR)
-
-                # PIL Image → QPixmap
-                img_bytes = img.tobytes('raw', 'RGB')
-                qimage = QImage(img_bytes, img.width, img.height, img.width * 3, QImage.Format.Format_RGB888)
-                self.thumbnail = QPixmap.fromImage(qimage)
-
-                # キャッシュに保存
-                self._thumbnail_cache[size] = self.thumbnail
-
+            data, width, height, image_size = decode_thumbnail(self.file_path, size)
+            self.set_thumbnail_data(size, data, width, height)
+            self.size = image_size
             return True
 
         except Exception as e:
             print(f"サムネイル生成エラー: {self.file_path}, {e}")
             return False
 
+    def set_thumbnail_data(self, size: int, data: bytes, width: int, height: int):
+        """
+        デコード済みのRGBバイト列からサムネイルを設定
+
+        ワーカープールで生成したデータをQPixmapに変換してストアに保存する
+
+        Args:
+            size: サムネイルのサイズ（キャッシュキー）
+            data: RGB888のバイト列
+            width: 幅
+            height: 高さ
+        """
+        qimage = QImage(data, width, height, width * 3, QImage.Format.Format_RGB888)
+        get_thumbnail_store().put(self.file_path, size, QPixmap.fromImage(qimage))
+        self._thumbnail_size = size
+
     def get_new_filename(self, template: str, number: int, digits: int, extension: str = None) -> str:
         """
         リネーム後のファイル名を生成
@@ -114,14 +381,9 @@ class ImageModel:
         Args:
             keep_size: 保持するサイズ（Noneの場合は全削除）
         """
-        if keep_size is None:
-            self._thumbnail_cache.clear()
-        else:
-            # 指定サイズ以外を削除
-            self._thumbnail_cache = {
-                size: pixmap for size, pixmap in self._thumbnail_cache.items()
-                if size == keep_size
-            }
+        get_thumbnail_store().discard(self.file_path, keep_size)
+        if self._thumbnail_size != keep_size:
+            self._thumbnail_size = None
 
     def get_file_size_str(self) -> str:
         """
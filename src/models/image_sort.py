@@ -0,0 +1,73 @@
+"""画像の並べ替え（キーの定義と複数キーの安定ソート）"""
+import re
+from src.models.image_model import ImageModel
+
+_DIGITS = re.compile(r'(\d+)')
+
+
+def natural_key(name: str) -> tuple:
+    """
+    自然順のキー（数字の部分は数値として比較、それ以外は大文字・小文字を区別しない）
+
+    Args:
+        name: ファイル名
+
+    Returns:
+        (文字列, 数値, 文字列, ...) の交互のタプル
+    """
+    parts = _DIGITS.split(name.lower())
+    return tuple(int(part) if i % 2 else part for i, part in enumerate(parts))
+
+
+def _pixels(image: ImageModel) -> int | None:
+    """画素数（サイズ未取得の場合はNone）"""
+    size = image.known_size
+    return size[0] * size[1] if size is not None else None
+
+
+def _aspect_ratio(image: ImageModel) -> float | None:
+    """縦横比（幅 / 高さ、サイズ未取得の場合はNone、高さ0の場合は0）"""
+    size = image.known_size
+    if size is None:
+        return None
+    width, height = size
+    return width / height if height else 0.0
+
+
+# 並べ替えキー（名前, 表示名, ImageModelからキーを返す関数。Noneは値が未取得）
+SORT_KEYS = {
+    "name": ("名前", lambda image: image.name_key),
+    "mtime": ("更新日時", lambda image: image.mtime_ns),
+    "file_size": ("ファイルサイズ", lambda image: image.file_size),
+    "pixels": ("画素数", _pixels),
+    "aspect": ("縦横比", _aspect_ratio),
+}
+
+
+def sorted_images(images: list[ImageModel], keys: list[tuple[str, bool]]) -> list[ImageModel]:
+    """
+    複数キーで安定ソートした画像リストを返す
+
+    優先度の低いキーから順に安定ソートを重ねる（同じ値の画像は前のキーでの順序を保つ）。
+    キーの値は ImageModel にキャッシュされたもの（自然順のキー・スキャン時のstat・
+    サムネイル生成時に読んだヘッダ）を使う。画像サイズが分かっていない画像
+    （読み込み直後で高画質化がまだのものなど）はファイルを開かず、昇順・降順とも
+    末尾に元の順序のまま並べる（UIスレッドで読み込まない）。
+
+    Args:
+        images: 画像リスト
+        keys: (キーの名前, 昇順かどうか) のリスト（先頭ほど優先）
+
+    Returns:
+        並べ替えた画像リスト
+    """
+    order = list(images)
+    for key, ascending in reversed(keys):
+        key_func = SORT_KEYS[key][1]
+        known = []
+        unknown = []
+        for image in order:
+            (unknown if key_func(image) is None else known).append(image)
+        known.sort(key=key_func, reverse=not ascending)
+        order = known + unknown
+    return order
@@ -0,0 +1,76 @@
+"""選択状態の管理モデル"""
+
+
+class SelectionModel:
+    """
+    選択中の画像インデックスを集合で管理するモデル
+
+    変更操作は選択状態が変わったインデックスの集合（差分）を返す。
+    呼び出し側は差分のセルだけを再描画すればよく、選択件数によらず
+    判定（in）はO(1)、変更はO(変化した件数 + 変更前後の選択件数)で済む。
+    """
+
+    def __init__(self):
+        self._selected: set[int] = set()
+        self.anchor: int = -1  # 範囲選択の起点（最後にクリックしたインデックス）
+
+    def __contains__(self, index: int) -> bool:
+        return index in self._selected
+
+    def __len__(self) -> int:
+        return len(self._selected)
+
+    def __bool__(self) -> bool:
+        return bool(self._selected)
+
+    def __iter__(self):
+        return iter(self._selected)
+
+    def indices(self) -> list[int]:
+        """選択中のインデックス（昇順）"""
+        return sorted(self._selected)
+
+    def replace(self, indices) -> set[int]:
+        """
+        選択を置き換え
+
+        Args:
+            indices: 新しく選択するインデックス
+
+        Returns:
+            選択状態が変わったインデックスの集合
+        """
+        selected = set(indices)
+        changed = selected ^ self._selected
+        self._selected = selected
+        return changed
+
+    def select_only(self, index: int) -> set[int]:
+        """単一選択（起点も更新）"""
+        self.anchor = index
+        return self.replace((index,))
+
+    def toggle(self, index: int) -> set[int]:
+        """選択を反転（起点も更新）"""
+        self.anchor = index
+        if index in self._selected:
+            self._selected.remove(index)
+        else:
+            self._selected.add(index)
+        return {index}
+
+    def select_range(self, start: int, end: int) -> set[int]:
+        """start〜end（両端を含む）を選択（起点は変えない）"""
+        start, end = min(start, end), max(start, end)
+        return self.replace(range(start, end + 1))
+
+    def select_all(self, count: int) -> set[int]:
+        """全選択"""
+        return self.replace(range(count))
+
+    def clear(self) -> set[int]:
+        """選択解除（起点もリセット）"""
+        changed = self._selected
+        self._selected = set()
+        self.anchor = -1
+        return changed
@@ -0,0 +1,314 @@
+"""並べ替え作業の記録（異常終了しても次にフォルダを開いたときに続きから再開する）"""
+import os
+import sqlite3
+import time
+from array import array
+from pathlib import Path
+from typing import NamedTuple
+from src.utils.constants import SESSION_JOURNAL_PATH, SESSION_JOURNAL_SNAPSHOT_OPS
+from src.utils.scanner import ScanEntry
+
+
+class ResumedSession(NamedTuple):
+    """記録から復元した並び順"""
+    entries: list[ScanEntry]  # 復元した並び順のスキャン結果（新しいファイルは末尾）
+    ops: int  # 再生した変更の件数
+    changed: int  # 記録時から更新日時・サイズが変わったファイル数
+    missing: int  # 記録にあるが見つからなかったファイル数
+    added: int  # 記録にない新しいファイル数
+
+
+class SessionJournal:
+    """
+    フォルダごとの並び順の変更を追記していく記録（SQLite、WAL）
+
+    読み込み完了時に並び順のスナップショット（ファイル名・サイズ・更新日時）を書き、
+    以後の変更（移動・並べ替え・削除・挿入）は差分を1件ずつ追記してコミットする。
+    Undo/Redoも差分として記録されるため、再生に履歴は要らない。
+    差分が一定件数たまったらスナップショットを書き直して差分を消す（同じトランザクション内）。
+
+    sqlite3の接続は作成したスレッドでのみ使用すること。
+    """
+
+    SCHEMA_VERSION = 2
+
+    def __init__(self, db_path: str = SESSION_JOURNAL_PATH):
+        """
+        Args:
+            db_path: データベースファイルのパス
+        """
+        self.db_path = Path(db_path)
+        self.conn: sqlite3.Connection = None
+
+        # 記録中のフォルダ（Noneの場合は記録しない）
+        self.folder: str = None
+        self._images: list = None  # 記録中の画像リスト（コントローラーと共有）
+        self._stats: dict[str, tuple[int, int]] = {}  # ファイル名 -> (サイズ, 更新日時ns)
+        self._ops = 0  # 前回のスナップショットからの差分の件数
+
+        self._open()
+
+    def _open(self):
+        """データベースを開く（失敗時は記録しない）"""
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self.conn = sqlite3.connect(str(self.db_path), timeout=5.0)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+
+            # スキーマが古い場合は作り直す
+            version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != self.SCHEMA_VERSION:
+                self.conn.execute("DROP TABLE IF EXISTS snapshots")
+                self.conn.execute("DROP TABLE IF EXISTS ops")
+                self.conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS snapshots (
+                    folder TEXT PRIMARY KEY,
+                    names TEXT NOT NULL,
+                    excluded TEXT NOT NULL,
+                    sizes BLOB NOT NULL,
+                    mtimes BLOB NOT NULL,
+                    updated REAL NOT NULL
+                )
+            """)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS ops (
+                    id INTEGER PRIMARY KEY,
+                    folder TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    numbers BLOB NOT NULL,
+                    names TEXT
+                )
+            """)
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_ops_folder ON ops (folder, id)")
+            self.conn.commit()
+
+        except Exception as e:
+            print(f"作業記録を開けませんでした: {self.db_path}, {e}")
+            self.close()
+
+    @property
+    def enabled(self) -> bool:
+        """記録が使用可能か"""
+        return self.conn is not None
+
+    def resume(self, folder_path: str, entries: list[ScanEntry]) -> ResumedSession | None:
+        """
+        フォルダの記録を再生して、前回の最後の並び順にスキャン結果を並べ替える
+
+        ファイルは読み直さず、スキャン時のstat（サイズ・更新日時）を記録と照合するだけ。
+        記録にあって見つからないファイルは除き、記録にないファイルは末尾に追加する。
+        作業中に削除した画像は戻さない。
+
+        Args:
+            folder_path: フォルダパス
+            entries: スキャン結果（パス順）
+
+        Returns:
+            ResumedSession（記録がない・読めない場合はNone）
+        """
+        if not self.enabled:
+            return None
+
+        folder = _folder_key(folder_path)
+        try:
+            row = self.conn.execute(
+                "SELECT names, excluded, sizes, mtimes FROM snapshots WHERE folder = ?", (folder,)
+            ).fetchone()
+            if row is None:
+                return None
+            ops = self.conn.execute(
+                "SELECT kind, numbers, names FROM ops WHERE folder = ? ORDER BY id", (folder,)
+            ).fetchall()
+
+            snapshot_names = row[0].split("\0") if row[0] else []
+            excluded = row[1].split("\0") if row[1] else []
+            sizes = _numbers(row[2])
+            mtimes = _numbers(row[3])
+            names, known = replay(snapshot_names, ops)
+
+        except Exception as e:
+            print(f"作業記録の再生エラー: {folder_path}, {e}")
+            return None
+
+        recorded = {name: (size, mtime) for name, size, mtime in zip(snapshot_names, sizes, mtimes)}
+        by_name = {entry.name: entry for entry in entries}
+
+        ordered = []
+        changed = missing = 0
+        for name in names:
+            entry = by_name.get(name)
+            if entry is None:
+                missing += 1
+                continue
+            if recorded.get(name, (entry.size, entry.mtime_ns)) != (entry.size, entry.mtime_ns):
+                changed += 1
+            ordered.append(entry)
+
+        # 記録にあるファイル（作業中に削除したものを含む）以外が新しいファイル
+        known.update(snapshot_names)
+        known.update(excluded)
+        new_entries = [entry for entry in entries if entry.name not in known]
+        ordered.extend(new_entries)
+
+        return ResumedSession(ordered, len(ops), changed, missing, len(new_entries))
+
+    def start(self, folder_path: str, images: list, entries: list[ScanEntry]):
+        """
+        フォルダの記録を開始（現在の並び順をスナップショットとして書き、以前の差分は消す）
+
+        Args:
+            folder_path: フォルダパス
+            images: 画像リスト（コントローラーと共有。以後の変更はこのリストに対して記録される）
+            entries: フォルダのスキャン結果（全件。並び順にないものは削除済みとして記録する）
+        """
+        if not self.enabled:
+            return
+
+        self.folder = _folder_key(folder_path)
+        self._images = images
+        self._stats = {entry.name: (entry.size, entry.mtime_ns) for entry in entries}
+        self._write_snapshot()
+
+    def stop(self):
+        """記録を終了（記録済みの内容は残す）"""
+        self.folder = None
+        self._images = None
+        self._stats = {}
+
+    def discard(self):
+        """記録中のフォルダの記録を削除して記録を終了"""
+        if self.enabled and self.folder is not None:
+            try:
+                with self.conn:
+                    self.conn.execute("DELETE FROM snapshots WHERE folder = ?", (self.folder,))
+                    self.conn.execute("DELETE FROM ops WHERE folder = ?", (self.folder,))
+            except Exception as e:
+                print(f"作業記録の削除エラー: {e}")
+        self.stop()
+
+    def record(self, kind: str, numbers, names: list[str] = None):
+        """
+        画像リストの変更を追記（コミットまで行う）
+
+        Args:
+            kind: "move" | "permute" | "remove" | "insert"
+            numbers: 変更の内容を表す整数列（replay を参照）
+            names: 挿入したファイル名（"insert" のみ）
+        """
+        if not self.enabled or self.folder is None:
+            return
+
+        try:
+            with self.conn:
+                self.conn.execute(
+                    "INSERT INTO ops (folder, kind, numbers, names) VALUES (?, ?, ?, ?)",
+                    (self.folder, kind, array('q', numbers).tobytes(),
+                     "\0".join(names) if names is not None else None)
+                )
+            self._ops += 1
+            if self._ops >= SESSION_JOURNAL_SNAPSHOT_OPS:
+                self._write_snapshot()
+        except Exception as e:
+            print(f"作業記録の書き込みエラー: {e}")
+
+    def _write_snapshot(self):
+        """現在の並び順をスナップショットとして書き、差分を消す"""
+        names = [image.filename for image in self._images]
+        stats = [self._stats.get(name, (-1, -1)) for name in names]
+        excluded = self._stats.keys() - set(names)
+        try:
+            with self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO snapshots (folder, names, excluded, sizes, mtimes, updated) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (self.folder, "\0".join(names), "\0".join(sorted(excluded)),
+                     array('q', [size for size, _ in stats]).tobytes(),
+                     array('q', [mtime for _, mtime in stats]).tobytes(),
+                     time.time())
+                )
+                self.conn.execute("DELETE FROM ops WHERE folder = ?", (self.folder,))
+            self._ops = 0
+        except Exception as e:
+            print(f"作業記録のスナップショット書き込みエラー: {e}")
+
+    def close(self):
+        """データベースを閉じる"""
+        self.stop()
+        if self.conn is not None:
+            try:
+                self.conn.close()
+            except Exception:
+                pass
+            self.conn = None
+
+
+def replay(names: list[str], ops) -> tuple[list[str], set[str]]:
+    """
+    スナップショットの並び順に差分を順に適用
+
+    差分（numbers）の形式:
+        "move": (first, last, destination) - first〜last を移動後の先頭が destination になるよう移動
+        "permute": (start, *permutation) - start からの各位置に permutation の位置の画像を並べる
+        "remove": (*rows) - rows（昇順）を削除
+        "insert": (*rows) - rows（挿入後の位置、昇順）に names を挿入
+
+    Args:
+        names: スナップショットのファイル名（並び順）
+        ops: (kind, numbers のバイト列, names) のリスト
+
+    Returns:
+        (適用後のファイル名の並び, 差分で挿入されたファイル名の集合)
+    """
+    names = list(names)
+    inserted = set()
+
+    for kind, blob, op_names in ops:
+        numbers = _numbers(blob)
+
+        if kind == "move":
+            first, last, destination = numbers
+            moving = names[first:last + 1]
+            del names[first:last + 1]
+            names[destination:destination] = moving
+
+        elif kind == "permute":
+            start = numbers[0]
+            permutation = numbers[1:]
+            names[start:start + len(permutation)] = [names[i] for i in permutation]
+
+        elif kind == "remove":
+            removed = set(numbers)
+            names = [name for i, name in enumerate(names) if i not in removed]
+
+        elif kind == "insert":
+            new_names = op_names.split("\0")
+            inserted.update(new_names)
+            merged = []
+            prev = 0
+            for row, name in zip(numbers, new_names):
+                take = max(0, row - len(merged))
+                merged.extend(names[prev:prev + take])
+                prev += take
+                merged.append(name)
+            merged.extend(names[prev:])
+            names = merged
+
+        else:
+            raise ValueError(f"不明な差分: {kind}")
+
+    return names, inserted
+
+
+def _numbers(blob: bytes) -> array:
+    """整数列のバイト列を配列に戻す"""
+    numbers = array('q')
+    numbers.frombytes(blob)
+    return numbers
+
+
+def _folder_key(folder_path: str) -> str:
+    """フォルダの記録のキー（絶対パス）"""
+    return os.path.normcase(os.path.abspath(folder_path))
@@ -0,0 +1,245 @@
+"""サムネイルのディスクキャッシュ（セッションをまたいで保持）"""
+import io
+import sqlite3
+import time
+from pathlib import Path
+from PIL import Image
+from src.utils.constants import (
+    THUMBNAIL_CACHE_PATH, DEFAULT_THUMBNAIL_CACHE_MAX_MB, THUMBNAIL_CACHE_QUALITY
+)
+
+
+def encode_thumbnail_blob(data: bytes, width: int, height: int) -> bytes:
+    """
+    サムネイルのRGBバイト列をキャッシュ保存用にJPEGエンコード
+
+    Args:
+        data: RGB888のバイト列
+        width: 幅
+        height: 高さ
+
+    Returns:
+        JPEGのバイト列
+    """
+    img = Image.frombytes('RGB', (width, height), data)
+    buffer = io.BytesIO()
+    img.save(buffer, format='JPEG', quality=THUMBNAIL_CACHE_QUALITY)
+    return buffer.getvalue()
+
+
+def decode_thumbnail_blob(blob: bytes) -> tuple[bytes, int, int]:
+    """
+    キャッシュのJPEGバイト列をRGBバイト列に戻す
+
+    Args:
+        blob: JPEGのバイト列
+
+    Returns:
+        (RGB888のバイト列, 幅, 高さ)
+    """
+    with Image.open(io.BytesIO(blob)) as img:
+        img = img.convert('RGB')
+        return img.tobytes('raw', 'RGB'), img.width, img.height
+
+
+class ThumbnailDiskCache:
+    """
+    SQLiteに保存するサムネイルキャッシュ
+
+    キーは (絶対パス, サムネイルサイズ) で、更新日時・ファイルサイズが
+    一致した場合のみヒットとする。合計サイズが上限を超えたら
+    最終アクセスが古いものから削除する（LRU）。
+
+    sqlite3の接続は作成したスレッドでのみ使用すること。
+    """
+
+    SCHEMA_VERSION = 2
+
+    def __init__(
+        self,
+        db_path: str = THUMBNAIL_CACHE_PATH,
+        max_bytes: int = DEFAULT_THUMBNAIL_CACHE_MAX_MB * 1024 * 1024
+    ):
+        """
+        Args:
+            db_path: データベースファイルのパス
+            max_bytes: キャッシュの上限バイト数
+        """
+        self.db_path = Path(db_path)
+        self.max_bytes = max_bytes
+        self.conn: sqlite3.Connection = None
+        self.total_bytes = 0
+        self._open()
+
+    def _open(self):
+        """データベースを開く（失敗時はキャッシュ無効）"""
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self.conn = sqlite3.connect(str(self.db_path), timeout=5.0)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+
+            # スキーマが古い場合は作り直す（キャッシュなので破棄してよい）
+            version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != self.SCHEMA_VERSION:
+                self.conn.execute("DROP TABLE IF EXISTS thumbnails")
+                self.conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS thumbnails (
+                    path TEXT NOT NULL,
+                    thumb_size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    file_size INTEGER NOT NULL,
+                    image_width INTEGER,
+                    image_height INTEGER,
+                    last_access REAL NOT NULL,
+                    data BLOB NOT NULL,
+                    PRIMARY KEY (path, thumb_size)
+                )
+            """)
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_thumbnails_last_access ON thumbnails (last_access)"
+            )
+            self.conn.commit()
+
+            row = self.conn.execute("SELECT COALESCE(SUM(LENGTH(data)), 0) FROM thumbnails").fetchone()
+            self.total_bytes = row[0]
+
+        except Exception as e:
+            print(f"サムネイルキャッシュを開けませんでした: {self.db_path}, {e}")
+            self.close()
+
+    @property
+    def enabled(self) -> bool:
+        """キャッシュが使用可能か"""
+        return self.conn is not None
+
+    def get_many(self, keys: list[tuple[str, int, int]], thumb_size: int) -> dict[str, tuple]:
+        """
+        複数のサムネイルを一括取得
+
+        Args:
+            keys: (絶対パス, 更新日時ns, ファイルサイズ) のリスト
+            thumb_size: サムネイルサイズ
+
+        Returns:
+            {絶対パス: (JPEGのバイト列, 元画像のサイズ or None)}（ヒットしたもののみ）
+        """
+        if not self.enabled or not keys:
+            return {}
+
+        expected = {path: (mtime_ns, file_size) for path, mtime_ns, file_size in keys}
+        hits = {}
+
+        try:
+            # SQLiteの変数上限を超えないよう分割して問い合わせ
+            paths = list(expected)
+            chunk = 500
+            for start in range(0, len(paths), chunk):
+                part = paths[start:start + chunk]
+                placeholders = ",".join("?" * len(part))
+                rows = self.conn.execute(
+                    f"SELECT path, mtime_ns, file_size, image_width, image_height, data FROM thumbnails "
+                    f"WHERE thumb_size = ? AND path IN ({placeholders})",
+                    [thumb_size, *part]
+                )
+                for path, mtime_ns, file_size, image_width, image_height, data in rows:
+                    if expected.get(path) == (mtime_ns, file_size):
+                        image_size = (image_width, image_height) if image_width else None
+                        hits[path] = (data, image_size)
+
+            # 最終アクセス日時を更新（LRU）
+            if hits:
+                now = time.time()
+                self.conn.executemany(
+                    "UPDATE thumbnails SET last_access = ? WHERE path = ? AND thumb_size = ?",
+                    [(now, path, thumb_size) for path in hits]
+                )
+                self.conn.commit()
+
+        except Exception as e:
+            print(f"サムネイルキャッシュの読み込みエラー: {e}")
+
+        return hits
+
+    def put_many(self, entries: list[tuple[str, int, int, int, bytes, tuple]]):
+        """
+        複数のサムネイルを一括保存
+
+        Args:
+            entries: (絶対パス, 更新日時ns, ファイルサイズ, サムネイルサイズ, JPEGのバイト列,
+                      元画像のサイズ or None) のリスト
+        """
+        if not self.enabled or not entries:
+            return
+
+        try:
+            now = time.time()
+
+            # 置き換えられるエントリの分を差し引く
+            for path, _, _, thumb_size, _, _ in entries:
+                row = self.conn.execute(
+                    "SELECT LENGTH(data) FROM thumbnails WHERE path = ? AND thumb_size = ?",
+                    (path, thumb_size)
+                ).fetchone()
+                if row:
+                    self.total_bytes -= row[0]
+
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO thumbnails "
+                "(path, thumb_size, mtime_ns, file_size, image_width, image_height, last_access, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(path, thumb_size, mtime_ns, file_size,
+                  image_size[0] if image_size else None, image_size[1] if image_size else None, now, data)
+                 for path, mtime_ns, file_size, thumb_size, data, image_size in entries]
+            )
+            self.total_bytes += sum(len(entry[4]) for entry in entries)
+            self.conn.commit()
+
+            self._evict()
+
+        except Exception as e:
+            print(f"サムネイルキャッシュの書き込みエラー: {e}")
+
+    def _evict(self):
+        """上限を超えた分を最終アクセスが古い順に削除"""
+        if self.total_bytes <= self.max_bytes:
+            return
+
+        # 毎回の削除を避けるため、上限の90%まで減らす
+        target = int(self.max_bytes * 0.9)
+        rows = self.conn.execute(
+            "SELECT rowid, LENGTH(data) FROM thumbnails ORDER BY last_access ASC"
+        )
+
+        evict_ids = []
+        for rowid, length in rows:
+            if self.total_bytes <= target:
+                break
+            evict_ids.append((rowid,))
+            self.total_bytes -= length
+
+        self.conn.executemany("DELETE FROM thumbnails WHERE rowid = ?", evict_ids)
+        self.conn.commit()
+
+    def clear(self):
+        """キャッシュを全削除"""
+        if not self.enabled:
+            return
+
+        try:
+            self.conn.execute("DELETE FROM thumbnails")
+            self.conn.commit()
+            self.total_bytes = 0
+        except Exception as e:
+            print(f"サムネイルキャッシュの削除エラー: {e}")
+
+    def close(self):
+        """データベースを閉じる"""
+        if self.conn is not None:
+            try:
+                self.conn.close()
+            except Exception:
+                pass
+            self.conn = None
@@ -0,0 +1,225 @@
+"""サムネイルのメモリキャッシュ（プロセス全体で共有）"""
+import threading
+from collections import OrderedDict
+from PyQt6.QtGui import QPixmap
+from src.utils.constants import DEFAULT_THUMBNAIL_MEMORY_MB, THUMBNAIL_PYRAMID_LEVELS
+
+
+class ThumbnailStore:
+    """
+    メモリ上のサムネイルを一元管理するLRUキャッシュ
+
+    キーは (絶対パス, サムネイルサイズ)。1枚の画像について解像度の異なる
+    サムネイル（THUMBNAIL_PYRAMID_LEVELS）を並べて保持できる。合計バイト数が上限を超えたら
+    最後に参照されてから最も時間が経ったものから破棄する。
+    読み込みワーカーのスレッドからも書き込まれるため、操作はロックで保護する。
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_THUMBNAIL_MEMORY_MB * 1024 * 1024):
+        """
+        Args:
+            max_bytes: 保持する上限バイト数
+        """
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries: OrderedDict[tuple[str, int], QPixmap] = OrderedDict()
+        self._lock = threading.Lock()
+
+        # 統計
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, path: str, size: int) -> QPixmap | None:
+        """
+        サムネイルを取得（ヒットしたものは最近使ったものとして扱う）
+
+        Args:
+            path: 画像の絶対パス
+            size: サムネイルサイズ
+
+        Returns:
+            QPixmap（キャッシュにない場合はNone）
+        """
+        key = (path, size)
+        with self._lock:
+            pixmap = self._entries.get(key)
+            if pixmap is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return pixmap
+
+    def get_best(self, path: str, size: int) -> tuple[QPixmap | None, int]:
+        """
+        指定サイズのサムネイルを取得（ない場合は他の解像度で代用）
+
+        大きい解像度（縮小して描画でき、粗くならない）→ 小さい解像度の順に探す。
+        統計は指定サイズがあった場合のみヒットとして数える。
+
+        Args:
+            path: 画像の絶対パス
+            size: サムネイルサイズ（解像度）
+
+        Returns:
+            (QPixmap or None, 見つかったサイズ)（見つからない場合は (None, 0)）
+        """
+        with self._lock:
+            pixmap, found = self._find_best(path, size)
+            if pixmap is None:
+                self.misses += 1
+                return None, 0
+            self._entries.move_to_end((path, found))
+            if found == size:
+                self.hits += 1
+            else:
+                self.misses += 1
+            return pixmap, found
+
+    def peek_best(self, path: str, size: int) -> tuple[QPixmap | None, int]:
+        """get_best と同じ探し方で取得（統計・LRUの順序には影響しない。ホバー判定などの参照用）"""
+        with self._lock:
+            return self._find_best(path, size)
+
+    def _find_best(self, path: str, size: int) -> tuple[QPixmap | None, int]:
+        """指定サイズ → 他の解像度の順に探す（ロック内で呼ぶこと）"""
+        for candidate in _fallback_order(size):
+            pixmap = self._entries.get((path, candidate))
+            if pixmap is not None:
+                return pixmap, candidate
+        return None, 0
+
+    def contains(self, path: str, size: int) -> bool:
+        """サムネイルが保持されているか（統計・LRUの順序には影響しない）"""
+        with self._lock:
+            return (path, size) in self._entries
+
+    def put(self, path: str, size: int, pixmap: QPixmap):
+        """
+        サムネイルを保存（上限を超えた分は古いものから破棄）
+
+        Args:
+            path: 画像の絶対パス
+            size: サムネイルサイズ
+            pixmap: サムネイル
+        """
+        key = (path, size)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.total_bytes -= _pixmap_bytes(old)
+
+            self._entries[key] = pixmap
+            self.total_bytes += _pixmap_bytes(pixmap)
+            self._evict()
+
+    def discard(self, path: str, keep_size: int = None):
+        """
+        指定画像のサムネイルを破棄
+
+        Args:
+            path: 画像の絶対パス
+            keep_size: 保持するサイズ（Noneの場合は全サイズを破棄）
+        """
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == path and key[1] != keep_size]:
+                self.total_bytes -= _pixmap_bytes(self._entries.pop(key))
+
+    def set_max_bytes(self, max_bytes: int):
+        """上限バイト数を変更（超過分はすぐに破棄）"""
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def clear(self):
+        """全て破棄（統計は保持）"""
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def stats(self) -> dict:
+        """
+        統計情報を返す
+
+        Returns:
+            {"entries", "bytes", "max_bytes", "hits", "misses", "evictions"}
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def log_stats(self, logger, label: str = ""):
+        """
+        統計情報をログに出力
+
+        Args:
+            logger: Logger
+            label: ログの先頭に付ける説明（契機など）
+        """
+        stats = self.stats()
+        lookups = stats["hits"] + stats["misses"]
+        hit_rate = stats["hits"] / lookups * 100 if lookups else 0.0
+        prefix = f"{label}: " if label else ""
+        logger.info(
+            f"{prefix}サムネイルメモリキャッシュ {stats['entries']}件 "
+            f"{stats['bytes'] / (1024 * 1024):.1f} / {stats['max_bytes'] / (1024 * 1024):.0f} MB, "
+            f"ヒット {stats['hits']} / ミス {stats['misses']} ({hit_rate:.1f}%), 破棄 {stats['evictions']}"
+        )
+
+    def _evict(self):
+        """上限を超えた分を古い順に破棄（ロック取得済みで呼び出す）"""
+        while self.total_bytes > self.max_bytes and self._entries:
+            _, pixmap = self._entries.popitem(last=False)
+            self.total_bytes -= _pixmap_bytes(pixmap)
+            self.evictions += 1
+
+
+def pyramid_level(size: int) -> int:
+    """
+    表示サイズに使う解像度（表示サイズ以上で最小のもの、超える場合は最大のもの）
+
+    Args:
+        size: 表示するサムネイルのサイズ
+
+    Returns:
+        THUMBNAIL_PYRAMID_LEVELS のいずれか
+    """
+    return next((level for level in THUMBNAIL_PYRAMID_LEVELS if level >= size), THUMBNAIL_PYRAMID_LEVELS[-1])
+
+
+def _fallback_order(size: int) -> tuple[int, ...]:
+    """指定サイズ → 大きい解像度（近い順） → 小さい解像度（近い順）"""
+    order = _FALLBACK_ORDERS.get(size)
+    if order is None:
+        larger = sorted(level for level in THUMBNAIL_PYRAMID_LEVELS if level > size)
+        smaller = sorted((level for level in THUMBNAIL_PYRAMID_LEVELS if level < size), reverse=True)
+        order = _FALLBACK_ORDERS[size] = (size, *larger, *smaller)
+    return order
+
+
+_FALLBACK_ORDERS: dict[int, tuple[int, ...]] = {}
+
+
+def _pixmap_bytes(pixmap: QPixmap) -> int:
+    """QPixmapのおおよそのメモリ使用量"""
+    return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+
+_store: ThumbnailStore = None
+_store_lock = threading.Lock()
+
+
+def get_thumbnail_store() -> ThumbnailStore:
+    """プロセス全体で共有するサムネイルストアを返す（初回呼び出し時に作成）"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ThumbnailStore()
+        return _store
@@ -0,0 +1,51 @@
+"""削除した画像の保持（Undo用）"""
+from src.models.image_model import ImageModel
+
+
+class TombstoneStore:
+    """
+    削除した ImageModel を、削除の履歴が残っている間そのまま保持する
+
+    履歴には番号だけを記録し、Undo ではここから同じオブジェクトを取り出して挿入し直す
+    （ファイルを読み直したりヘッダを解析し直したりしない）。
+    Redo で再び削除されたときも同じ番号のまま使い回し、履歴から削除の記録が
+    破棄されたときに release で手放す。
+    """
+
+    def __init__(self):
+        self._entries: dict[int, tuple[ImageModel, ...]] = {}
+        self._next_id = 0
+        self.image_count = 0  # 保持している画像の合計枚数
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def park(self, images) -> int:
+        """
+        削除した画像を保持
+
+        Args:
+            images: 削除した画像（元の順序）
+
+        Returns:
+            保持した画像の番号（履歴に記録する）
+        """
+        tombstone_id = self._next_id
+        self._next_id += 1
+        self._entries[tombstone_id] = tuple(images)
+        self.image_count += len(self._entries[tombstone_id])
+        return tombstone_id
+
+    def get(self, tombstone_id: int) -> tuple[ImageModel, ...]:
+        """保持している画像を取得（保持は続ける）"""
+        return self._entries[tombstone_id]
+
+    def release(self, tombstone_id: int):
+        """保持している画像を手放す"""
+        images = self._entries.pop(tombstone_id, ())
+        self.image_count -= len(images)
+
+    def clear(self):
+        """全て手放す"""
+        self._entries.clear()
+        self.image_count = 0
@@ -13,6 +13,58 @@ MIN_THUMBNAIL_SIZE = 100
 MAX_THUMBNAIL_SIZE = 400
 THUMBNAIL_SIZE_STEP = 50
 
+# 読み込み（サムネイル生成の並列化）
+DEFAULT_LOAD_WORKERS = 0  # 0: CPUコア数に合わせて自動
+LOAD_WORKER_MODES = ["thread", "process", "serial"]
+DEFAULT_LOAD_WORKER_MODE = "thread"
+
+# ストリーミング読み込み（準備できた画像から順次表示）
+STREAM_BATCH_MAX = 64  # 1回に通知する最大枚数
+STREAM_BATCH_INTERVAL_MS = 100  # 通知間隔の目安
+GRID_BUILD_SLICE_MS = 8  # 読み込み中のグリッド更新にUIスレッドで1回に使う時間の上限
+GRID_BUILD_SLICE_ITEMS = 512  # グリッド更新で1回の追加・再描画にまとめる最大枚数（この単位で時間を確認）
+
+# 表示範囲を優先したサムネイル生成
+VIEWPORT_PREFETCH_PAGES = 1  # 表示範囲の前後に先読みする画面数
+VISIBLE_RANGE_NOTIFY_MS = 50  # スクロール中に表示範囲を通知する間隔
+
+# ドラッグ中の自動スクロール（ビューポートの上下端に近づけるとスクロール）
+DRAG_AUTO_SCROLL_MARGIN = 48  # 端からこの距離（px）に入るとスクロール
+DRAG_AUTO_SCROLL_INTERVAL_MS = 16
+DRAG_AUTO_SCROLL_MIN_SPEED = 4  # 1回あたりのスクロール量（px、端に近いほど MAX に近づく）
+DRAG_AUTO_SCROLL_MAX_SPEED = 48
+DRAG_AUTO_SCROLL_ACCEL_MS = 1500  # 端に留まり続けるとこの時間をかけて最大 BOOST 倍まで加速
+DRAG_AUTO_SCROLL_MAX_BOOST = 4
+
+# UIスレッドの停止検出（閾値以上イベントループが止まるとスタックをログに記録）
+DEFAULT_STALL_WATCHDOG_MS = 50  # 停止とみなす時間（0: 無効）
+STALL_WATCHDOG_HEARTBEAT_MS = 20  # UIスレッドのハートビート間隔
+STALL_WATCHDOG_SAMPLE_MS = 10  # 停止中にスタックを採取する間隔
+STALL_WATCHDOG_STACK_DEPTH = 30  # 採取するスタックの深さ（内側から）
+STALL_WATCHDOG_REPORT_STACKS = 3  # 1回の停止で記録するスタックの種類数
+STALL_WATCHDOG_MAX_SAMPLES = 300  # 1回の停止で保持するスタックの上限（以降は採取しない）
+
+# サムネイルのメモリキャッシュ（プロセス全体で共有）
+DEFAULT_THUMBNAIL_MEMORY_MB = 512
+
+# サムネイルの解像度（表示サイズ以上で最小のものを縮小して描画する）
+THUMBNAIL_PYRAMID_LEVELS = (100, 200, 400)
+THUMBNAIL_DECODER_WORKERS = 2  # ズーム時に不足した解像度を生成する並列数
+THUMBNAIL_DECODER_QUEUE_MAX = 256  # 生成待ちの上限（超えた分は古い要求から破棄）
+
+# サムネイルのディスクキャッシュ
+THUMBNAIL_CACHE_PATH = "cache/thumbnails.db"
+DEFAULT_THUMBNAIL_CACHE_MAX_MB = 512
+THUMBNAIL_CACHE_QUALITY = 90
+
+# 並べ替え作業の記録（異常終了後も同じフォルダを開くと続きから再開）
+SESSION_JOURNAL_PATH = "cache/sessions.db"
+SESSION_JOURNAL_SNAPSHOT_OPS = 200  # この件数の変更ごとにスナップショットを書き直す
+
+# EXIF埋め込みサムネイル（先行表示用）
+EXIF_HEADER_READ_BYTES = 128 * 1024  # APP1は最大64KB（前にAPP0等が入る分の余裕を含む）
+EXIF_THUMBNAIL_MIN_RATIO = 0.75  # サムネイルサイズに対してこの比率以上なら使用
+
 DEFAULT_JPG_QUALITY = 95
 DEFAULT_RENAME_DIGITS = 3
 DEFAULT_RENAME_START = 1
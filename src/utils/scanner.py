@@ -0,0 +1,89 @@
+"""画像ファイルのスキャン（os.scandirによる1パス列挙）"""
+import os
+import stat
+from typing import NamedTuple
+from src.utils.constants import SUPPORTED_FORMATS
+
+
+class ScanEntry(NamedTuple):
+    """スキャン結果（statはスキャン時に1回だけ取得して使い回す）"""
+    path: str  # 絶対パス
+    name: str  # ファイル名
+    size: int  # ファイルサイズ
+    mtime_ns: int  # 更新日時（ナノ秒）
+
+
+def is_supported(name: str) -> bool:
+    """対応形式の拡張子か"""
+    return os.path.splitext(name)[1].lower() in SUPPORTED_FORMATS
+
+
+def scan_folder(folder_path: str) -> list[ScanEntry]:
+    """
+    フォルダ内の対応画像を列挙（パス順にソート）
+
+    拡張子で先に絞り込み、対象ファイルのみstatする。
+    DirEntryのstatはキャッシュされる（Windowsではディレクトリ列挙時に取得済み）。
+
+    Args:
+        folder_path: フォルダパス
+
+    Returns:
+        ScanEntryのリスト
+
+    Raises:
+        FileNotFoundError: フォルダが存在しない場合
+        NotADirectoryError: 指定されたパスがディレクトリでない場合
+        PermissionError: フォルダへのアクセス権限がない場合
+    """
+    if not os.path.exists(folder_path):
+        raise FileNotFoundError(f"フォルダが見つかりません: {folder_path}")
+
+    if not os.path.isdir(folder_path):
+        raise NotADirectoryError(f"指定されたパスはフォルダではありません: {folder_path}")
+
+    entries = []
+    try:
+        with os.scandir(os.path.abspath(folder_path)) as it:
+            for entry in it:
+                if not is_supported(entry.name):
+                    continue
+                try:
+                    if not entry.is_file():
+                        continue
+                    st = entry.stat()
+                except OSError:
+                    continue
+                entries.append(ScanEntry(entry.path, entry.name, st.st_size, st.st_mtime_ns))
+
+    except PermissionError as e:
+        raise PermissionError(f"フォルダへのアクセス権限がありません: {folder_path}") from e
+
+    entries.sort(key=lambda entry: entry.path)
+    return entries
+
+
+def scan_files(file_paths: list[str]) -> list[ScanEntry]:
+    """
+    ファイルパスのリストから対応画像を抽出（指定順を維持）
+
+    Args:
+        file_paths: ファイルパスのリスト
+
+    Returns:
+        ScanEntryのリスト（存在しないファイル・通常のファイルでないものは除外）
+    """
+    entries = []
+    for file_path in file_paths:
+        if not is_supported(file_path):
+            continue
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            continue
+        if not stat.S_ISREG(st.st_mode):
+            continue
+        path = os.path.abspath(file_path)
+        entries.append(ScanEntry(path, os.path.basename(path), st.st_size, st.st_mtime_ns))
+
+    return entries
@@ -0,0 +1,140 @@
+"""UIスレッドの停止（イベントループの詰まり）の検出"""
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from PyQt6.QtCore import QObject, QTimer, Qt
+from src.utils.constants import (
+    STALL_WATCHDOG_HEARTBEAT_MS, STALL_WATCHDOG_SAMPLE_MS,
+    STALL_WATCHDOG_STACK_DEPTH, STALL_WATCHDOG_REPORT_STACKS, STALL_WATCHDOG_MAX_SAMPLES
+)
+
+
+class StallWatchdog(QObject):
+    """
+    UIスレッドのイベントループが閾値以上止まったことを検出してログに記録する
+
+    UIスレッドで一定間隔のタイマー（ハートビート）を動かし、監視スレッドは
+    ハートビートが閾値の半分以上遅れている間UIスレッドのスタックを採取する
+    （閾値を少し超えただけの停止でもスタックが残るよう、閾値に達する前から採取する）。
+    停止が明けたときにUIスレッド側で、閾値以上の停止であれば停止時間と採取したスタック
+    （多く観測された順）を Logger に書き出し、閾値未満であれば採取したものを捨てる。
+    """
+
+    def __init__(self, logger, threshold_ms: int, parent=None):
+        """
+        Args:
+            logger: Logger
+            threshold_ms: 停止とみなす時間（ミリ秒）
+            parent: 親オブジェクト
+        """
+        super().__init__(parent)
+        self.logger = logger
+        self.threshold = threshold_ms / 1000
+        self.interval = STALL_WATCHDOG_HEARTBEAT_MS / 1000
+
+        self._gui_ident: int = None
+        self._last_beat = time.perf_counter()
+        self._samples: list[traceback.StackSummary] = []
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread = None
+
+        # 集計（終了時に記録）
+        self.stall_count = 0
+        self.stall_total = 0.0
+        self.stall_max = 0.0
+
+        self.heartbeat = QTimer(self)
+        self.heartbeat.setTimerType(Qt.TimerType.PreciseTimer)
+        self.heartbeat.setInterval(STALL_WATCHDOG_HEARTBEAT_MS)
+        self.heartbeat.timeout.connect(self._on_heartbeat)
+
+    def start(self):
+        """監視を開始（UIスレッドから呼ぶ）"""
+        if self._thread is not None:
+            return
+
+        self._gui_ident = threading.get_ident()
+        self._last_beat = time.perf_counter()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._sample_loop, name="StallWatchdog", daemon=True)
+        self._thread.start()
+        self.heartbeat.start()
+
+    def stop(self):
+        """監視を終了して集計をログに記録"""
+        if self._thread is None:
+            return
+
+        self.heartbeat.stop()
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+
+        if self.stall_count:
+            self.logger.info(
+                f"UI停止の集計: {self.stall_count}回 / 最大 {self.stall_max * 1000:.0f} ms / "
+                f"合計 {self.stall_total * 1000:.0f} ms"
+            )
+
+    def _sample_loop(self):
+        """ハートビートが途切れている間、UIスレッドのスタックを採取（監視スレッド）"""
+        sample_interval = STALL_WATCHDOG_SAMPLE_MS / 1000
+        while not self._stop_event.wait(sample_interval):
+            if time.perf_counter() - self._last_beat < self.interval + self.threshold / 2:
+                continue
+            with self._lock:
+                if len(self._samples) >= STALL_WATCHDOG_MAX_SAMPLES:
+                    continue
+
+            frame = sys._current_frames().get(self._gui_ident)
+            if frame is None:
+                continue
+            stack = traceback.extract_stack(frame, limit=STALL_WATCHDOG_STACK_DEPTH)
+            del frame
+
+            with self._lock:
+                self._samples.append(stack)
+
+    def _on_heartbeat(self):
+        """ハートビート（UIスレッド）: 前回からの遅れが閾値以上なら停止として記録（未満なら採取分を捨てる）"""
+        now = time.perf_counter()
+        stall = now - self._last_beat - self.interval
+        self._last_beat = now
+
+        with self._lock:
+            samples = self._samples
+            self._samples = []
+
+        if stall >= self.threshold:
+            self._report(stall, samples)
+
+    def _report(self, stall: float, samples: list[traceback.StackSummary]):
+        """
+        停止時間とスタックをログに記録
+
+        Args:
+            stall: 停止時間（秒）
+            samples: 停止中に採取したスタック
+        """
+        self.stall_count += 1
+        self.stall_total += stall
+        self.stall_max = max(self.stall_max, stall)
+
+        lines = [f"UIの停止を検出: {stall * 1000:.0f} ms（スタック採取 {len(samples)}回）"]
+
+        # 同じ箇所で止まっていたサンプルをまとめ、多く観測された順に記録
+        stacks = {}
+        counts = Counter()
+        for stack in samples:
+            key = tuple((frame.filename, frame.lineno, frame.name) for frame in stack)
+            stacks.setdefault(key, stack)
+            counts[key] += 1
+
+        for key, count in counts.most_common(STALL_WATCHDOG_REPORT_STACKS):
+            lines.append(f"--- {count}/{len(samples)}回:")
+            lines.extend(line.rstrip("\n") for line in stacks[key].format())
+
+        self.logger.warning("\n".join(lines))
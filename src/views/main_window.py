@@ -4,15 +4,21 @@ from PyQt6.QtWidgets import (
     QMessageBox, QMenuBar, QMenu, QCheckBox
 )
 from PyQt6.QtGui import QAction, QKeySequence
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
 from src.models.config_model import ConfigModel
 from src.controllers.image_controller import ImageController
 from src.controllers.rename_controller import RenameController
 from src.controllers.file_controller import FileController
+from src.models.thumbnail_store import get_thumbnail_store, pyramid_level
+from src.models.session_journal import SessionJournal
 from src.views.settings_panel import SettingsPanel
 from src.views.preview_area import PreviewArea
-from src.utils.constants import WINDOW_DEFAULT_SIZE, WINDOW_MIN_SIZE
+from src.utils.constants import (
+    WINDOW_DEFAULT_SIZE, WINDOW_MIN_SIZE, DEFAULT_LOAD_WORKERS, DEFAULT_LOAD_WORKER_MODE,
+    DEFAULT_THUMBNAIL_CACHE_MAX_MB, DEFAULT_THUMBNAIL_MEMORY_MB, DEFAULT_STALL_WATCHDOG_MS
+)
 from src.utils.logger import Logger
+from src.utils.stall_watchdog import StallWatchdog
 
 
 class MainWindow(QMainWindow):
@@ -26,6 +32,22 @@ class MainWindow(QMainWindow):
         self.rename_controller = RenameController()
         self.file_controller = FileController(self.logger)
 
+        # 並べ替え作業の記録（同じフォルダを開くと前回の続きから再開）
+        self.session_journal = SessionJournal() if self.config.get("session_journal", True) else None
+        self.image_controller.journal = self.session_journal
+
+        # UIの停止（イベントループの詰まり）をスタック付きでログに記録
+        self.stall_watchdog = None
+        threshold_ms = self.config.get("stall_watchdog_ms", DEFAULT_STALL_WATCHDOG_MS)
+        if threshold_ms > 0:
+            self.stall_watchdog = StallWatchdog(self.logger, threshold_ms, self)
+            self.stall_watchdog.start()
+
+        # サムネイルのメモリ上限を設定
+        get_thumbnail_store().set_max_bytes(
+            self.config.get("thumbnail_memory_mb", DEFAULT_THUMBNAIL_MEMORY_MB) * 1024 * 1024
+        )
+
         self.init_ui()
         self.setup_menu_bar()
         self.setup_shortcuts()
@@ -58,8 +80,12 @@ class MainWindow(QMainWindow):
         self.preview_area.order_changed.connect(self._on_order_changed)
         self.preview_area.order_changed_multiple.connect(self._on_order_changed_multiple)
         self.preview_area.delete_requested.connect(self._on_delete_requested)
+        self.preview_area.visible_range_changed.connect(self._on_visible_range_changed)
         layout.addWidget(self.preview_area, 4)
 
+        # 並べ替え・削除・Undo/Redoは差分だけをプレビューに反映
+        self.image_controller.add_listener(self.preview_area.apply_image_change)
+
         # 右: 設定パネル（1/5）
         self.settings_panel = SettingsPanel(self.config)
         self.settings_panel.mode_changed.connect(self._on_mode_changed)
@@ -109,6 +135,23 @@ class MainWindow(QMainWindow):
         redo_action.triggered.connect(self._on_redo)
         edit_menu.addAction(redo_action)
 
+        # 並べ替えメニュー（名前以外のキーは同じ値の中を名前順に並べる）
+        from src.models.image_sort import SORT_KEYS
+
+        sort_menu = menubar.addMenu("並べ替え(&S)")
+        for key, (label, _) in SORT_KEYS.items():
+            for ascending, direction in ((True, "昇順"), (False, "降順")):
+                keys = [(key, ascending)] if key == "name" else [(key, ascending), ("name", True)]
+                sort_action = QAction(f"{label}（{direction}）", self)
+                sort_action.triggered.connect(lambda checked=False, keys=keys: self._on_sort_by_requested(keys))
+                sort_menu.addAction(sort_action)
+
+        sort_menu.addSeparator()
+
+        restore_order_action = QAction("元の順序に戻す", self)
+        restore_order_action.triggered.connect(self._on_restore_order)
+        sort_menu.addAction(restore_order_action)
+
         # ヘルプメニュー
         help_menu = menubar.addMenu("ヘルプ(&H)")
 
@@ -153,6 +196,10 @@ class MainWindow(QMainWindow):
 
     def _on_save_requested(self):
         """保存リクエスト時"""
+        if self.preview_area.is_loading:
+            QMessageBox.warning(self, "警告", "画像の読み込み中です。完了してから保存してください。")
+            return
+
         if not self.image_controller.images:
             QMessageBox.warning(self, "警告", "保存する画像がありません。")
             return
@@ -236,11 +283,15 @@ class MainWindow(QMainWindow):
         progress_dialog.exec()
 
     def _on_save_finished(self, success: int, fail: int, errors: list, progress_dialog):
-        """保存完了時"""
+        """保存完了時（完了メッセージを1秒表示してから結果を表示、その間もUIは止めない）"""
+        delay_ms = 0 if progress_dialog.is_cancelled() else 1000
+        QTimer.singleShot(
+            delay_ms, lambda: self._show_save_result(success, fail, progress_dialog)
+        )
+
+    def _show_save_result(self, success: int, fail: int, progress_dialog):
+        """保存結果を表示"""
         # プログレスダイアログを閉じる
-        if not progress_dialog.is_cancelled():
-            import time
-            time.sleep(1)  # 完了メッセージを1秒表示
         progress_dialog.accept()
 
         # 結果表示
@@ -267,45 +318,75 @@ class MainWindow(QMainWindow):
 
     def _on_sort_requested(self, ascending: bool):
         """ソートリクエスト時"""
+        # 読み込み中は並び順を変更しない
+        if self.preview_area.is_loading:
+            return
+
         self.image_controller.sort_by_name(ascending)
-        self.preview_area.load_images(self.image_controller.images)
+
+    def _on_sort_by_requested(self, keys: list[tuple[str, bool]]):
+        """並べ替えメニューからのソート"""
+        # 読み込み中は並び順を変更しない
+        if self.preview_area.is_loading:
+            return
+
+        self.image_controller.sort_by(keys)
+        self.logger.info(f"並べ替え: {keys}")
 
     def _on_restore_order(self):
         """元の順序に戻す"""
+        # 読み込み中は並び順を変更しない
+        if self.preview_area.is_loading:
+            return
+
         self.image_controller.restore_original_order()
-        self.preview_area.load_images(self.image_controller.images)
 
     def _on_undo(self):
         """Undo"""
-        if self.image_controller.undo():
-            self.preview_area.load_images(self.image_controller.images)
+        # 読み込み中は並び順を変更しない
+        if self.preview_area.is_loading:
+            return
+
+        self.image_controller.undo()
 
     def _on_redo(self):
         """Redo"""
-        if self.image_controller.redo():
-            self.preview_area.load_images(self.image_controller.images)
+        # 読み込み中は並び順を変更しない
+        if self.preview_area.is_loading:
+            return
+
+        self.image_controller.redo()
 
     def _on_order_changed(self, from_index: int, to_index: int):
         """順序変更時（ドラッグ&ドロップ - 単一）"""
+        # 読み込み中は並び順を変更しない
+        if self.preview_area.is_loading:
+            return
+
         self.image_controller.reorder(from_index, to_index)
-        self.preview_area.load_images(self.image_controller.images)
         self.logger.info(f"画像を並べ替え: {from_index} → {to_index}")
 
     def _on_order_changed_multiple(self, from_indices: list[int], to_index: int):
         """順序変更時（ドラッグ&ドロップ - 複数）"""
+        # 読み込み中は並び順を変更しない
+        if self.preview_area.is_loading:
+            return
+
         self.image_controller.reorder_multiple(from_indices, to_index)
-        self.preview_area.load_images(self.image_controller.images)
         self.logger.info(f"複数画像を並べ替え: {from_indices} → {to_index}")
 
     def _on_delete_requested(self, indices: list[int]):
         """削除リクエスト時"""
+        # 読み込み中は並び順を変更しない
+        if self.preview_area.is_loading:
+            return
+
         if not indices:
             return
 
         # 設定で確認ダイアログをスキップする場合
         if not self.config.get("show_delete_confirmation", True):
             self.image_controller.delete_images(indices)
-            self.preview_area.load_images(self.image_controller.images)
             self.logger.info(f"{len(indices)}枚の画像を削除")
             return
 
@@ -330,11 +411,14 @@ class MainWindow(QMainWindow):
 
         if reply == QMessageBox.StandardButton.Yes:
             self.image_controller.delete_images(indices)
-            self.preview_area.load_images(self.image_controller.images)
             self.logger.info(f"{len(indices)}枚の画像を削除")
 
     def _on_reset_requested(self):
         """リセットリクエスト時"""
+        # 読み込み中は並び順を変更しない
+        if self.preview_area.is_loading:
+            return
+
         # 画像が読み込まれていない場合は何もしない
         if not self.image_controller.images:
             return
@@ -349,13 +433,17 @@ class MainWindow(QMainWindow):
         )
 
         if reply == QMessageBox.StandardButton.Yes:
+            # 作業の記録も破棄（次に開いたときは最初から）
+            if self.session_journal is not None:
+                self.session_journal.discard()
+
             # 画像コントローラーをリセット
             self.image_controller.images.clear()
             self.image_controller.original_order.clear()
             self.image_controller.history.clear()
 
             # プレビューエリアをリセット（初期状態に戻す）
-            self.preview_area.load_images([])
+            self.preview_area.load_images(self.image_controller.images)
 
             self.logger.info("画像をリセット")
 
@@ -406,101 +494,64 @@ class MainWindow(QMainWindow):
             self.load_folder(str(folders[0]))
             return
 
-        # 画像ファイルのみの場合
-        image_files = []
-        for path in paths:
-            if path.is_file():
-                ext = path.suffix.lower()
-                from src.utils.constants import SUPPORTED_FORMATS
-                if ext in SUPPORTED_FORMATS:
-                    image_files.append(str(path))
+        # 画像ファイルのみの場合（スキャン結果はワーカーに引き継ぐ）
+        from src.utils.scanner import scan_files
+        entries = scan_files([str(path) for path in paths])
 
-        if image_files:
+        if entries:
             # 新規フォルダ作成モードに切り替え
             self.settings_panel.new_folder_mode_radio.setChecked(True)
-            self.logger.info(f"{len(image_files)}枚の画像ファイルをドロップ受信")
-
-            # 非同期読み込み + プログレスバー
-            from src.controllers.load_worker import LoadWorker
-            from src.views.progress_dialog import ProgressDialog
-
-            # プログレスダイアログを表示
-            progress_dialog = ProgressDialog(len(image_files), self, mode="load")
+            self.logger.info(f"{len(entries)}枚の画像ファイルをドロップ受信")
 
             # ワーカースレッド作成
-            self.load_worker = LoadWorker(
-                file_paths=image_files,
-                thumbnail_size=self.preview_area.thumbnail_size
+            self.load_worker = self._create_load_worker(
+                file_paths=[entry.path for entry in entries], entries=entries
             )
 
             # デフォルトの出力先を取得
-            first_file = Path(image_files[0])
+            first_file = Path(entries[0].path)
             default_output = str(first_file.parent)
 
-            # シグナル接続
-            self.load_worker.progress.connect(progress_dialog.update_progress)
-            self.load_worker.finished.connect(
-                lambda images: self._on_files_load_finished(images, default_output, progress_dialog)
-            )
-            self.load_worker.error.connect(
-                lambda error_msg: self._on_load_error(error_msg, progress_dialog)
-            )
-
             # 読み込み開始
-            self.load_worker.start()
-            progress_dialog.exec()
+            self._start_load_worker(
+                len(entries),
+                lambda images, progress_dialog: self._on_files_load_finished(images, default_output, progress_dialog)
+            )
 
     def _on_files_load_finished(self, images, default_output, progress_dialog):
         """ファイル読み込み完了時"""
-        # プログレスダイアログを閉じる
-        import time
-        time.sleep(0.5)
-        progress_dialog.accept()
-
-        # コントローラーに画像を設定
-        self.image_controller.images = images
-        self.image_controller.original_order = images.copy()
-        self.image_controller.history.clear()
+        self._apply_loaded_images(images, progress_dialog)
 
         # デフォルトの出力先を設定
         self.settings_panel.output_path_input.setText(default_output)
         self.config.set("last_output_folder", default_output)
 
-        # プレビュー表示
-        self.preview_area.load_images(images)
-
-        self.logger.info(f"ファイル読み込み完了: {len(images)}枚")
+        self.logger.info(f"ファイル読み込み完了: {len(self.image_controller.images)}枚")
 
     def load_folder(self, folder_path: str):
         """フォルダを読み込む（内部メソッド）"""
         self.logger.info(f"フォルダ読み込み開始: {folder_path}")
 
-        # 非同期読み込み + プログレスバー
-        from src.controllers.load_worker import LoadWorker
-        from src.views.progress_dialog import ProgressDialog
-
-        # まず画像数を調査（高速）
-        from pathlib import Path
+        # まず画像を列挙（1パスでstatまで取得し、結果はワーカーに引き継ぐ）
         from src.utils.constants import SUPPORTED_FORMATS
+        from src.utils.scanner import scan_folder
 
-        folder = Path(folder_path)
-        if not folder.exists():
+        try:
+            entries = scan_folder(folder_path)
+        except FileNotFoundError:
             QMessageBox.critical(self, "エラー", f"フォルダが見つかりません。\n\n{folder_path}")
             self.logger.error(f"フォルダが見つかりません: {folder_path}")
             return
-
-        if not folder.is_dir():
+        except NotADirectoryError:
             QMessageBox.critical(self, "エラー", f"指定されたパスはフォルダではありません。\n\n{folder_path}")
             self.logger.error(f"パスはフォルダではありません: {folder_path}")
             return
-
-        try:
-            image_count = sum(1 for f in folder.iterdir() if f.is_file() and f.suffix.lower() in SUPPORTED_FORMATS)
         except PermissionError:
             QMessageBox.critical(self, "エラー", f"フォルダへのアクセス権限がありません。\n\n{folder_path}")
             self.logger.error(f"アクセス権限なし: {folder_path}")
             return
 
+        image_count = len(entries)
         if image_count == 0:
             QMessageBox.warning(
                 self,
@@ -514,20 +565,65 @@ class MainWindow(QMainWindow):
 
         self.logger.info(f"対応画像: {image_count}枚検出")
 
-        # プログレスダイアログを表示
-        progress_dialog = ProgressDialog(image_count, self, mode="load")
+        # 前回の作業の記録があれば、その最後の並び順で読み込む
+        scanned = entries
+        if self.session_journal is not None:
+            resumed = self.session_journal.resume(folder_path, entries)
+            if resumed is not None and resumed.entries:
+                entries = resumed.entries
+                image_count = len(entries)
+                self.logger.info(
+                    f"前回の作業から再開: {resumed.ops}件の変更を再生 "
+                    f"（更新 {resumed.changed}枚 / 見つからない {resumed.missing}枚 / 新規 {resumed.added}枚）"
+                )
 
         # ワーカースレッド作成
-        self.load_worker = LoadWorker(
-            folder_path=folder_path,
-            thumbnail_size=self.preview_area.thumbnail_size
+        self.load_worker = self._create_load_worker(folder_path=folder_path, entries=entries)
+
+        # 読み込み開始
+        self._start_load_worker(
+            image_count,
+            lambda images, progress_dialog: self._on_load_finished(images, folder_path, progress_dialog, scanned)
         )
 
+    def _start_load_worker(self, total: int, on_finished):
+        """
+        読み込みワーカーを開始
+
+        ストリーミング時はプレビューエリアに順次追加し、読み込み中もスクロール・選択できる。
+        それ以外はモーダルのプログレスダイアログを表示する。
+
+        Args:
+            total: 読み込む予定の枚数
+            on_finished: 完了時のコールバック (ImageModelのリスト, プログレスダイアログ or None)
+        """
+        # 読み込みが終わるまで作業は記録しない
+        if self.session_journal is not None:
+            self.session_journal.stop()
+
+        if self.load_worker.streaming:
+            # コントローラーのリストに順次追加していく
+            self.image_controller.images = []
+            self.image_controller.original_order = []
+            self.image_controller.history.clear()
+            self.preview_area.begin_loading(self.image_controller.images, total)
+
+            self.load_worker.batch_ready.connect(self.preview_area.append_images)
+            self.load_worker.thumbnails_ready.connect(self.preview_area.refresh_thumbnails)
+            self.load_worker.progress.connect(self.preview_area.update_loading_progress)
+            self.load_worker.finished.connect(lambda images: on_finished(images, None))
+            self.load_worker.error.connect(lambda error_msg: self._on_load_error(error_msg, None))
+            self.load_worker.start()
+            return
+
+        from src.views.progress_dialog import ProgressDialog
+
+        # プログレスダイアログを表示
+        progress_dialog = ProgressDialog(total, self, mode="load")
+
         # シグナル接続
         self.load_worker.progress.connect(progress_dialog.update_progress)
-        self.load_worker.finished.connect(
-            lambda images: self._on_load_finished(images, folder_path, progress_dialog)
-        )
+        self.load_worker.finished.connect(lambda images: on_finished(images, progress_dialog))
         self.load_worker.error.connect(
             lambda error_msg: self._on_load_error(error_msg, progress_dialog)
         )
@@ -536,31 +632,124 @@ class MainWindow(QMainWindow):
         self.load_worker.start()
         progress_dialog.exec()
 
-    def _on_load_finished(self, images, folder_path, progress_dialog):
+    def _on_load_finished(self, images, folder_path, progress_dialog, scanned):
         """読み込み完了時"""
-        # プログレスダイアログを閉じる
-        import time
-        time.sleep(0.5)  # 完了メッセージを0.5秒表示
-        progress_dialog.accept()
+        self._apply_loaded_images(images, progress_dialog)
 
-        # コントローラーに画像を設定
-        self.image_controller.images = images
-        self.image_controller.original_order = images.copy()
-        self.image_controller.history.clear()
+        # 元の順序はスキャン順（パス順）。前回の作業から再開した場合も同じ
+        self.image_controller.original_order.sort(key=lambda img: img.file_path)
+
+        # 以後の作業を記録（再開した並び順を新しいスナップショットにする）
+        if self.session_journal is not None:
+            self.session_journal.start(folder_path, self.image_controller.images, scanned)
 
         # 設定を保存
         self.config.set("last_input_folder", folder_path)
         self.settings_panel.output_path_input.setText(folder_path)
         self.config.set("last_output_folder", folder_path)
 
+        self.logger.info(f"読み込み完了: {len(self.image_controller.images)}枚")
+
+    def _apply_loaded_images(self, images, progress_dialog):
+        """
+        読み込んだ画像をコントローラーとプレビューに反映
+
+        Args:
+            images: ImageModelのリスト
+            progress_dialog: プログレスダイアログ（ストリーミング時はNone）
+        """
+        if progress_dialog is None:
+            # ストリーミング時は表示済み（追加待ちの画像は end_loading でコントローラーのリストに追加される）
+            self.preview_area.end_loading()
+            self.image_controller.original_order = self.image_controller.images.copy()
+            get_thumbnail_store().log_stats(self.logger, "読み込み完了")
+            return
+
+        # プログレスダイアログを閉じる（完了メッセージを0.5秒表示、その間もUIは止めない）
+        QTimer.singleShot(500, progress_dialog.accept)
+
+        # コントローラーに画像を設定
+        self.image_controller.images = images
+        self.image_controller.original_order = images.copy()
+        self.image_controller.history.clear()
+
         # プレビュー表示（サムネイルは既に生成済み）
         self.preview_area.load_images(images)
+        get_thumbnail_store().log_stats(self.logger, "読み込み完了")
+
+    def _create_load_worker(self, folder_path: str = None, file_paths: list[str] = None, entries: list = None):
+        """
+        設定に従って読み込みワーカーを作成
 
-        self.logger.info(f"読み込み完了: {len(images)}枚")
+        実行中の前回のワーカー（バックグラウンドの高画質化など）は中断する
+
+        Args:
+            folder_path: フォルダパス（フォルダモード）
+            file_paths: ファイルパスのリスト（ファイルモード）
+            entries: スキャン済みのエントリ（ワーカーでの再スキャンを省略）
+
+        Returns:
+            LoadWorker
+        """
+        from src.controllers.load_worker import LoadWorker
+
+        previous_worker = getattr(self, "load_worker", None)
+        if previous_worker is not None:
+            # 前回のワーカーからの通知は以後受け取らない
+            for signal in (
+                previous_worker.progress, previous_worker.finished, previous_worker.error,
+                previous_worker.batch_ready, previous_worker.thumbnails_ready,
+                previous_worker.thumbnail_refined
+            ):
+                try:
+                    signal.disconnect()
+                except TypeError:
+                    pass
+            if previous_worker.isRunning():
+                previous_worker.requestInterruption()
+
+        # 表示サイズに合う解像度で生成（ズーム時は描画側が不足する解像度を補う）
+        thumbnail_size = pyramid_level(self.preview_area.thumbnail_size)
+        worker = LoadWorker(
+            folder_path=folder_path,
+            file_paths=file_paths,
+            entries=entries,
+            thumbnail_size=thumbnail_size,
+            max_workers=self.config.get("load_workers", DEFAULT_LOAD_WORKERS),
+            worker_mode=self.config.get("load_worker_mode", DEFAULT_LOAD_WORKER_MODE),
+            use_disk_cache=self.config.get("thumbnail_cache_enabled", True),
+            disk_cache_max_bytes=(
+                self.config.get("thumbnail_cache_max_mb", DEFAULT_THUMBNAIL_CACHE_MAX_MB) * 1024 * 1024
+            ),
+            exif_preview=self.config.get("exif_preview", True),
+            streaming=self.config.get("stream_loading", True)
+        )
+        worker.thumbnail_refined.connect(
+            lambda image, data, width, height, image_size: self._on_thumbnail_refined(
+                image, thumbnail_size, data, width, height, image_size
+            )
+        )
+        return worker
+
+    def _on_visible_range_changed(self, first: int, last: int):
+        """表示範囲の変更時（実行中のワーカーのサムネイル生成順に反映）"""
+        worker = getattr(self, "load_worker", None)
+        if worker is not None and worker.isRunning():
+            worker.set_visible_range(first, last)
+
+    def _on_thumbnail_refined(self, image, size: int, data: bytes, width: int, height: int, image_size):
+        """EXIFプレビューの高画質化完了時（先読みのヘッダで分からなかった画像サイズもここで反映）"""
+        image.set_thumbnail_data(size, data, width, height)
+        if image_size:
+            image.size = image_size
+        self.preview_area.refresh_thumbnail(image)
 
     def _on_load_error(self, error_msg, progress_dialog):
         """読み込みエラー時"""
-        progress_dialog.reject()
+        if progress_dialog is None:
+            self.preview_area.end_loading()
+        else:
+            progress_dialog.reject()
         QMessageBox.critical(self, "エラー", f"読み込み中にエラーが発生しました。\n\n{error_msg}")
         self.logger.error(f"読み込みエラー: {error_msg}")
 
@@ -591,5 +780,12 @@ class MainWindow(QMainWindow):
         # 設定を保存
         self.settings_panel.save_settings()
 
+        self.preview_area.grid_view.decoder.shutdown()
+        get_thumbnail_store().log_stats(self.logger, "終了時")
+        self.image_controller.history.log_stats(self.logger, "終了時")
+        if self.session_journal is not None:
+            self.session_journal.close()
+        if self.stall_watchdog is not None:
+            self.stall_watchdog.stop()
         self.logger.info("アプリケーション終了")
         event.accept()
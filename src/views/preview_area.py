@@ -1,12 +1,14 @@
 """画像プレビューエリア"""
+import time
+from collections import deque
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QScrollArea,
-    QGridLayout, QLabel, QPushButton, QApplication
+    QWidget, QVBoxLayout, QHBoxLayout, QStackedWidget,
+    QLabel, QPushButton, QProgressBar
 )
-from PyQt6.QtCore import pyqtSignal, Qt, QPoint, QMimeData, QTimer, QRect, QSize
-from PyQt6.QtGui import QPixmap, QDrag, QPainter, QColor, QPen, QBrush, QFont
+from PyQt6.QtCore import pyqtSignal, Qt, QTimer
 from src.models.image_model import ImageModel
 from src.utils.animation import AnimationPlayer
+from src.views.thumbnail_grid import ThumbnailGridView
 
 
 class PreviewArea(QWidget):
@@ -18,15 +20,20 @@ class PreviewArea(QWidget):
     order_changed_multiple = pyqtSignal(list, int)  # (from_indices, to_index) - 複数選択時
     image_clicked = pyqtSignal(int)
     delete_requested = pyqtSignal(list)  # 削除する画像のインデックスリスト
+    visible_range_changed = pyqtSignal(int, int)  # (先頭インデックス, 末尾インデックス) - 表示中の範囲
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self.images: list[ImageModel] = []
-        self.thumbnail_widgets: list = []
         self.thumbnail_size: int = 200
         self.animation_player: AnimationPlayer = None
-        self.selected_indices: list[int] = []
-        self.last_selected_index: int = -1
+        self.is_loading: bool = False  # ストリーミング読み込み中か
+
+        # 読み込み中のグリッド更新の待ち（一定時間ずつ区切って反映する）
+        self._build_token: int = 0  # 新しい読み込み・並べ替えで更新し、古い待ちを無効にする
+        self._pending_batches: deque[list[ImageModel]] = deque()
+        self._pending_refresh: list[ImageModel] = []
+        self._pending_progress: int = None
 
         self.init_ui()
 
@@ -38,19 +45,45 @@ class PreviewArea(QWidget):
         layout = QVBoxLayout()
         layout.setContentsMargins(0, 0, 0, 0)
 
-        # スクロールエリア
-        self.scroll = QScrollArea()
-        self.scroll.setWidgetResizable(True)
-        self.scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-
-        # グリッドコンテナ
-        self.grid_widget = QWidget()
-        self.grid_layout = QGridLayout()
-        self.grid_layout.setSpacing(10)
-        self.grid_widget.setLayout(self.grid_layout)
+        # サムネイルグリッド（表示中のセルのみ描画）
+        self.grid_view = ThumbnailGridView(self, self.thumbnail_size)
+        self.selection = self.grid_view.selection
+        self.grid_view.clicked_index.connect(self._on_thumbnail_clicked)
+        self.grid_view.double_clicked_index.connect(self._on_thumbnail_double_clicked)
+        self.grid_view.preview_requested.connect(self._on_preview_requested)
+        self.grid_view.drag_started.connect(self._on_drag_started)
+        self.grid_view.drop_received.connect(self._on_drop_received)
+        self.grid_view.drop_received_multiple.connect(self._on_drop_received_multiple)
+
+        # 画像がない時の案内
+        self.placeholder = QLabel("画像をドラッグ&ドロップ\nまたは\nCtrl+O でフォルダを開く")
+        self.placeholder.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.placeholder.setStyleSheet("""
+            QLabel {
+                font-size: 16pt;
+                color: #999;
+                padding: 50px;
+            }
+        """)
 
-        self.scroll.setWidget(self.grid_widget)
-        layout.addWidget(self.scroll)
+        self.stack = QStackedWidget()
+        self.stack.addWidget(self.placeholder)
+        self.stack.addWidget(self.grid_view)
+        layout.addWidget(self.stack)
+
+        # 表示範囲の通知（スクロール中は一定間隔に間引く）
+        from src.utils.constants import VISIBLE_RANGE_NOTIFY_MS
+        self.visible_range_timer = QTimer(self)
+        self.visible_range_timer.setSingleShot(True)
+        self.visible_range_timer.setInterval(VISIBLE_RANGE_NOTIFY_MS)
+        self.visible_range_timer.timeout.connect(self._emit_visible_range)
+        self.grid_view.verticalScrollBar().valueChanged.connect(self._schedule_visible_range)
+
+        # 読み込み中のグリッド更新（入力・描画の合間に少しずつ反映）
+        self.build_timer = QTimer(self)
+        self.build_timer.setSingleShot(True)
+        self.build_timer.setInterval(0)
+        self.build_timer.timeout.connect(self._run_build_slice)
 
         # コントロールボタン
         control_layout = QHBoxLayout()
@@ -85,6 +118,18 @@ class PreviewArea(QWidget):
 
         control_layout.addStretch()
 
+        # 読み込み進捗（ストリーミング読み込み中のみ表示）
+        self.loading_label = QLabel("")
+        self.loading_label.setStyleSheet("color: #666;")
+        self.loading_label.hide()
+        control_layout.addWidget(self.loading_label)
+
+        self.loading_bar = QProgressBar()
+        self.loading_bar.setFixedWidth(200)
+        self.loading_bar.setTextVisible(False)
+        self.loading_bar.hide()
+        control_layout.addWidget(self.loading_bar)
+
         layout.addLayout(control_layout)
 
         self.setLayout(layout)
@@ -96,12 +141,24 @@ class PreviewArea(QWidget):
     sort_requested = pyqtSignal(bool)
     restore_requested = pyqtSignal()
 
+    @property
+    def selected_indices(self) -> list[int]:
+        """選択中のインデックス（昇順）"""
+        return self.selection.indices()
+
+    @property
+    def last_selected_index(self) -> int:
+        """範囲選択の起点"""
+        return self.selection.anchor
+
     def load_images(self, images: list[ImageModel]):
-        """画像を読み込んで表示"""
+        """画像を読み込んで表示（サムネイルは表示されたセルから順に取得）"""
+        self._cancel_build()
+        self._clear_selection()
         self.images = images
-        self.clear_grid()
-        self.selected_indices.clear()
-        self.last_selected_index = -1
+
+        self.grid_view.delegate.failed_paths.clear()
+        self.grid_view.thumbnail_model.set_images(images)
 
         if not images:
             self.show_idle_animation()
@@ -112,59 +169,235 @@ class PreviewArea(QWidget):
             self.animation_player.stop()
             self.animation_player.hide()
 
-        # サムネイルを生成して表示
-        cols = max(1, self.width() // (self.thumbnail_size + 20))
-
-        for i, image in enumerate(images):
-            # サムネイル生成（常に現在のサイズで再生成）
-            image.load_thumbnail(self.thumbnail_size)
-
-            # サムネイルウィジェット作成
-            thumbnail_widget = ThumbnailWidget(image, i, self, self.thumbnail_size, preview_area=self)
-            thumbnail_widget.set_preview_area(self)  # 遅延バインディング：明示的に設定
-            thumbnail_widget.clicked.connect(self._on_thumbnail_clicked)
-            thumbnail_widget.double_clicked.connect(self._on_thumbnail_double_clicked)
-            thumbnail_widget.preview_requested.connect(self._on_preview_requested)
-            thumbnail_widget.drag_started.connect(self._on_drag_started)
-            thumbnail_widget.drop_received.connect(self._on_drop_received)
-            thumbnail_widget.drop_received_multiple.connect(self._on_drop_received_multiple)
+        self.stack.setCurrentWidget(self.grid_view)
+        self._schedule_visible_range()
+
+    def apply_image_change(self, change, done: bool):
+        """
+        画像リストの変更を反映（ImageControllerからの差分通知）
+
+        変更のあった行だけをモデルに通知する（全体の作り直しはしない）。
+        連番は描画時に行番号から求めるため、表示中のセルだけが振り直される。
+
+        Args:
+            change: ImageChange
+            done: 変更後かどうか
+        """
+        if not done:
+            # 追加待ちの画像を先に反映し、変更前の行を指す再描画の待ちは破棄
+            self._flush_build()
+            self._cancel_build()
+
+            # 変更前のインデックスが有効なうちに選択を解除
+            self._clear_selection()
+
+        self.grid_view.thumbnail_model.apply_change(change, done)
+
+        if done:
+            self.stack.setCurrentWidget(self.grid_view if self.images else self.placeholder)
+            self._schedule_visible_range()
+
+    def _clear_selection(self):
+        """選択を解除（選択中の画像のみ更新）"""
+        self._apply_selection(self.selection.clear())
+
+    def visible_range(self) -> tuple[int, int]:
+        """
+        表示中の画像のインデックス範囲を返す
+
+        Returns:
+            (先頭インデックス, 末尾インデックス)（表示中の画像がない場合は (0, -1)）
+        """
+        return self.grid_view.visible_range()
+
+    def _schedule_visible_range(self):
+        """表示範囲の通知を予約（連続したスクロールは間引く）"""
+        if not self.visible_range_timer.isActive():
+            self.visible_range_timer.start()
+
+    def _emit_visible_range(self):
+        """表示範囲を通知"""
+        first, last = self.visible_range()
+        if first <= last:
+            self.visible_range_changed.emit(first, last)
+
+    def resizeEvent(self, event):
+        """リサイズ時（表示範囲が変わる）"""
+        super().resizeEvent(event)
+        self._schedule_visible_range()
+
+    def begin_loading(self, images: list[ImageModel], total: int):
+        """
+        ストリーミング読み込みを開始（グリッドを空にして順次追加を待つ）
+
+        Args:
+            images: 表示する画像リスト（append_imagesで追加されていく）
+            total: 読み込む予定の枚数
+        """
+        self._cancel_build()
+        self._clear_selection()
+        self.images = images
+        self.is_loading = True
+
+        # サムネイルはワーカーが表示範囲から順に生成するため、描画時には生成しない
+        self.grid_view.delegate.lazy_load = False
+        self.grid_view.delegate.failed_paths.clear()
+        self.grid_view.thumbnail_model.set_images(images)
+        self.stack.setCurrentWidget(self.grid_view)
+
+        self.loading_bar.setRange(0, total)
+        self.loading_bar.setValue(0)
+        self.loading_label.setText(f"読み込み中... 0 / {total}")
+        self.loading_label.show()
+        self.loading_bar.show()
+
+    def append_images(self, images: list[ImageModel]):
+        """
+        画像をグリッドの末尾に追加（ストリーミング読み込み用）
+
+        サムネイル未生成の画像は枠だけを表示し、生成後に refresh_thumbnails で再描画する。
+        反映は次のグリッド更新でまとめて行う（end_loading までに全て反映される）
+
+        Args:
+            images: 追加する画像リスト
+        """
+        if not images:
+            return
 
-            row = i // cols
-            col = i % cols
-            self.grid_layout.addWidget(thumbnail_widget, row, col)
-            self.thumbnail_widgets.append(thumbnail_widget)
+        self._pending_batches.append(images)
+        self._schedule_build()
+
+    def update_loading_progress(self, current: int, filename: str = ""):
+        """
+        ストリーミング読み込みの進捗を更新
+
+        画像1枚ごとに呼ばれるため値の保持のみとし、表示は画像の追加・サムネイル生成に伴う
+        グリッド更新（または end_loading）で最新の値だけを反映する
+        """
+        self._pending_progress = current
+
+    def _schedule_build(self):
+        """グリッド更新を予約"""
+        if not self.build_timer.isActive():
+            self.build_timer.start()
+
+    def _cancel_build(self):
+        """待ち中のグリッド更新を破棄"""
+        self._build_token += 1
+        self._pending_batches.clear()
+        self._pending_refresh = []
+        self._pending_progress = None
+        self.build_timer.stop()
+
+    def _run_build_slice(self):
+        """
+        待ち中のグリッド更新を GRID_BUILD_SLICE_MS まで反映（残りは次のイベントループで続ける）
+
+        追加・再描画とも GRID_BUILD_SLICE_ITEMS 件ずつ処理し、1件分ごとに時間を確認する
+        （1回に必ず1件分は進める）。サムネイルの再描画は表示中の行のみ行う
+        （画面外の行は表示されたときに描画されるため捨ててよい）。
+        """
+        from src.utils.constants import GRID_BUILD_SLICE_MS, GRID_BUILD_SLICE_ITEMS
+
+        token = self._build_token
+        deadline = time.perf_counter() + GRID_BUILD_SLICE_MS / 1000
+        progressed = False
+
+        while self._pending_batches and token == self._build_token:
+            if progressed and time.perf_counter() >= deadline:
+                break
+            self._append_now(self._take_pending_images(GRID_BUILD_SLICE_ITEMS))
+            progressed = True
+
+        while self._pending_refresh and token == self._build_token:
+            if progressed and time.perf_counter() >= deadline:
+                break
+            pending = self._pending_refresh[:GRID_BUILD_SLICE_ITEMS]
+            del self._pending_refresh[:GRID_BUILD_SLICE_ITEMS]
+            self._refresh_visible(pending)
+            progressed = True
+
+        if self._pending_progress is not None:
+            self._show_progress(self._pending_progress)
+            self._pending_progress = None
+
+        if token == self._build_token and (self._pending_batches or self._pending_refresh):
+            self.build_timer.start()
+
+    def _take_pending_images(self, limit: int) -> list[ImageModel]:
+        """追加待ちの画像を先頭から最大 limit 枚取り出す（はみ出したバッチの残りは戻す）"""
+        images = []
+        while self._pending_batches and len(images) < limit:
+            batch = self._pending_batches.popleft()
+            room = limit - len(images)
+            if len(batch) > room:
+                self._pending_batches.appendleft(batch[room:])
+                batch = batch[:room]
+            images.extend(batch)
+        return images
+
+    def _flush_build(self):
+        """待ち中のグリッド更新を全て反映"""
+        self.build_timer.stop()
+        images = []
+        while self._pending_batches:
+            images.extend(self._pending_batches.popleft())
+        self._append_now(images)
+
+        pending = self._pending_refresh
+        self._pending_refresh = []
+        self._refresh_visible(pending)
+
+        if self._pending_progress is not None:
+            self._show_progress(self._pending_progress)
+            self._pending_progress = None
+
+    def _append_now(self, images: list[ImageModel]):
+        """画像をグリッドの末尾に追加"""
+        if not images:
+            return
 
-        # 選択状態を復元
-        for widget in self.thumbnail_widgets:
-            widget.set_selected(widget.index in self.selected_indices)
+        for i, image in enumerate(images, start=len(self.images)):
+            image.index = i
+
+        # 共有している画像リストにはモデル経由で追加する
+        self.grid_view.thumbnail_model.append_images(images)
+        self._schedule_visible_range()
+
+    def _refresh_visible(self, images: list[ImageModel]):
+        """表示中の画像のみサムネイル表示を更新"""
+        first, last = self.visible_range()
+        rows = {
+            image.index for image in images
+            if first <= image.index <= last and self.images[image.index] is image
+        }
+        self.grid_view.update_rows(rows)
+
+    def _show_progress(self, current: int):
+        """読み込みの進捗を表示"""
+        self.loading_bar.setValue(current)
+        self.loading_label.setText(f"読み込み中... {current} / {self.loading_bar.maximum()}")
+
+    def end_loading(self):
+        """ストリーミング読み込みを終了（待ち中の追加・進捗は全て反映）"""
+        self._flush_build()
+        self.is_loading = False
+        self.grid_view.delegate.lazy_load = True
+        self.loading_label.hide()
+        self.loading_bar.hide()
+
+        if not self.images:
+            self.show_idle_animation()
 
     def clear_grid(self):
         """グリッドをクリア"""
-        for widget in self.thumbnail_widgets:
-            widget.deleteLater()
-        self.thumbnail_widgets.clear()
-
-        # グリッドレイアウトをクリア
-        while self.grid_layout.count():
-            item = self.grid_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
+        self._cancel_build()
+        self.grid_view.thumbnail_model.set_images([])
 
     def show_idle_animation(self):
         """idleアニメーションを表示"""
-        self.clear_grid()
-
         # アニメーション一時無効化
-        placeholder = QLabel("画像をドラッグ&ドロップ\nまたは\nCtrl+O でフォルダを開く")
-        placeholder.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        placeholder.setStyleSheet("""
-            QLabel {
-                font-size: 16pt;
-                color: #999;
-                padding: 50px;
-            }
-        """)
-        self.grid_layout.addWidget(placeholder, 0, 0, Qt.AlignmentFlag.AlignCenter)
+        self.stack.setCurrentWidget(self.placeholder)
 
     def update_thumbnail_size(self, size: int):
         """サムネイルサイズを変更"""
@@ -176,40 +409,32 @@ class PreviewArea(QWidget):
 
         self.thumbnail_size = size
 
-        # ウィジェットが既に存在する場合は更新のみ（再作成しない）
-        if self.thumbnail_widgets:
-            self._update_existing_thumbnails(size)
-        else:
-            # 初回は通常の読み込み
-            self.load_images(self.images)
-
-    def _update_existing_thumbnails(self, size: int):
-        """既存のサムネイルウィジェットを更新（超高速：Qt側でリサイズ）"""
-        # レイアウト更新を一時停止（高速化）
-        self.grid_widget.setUpdatesEnabled(False)
-
-        # 新しい列数を計算
-        cols = max(1, self.scroll.viewport().width() // (size + 20))
+        # セルの再配置のみ（表示中のセルは手持ちの解像度を縮小して描画し、
+        # 足りない解像度はバックグラウンドで生成されしだい差し替わる）
+        self.grid_view.set_thumbnail_size(size)
+        self._schedule_visible_range()
 
-        # グリッドをクリアして再配置
-        for i, widget in enumerate(self.thumbnail_widgets):
-            # 古い位置から削除
-            self.grid_layout.removeWidget(widget)
+    def refresh_thumbnail(self, image: ImageModel):
+        """
+        指定画像のサムネイル表示を更新（バックグラウンドでの高画質化完了時など）
 
-            # ウィジェットのサムネイル更新（Qtの scaled() を使用）
-            widget.update_thumbnail_size(size)
+        Args:
+            image: サムネイルが更新された画像
+        """
+        if 0 <= image.index < len(self.images) and self.images[image.index] is image:
+            self.grid_view.thumbnail_model.refresh_row(image.index)
 
-            # 【重要】既存ウィジェットにもpreview_area参照を設定（遅延バインディング）
-            widget.set_preview_area(self)
+    def refresh_thumbnails(self, images: list[ImageModel]):
+        """
+        複数画像のサムネイル表示を更新（ストリーミング読み込みでサムネイルが生成されたとき）
 
-            # 新しい位置に配置
-            row = i // cols
-            col = i % cols
-            self.grid_layout.addWidget(widget, row, col)
+        再描画は次のグリッド更新でまとめて行う
 
-        # レイアウト更新を再開
-        self.grid_widget.setUpdatesEnabled(True)
-        self.grid_widget.update()
+        Args:
+            images: サムネイルが生成された画像リスト
+        """
+        self._pending_refresh.extend(images)
+        self._schedule_build()
 
     def zoom_in(self):
         """拡大"""
@@ -230,37 +455,41 @@ class PreviewArea(QWidget):
         """サムネイルクリック時（シングルクリック）"""
         if modifiers & Qt.KeyboardModifier.ControlModifier:
             # Ctrl+クリック: トグル選択
-            if index in self.selected_indices:
-                self.selected_indices.remove(index)
-            else:
-                self.selected_indices.append(index)
-            self.last_selected_index = index
+            changed = self.selection.toggle(index)
 
         elif modifiers & Qt.KeyboardModifier.ShiftModifier:
             # Shift+クリック: 範囲選択
-            if self.last_selected_index >= 0:
-                start = min(self.last_selected_index, index)
-                end = max(self.last_selected_index, index)
-                self.selected_indices = list(range(start, end + 1))
+            if self.selection.anchor >= 0:
+                changed = self.selection.select_range(self.selection.anchor, index)
             else:
-                self.selected_indices = [index]
-                self.last_selected_index = index
+                changed = self.selection.select_only(index)
 
         else:
             # 通常クリック: 単一選択のみ（拡大表示はダブルクリックまたは虫眼鏡で）
-            self.selected_indices = [index]
-            self.last_selected_index = index
+            changed = self.selection.select_only(index)
 
-        # 選択状態を更新（ウィジェットとImageModelの両方）
-        for i, widget in enumerate(self.thumbnail_widgets):
-            is_selected = widget.index in self.selected_indices
-            widget.set_selected(is_selected)
-            # ImageModel.selectedも同期
-            if i < len(self.images):
-                self.images[i].selected = is_selected
+        # 選択状態が変わったセルだけを更新
+        self._apply_selection(changed)
 
         self.selection_changed.emit(self.selected_indices)
 
+    def _apply_selection(self, changed: set[int]):
+        """
+        選択の差分を ImageModel.selected に反映して再描画
+
+        Args:
+            changed: 選択状態が変わったインデックスの集合
+        """
+        if not changed:
+            return
+
+        images = self.images
+        count = len(images)
+        for i in changed:
+            if 0 <= i < count:
+                images[i].selected = i in self.selection
+        self.grid_view.update_rows(changed)
+
     def _on_thumbnail_double_clicked(self, index: int):
         """サムネイルダブルクリック時"""
         # 拡大表示
@@ -274,14 +503,8 @@ class PreviewArea(QWidget):
     def _on_drag_started(self, index: int):
         """ドラッグ開始時"""
         # 選択されていない場合は選択
-        if index not in self.selected_indices:
-            self.selected_indices = [index]
-            for i, widget in enumerate(self.thumbnail_widgets):
-                is_selected = widget.index in self.selected_indices
-                widget.set_selected(is_selected)
-                # ImageModel.selectedも同期
-                if i < len(self.images):
-                    self.images[i].selected = is_selected
+        if index not in self.selection:
+            self._apply_selection(self.selection.replace((index,)))
 
     def _on_drop_received(self, from_index: int, to_index: int):
         """ドロップ受信時（単一）"""
@@ -296,295 +519,18 @@ class PreviewArea(QWidget):
         """キーボードイベント"""
         # Delete/Space: 削除
         if event.key() in (Qt.Key.Key_Delete, Qt.Key.Key_Space):
-            if self.selected_indices:
+            if self.selection:
                 self.delete_requested.emit(self.selected_indices)
 
         # Ctrl+A: 全選択
         elif event.key() == Qt.Key.Key_A and event.modifiers() & Qt.KeyboardModifier.ControlModifier:
-            self.selected_indices = list(range(len(self.images)))
-            for widget in self.thumbnail_widgets:
-                widget.set_selected(True)
+            self._apply_selection(self.selection.select_all(len(self.images)))
             self.selection_changed.emit(self.selected_indices)
 
         # Ctrl+D / Esc: 選択解除
         elif (event.key() == Qt.Key.Key_D and event.modifiers() & Qt.KeyboardModifier.ControlModifier) or \
              event.key() == Qt.Key.Key_Escape:
-            self.selected_indices.clear()
-            for widget in self.thumbnail_widgets:
-                widget.set_selected(False)
+            self._apply_selection(self.selection.clear())
             self.selection_changed.emit(self.selected_indices)
 
         super().keyPressEvent(event)
-
-
-
-
-class ThumbnailWidget(QWidget):
-    """ドラッグ可能なサムネイルウィジェット"""
-
-    clicked = pyqtSignal(int, Qt.KeyboardModifier)
-    double_clicked = pyqtSignal(int)  # ダブルクリックシグナル
-    preview_requested = pyqtSignal(int)  # 虫眼鏡クリックシグナル
-    drag_started = pyqtSignal(int)
-    drop_received = pyqtSignal(int, int)  # (from_index, to_index)
-    drop_received_multiple = pyqtSignal(list, int)  # (from_indices, to_index) - 複数選択時
-
-    def __init__(self, image: ImageModel, index: int, parent=None, thumbnail_size: int = 200, preview_area=None):
-        super().__init__(parent)
-        self.image = image
-        self.index = index
-        self.drag_start_position = None
-        self.is_selected = False
-        self.thumbnail_size = thumbnail_size
-        self.preview_area = preview_area  # PreviewAreaへの参照を保持
-
-        # 元のサムネイル（初回読み込み時のもの）を保持
-        self.original_thumbnail = image.thumbnail
-
-        # ダブルクリック検出用
-        self.click_timer = QTimer()
-        self.click_timer.setSingleShot(True)
-        self.click_timer.timeout.connect(self._handle_single_click)
-        self.pending_click_event = None
-
-        # ドラッグ&ドロップを有効化
-        self.setAcceptDrops(True)
-
-        layout = QVBoxLayout()
-        layout.setContentsMargins(5, 5, 5, 5)
-
-        # サムネイル画像エリア（虫眼鏡ボタンを含む）
-        self.thumbnail_container = QWidget()
-        # サムネイルサイズに基づいてコンテナサイズを設定
-        container_size = image.thumbnail.size() if image.thumbnail else QSize(thumbnail_size, thumbnail_size)
-        self.thumbnail_container.setFixedSize(container_size)
-
-        # 画像ラベル
-        self.thumbnail_label = QLabel(self.thumbnail_container)
-        if image.thumbnail:
-            self.thumbnail_label.setPixmap(image.thumbnail)
-            self.thumbnail_label.setFixedSize(image.thumbnail.size())
-        self.thumbnail_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.thumbnail_label.move(0, 0)
-
-        # 虫眼鏡ボタン（右下にオーバーレイ）
-        self.magnifier_btn = QPushButton("🔍", self.thumbnail_container)
-        self.magnifier_btn.setFixedSize(36, 36)
-        self.magnifier_btn.setStyleSheet("""
-            QPushButton {
-                background-color: rgba(100, 100, 100, 180);
-                color: white;
-                border: 2px solid rgba(255, 255, 255, 200);
-                border-radius: 18px;
-                font-size: 16px;
-                padding: 0px;
-            }
-            QPushButton:hover {
-                background-color: rgba(33, 150, 243, 220);
-                border: 2px solid white;
-            }
-        """)
-
-        # 虫眼鏡ボタンを右下に配置（コンテナサイズに基づく）
-        self._update_magnifier_position()
-
-        # ホバー時にプレビュー表示
-        self.magnifier_btn.enterEvent = lambda e: self._on_magnifier_hover_enter()
-        self.magnifier_btn.leaveEvent = lambda e: self._on_magnifier_hover_leave()
-        self.magnifier_btn.clicked.connect(lambda: self.preview_requested.emit(self.index))
-
-        layout.addWidget(self.thumbnail_container, alignment=Qt.AlignmentFlag.AlignCenter)
-
-        # ファイル名表示
-        name_label = QLabel(image.filename)
-        name_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        name_label.setWordWrap(True)
-        name_label.setStyleSheet("font-size: 9pt;")
-        layout.addWidget(name_label)
-
-        # 連番表示
-        number_label = QLabel(f"{index + 1:03d}")
-        number_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        number_label.setStyleSheet("font-size: 8pt; color: #666;")
-        layout.addWidget(number_label)
-
-        self.setLayout(layout)
-
-        # ホバータイマー（ホバー時に拡大表示）
-        self.hover_timer = QTimer()
-        self.hover_timer.setSingleShot(True)
-        self.hover_timer.timeout.connect(lambda: self.preview_requested.emit(self.index))
-
-        # デフォルトスタイル
-        self.update_style()
-
-    def _update_magnifier_position(self):
-        """虫眼鏡ボタンの位置を更新"""
-        btn_margin = 5
-        btn_x = self.thumbnail_container.width() - self.magnifier_btn.width() - btn_margin
-        btn_y = self.thumbnail_container.height() - self.magnifier_btn.height() - btn_margin
-        self.magnifier_btn.move(btn_x, btn_y)
-
-    def _on_magnifier_hover_enter(self):
-        """虫眼鏡ホバー開始"""
-        self.hover_timer.start(500)  # 500ms後にプレビュー表示
-
-    def _on_magnifier_hover_leave(self):
-        """虫眼鏡ホバー終了"""
-        self.hover_timer.stop()
-
-    def update_style(self):
-        """スタイルを更新"""
-        if self.is_selected:
-            # 選択時：画像に太い青枠、背景も青系
-            self.thumbnail_label.setStyleSheet("""
-                QLabel {
-                    border: 5px solid #2196F3;
-                    border-radius: 4px;
-                    background-color: white;
-                }
-            """)
-            self.setStyleSheet("""
-                ThumbnailWidget {
-                    background-color: #E3F2FD;
-                    border-radius: 8px;
-                }
-            """)
-        else:
-            # 非選択時：画像に薄いグレー枠
-            self.thumbnail_label.setStyleSheet("""
-                QLabel {
-                    border: 2px solid #E0E0E0;
-                    border-radius: 2px;
-                    background-color: white;
-                }
-            """)
-            self.setStyleSheet("""
-                ThumbnailWidget {
-                    background-color: white;
-                }
-                ThumbnailWidget:hover {
-                    background-color: #F5F5F5;
-                }
-            """)
-
-    def set_selected(self, selected: bool):
-        """選択状態を設定"""
-        self.is_selected = selected
-        self.update_style()
-
-    def set_preview_area(self, preview_area):
-        """PreviewArea参照を設定（遅延バインディング）"""
-        self.preview_area = preview_area
-
-    def update_thumbnail_size(self, size: int):
-        """サムネイルサイズを変更（超高速：Qt側でリサイズ）"""
-        self.thumbnail_size = size
-
-        if not self.original_thumbnail:
-            return
-
-        # 元のサムネイルをQt側でリサイズ（Pillowでの再生成なし）
-        scaled_pixmap = self.original_thumbnail.scaled(
-            size, size,
-            Qt.AspectRatioMode.KeepAspectRatio,
-            Qt.TransformationMode.SmoothTransformation  # 高品質リサイズ
-        )
-
-        # コンテナとラベルのサイズを更新
-        new_size = scaled_pixmap.size()
-        self.thumbnail_container.setFixedSize(new_size)
-        self.thumbnail_label.setPixmap(scaled_pixmap)
-        self.thumbnail_label.setFixedSize(new_size)
-
-        # 虫眼鏡ボタンの位置を更新
-        self._update_magnifier_position()
-
-    def mouseMoveEvent(self, event):
-        """マウス移動時（ドラッグ）"""
-        if not (event.buttons() & Qt.MouseButton.LeftButton):
-            return
-        if not self.drag_start_position:
-            return
-
-        # ドラッグ距離チェック
-        if (event.pos() - self.drag_start_position).manhattanLength() < QApplication.startDragDistance():
-            return
-
-        # ダブルクリック待機中ならキャンセル
-        if self.click_timer.isActive():
-            self.click_timer.stop()
-
-        # ドラッグ開始
-        self.drag_started.emit(self.index)
-
-        drag = QDrag(self)
-        mime_data = QMimeData()
-
-        # 複数選択されている場合は選択されたインデックスをすべて渡す
-        if not hasattr(self, 'preview_area') or self.preview_area is None:
-            # 防御的プログラミング: preview_area未設定時は単一ドラッグにフォールバック
-            mime_data.setText(str(self.index))
-        else:
-            selected_indices = [i for i, img in enumerate(self.preview_area.images) if img.selected]
-            if len(selected_indices) > 1 and self.index in selected_indices:
-                # 複数選択されており、ドラッグ元も選択されている
-                indices_str = ",".join(map(str, selected_indices))
-                mime_data.setText(indices_str)
-            else:
-                # 単一のドラッグ
-                mime_data.setText(str(self.index))
-
-        drag.setMimeData(mime_data)
-
-        # ドラッグ時のプレビュー画像
-        if self.image.thumbnail:
-            pixmap = self.image.thumbnail.scaled(100, 100, Qt.AspectRatioMode.KeepAspectRatio)
-            drag.setPixmap(pixmap)
-            drag.setHotSpot(QPoint(pixmap.width() // 2, pixmap.height() // 2))
-
-        drag.exec(Qt.DropAction.MoveAction)
-
-    def mousePressEvent(self, event):
-        """マウス押下時"""
-        if event.button() == Qt.MouseButton.LeftButton:
-            self.drag_start_position = event.pos()
-
-            # ダブルクリック検出のため、シングルクリックを遅延処理
-            if self.click_timer.isActive():
-                # 既にタイマーが動いている = ダブルクリック
-                self.click_timer.stop()
-                self.double_clicked.emit(self.index)
-                self.pending_click_event = None
-            else:
-                # シングルクリックの可能性
-                self.pending_click_event = (self.index, QApplication.keyboardModifiers())
-                self.click_timer.start(QApplication.doubleClickInterval())
-
-    def _handle_single_click(self):
-        """シングルクリック処理（ダブルクリックでなかった場合）"""
-        if self.pending_click_event:
-            index, modifiers = self.pending_click_event
-            self.clicked.emit(index, modifiers)
-            self.pending_click_event = None
-
-    def dragEnterEvent(self, event):
-        """ドラッグ侵入時"""
-        if event.mimeData().hasText():
-            event.acceptProposedAction()
-
-    def dropEvent(self, event):
-        """ドロップ時"""
-        if event.mimeData().hasText():
-            text = event.mimeData().text()
-            to_index = self.index
-
-            # カンマ区切りの場合は複数選択
-            if "," in text:
-                from_indices = [int(idx) for idx in text.split(",")]
-                self.drop_received_multiple.emit(from_indices, to_index)
-            else:
-                from_index = int(text)
-                self.drop_received.emit(from_index, to_index)
-
-            event.acceptProposedAction()
@@ -0,0 +1,980 @@
+"""サムネイルグリッド（表示中のセルだけを描画する仮想化ビュー）"""
+from PyQt6.QtWidgets import QStyledItemDelegate, QStyle, QStyleOptionViewItem, QApplication, QAbstractItemView
+from PyQt6.QtCore import (
+    pyqtSignal, Qt, QAbstractListModel, QModelIndex, QPoint, QRect, QSize, QMimeData, QTimer, QEvent,
+    QElapsedTimer
+)
+from PyQt6.QtGui import QDrag, QColor, QPen, QBrush, QFont, QFontMetrics, QPainter, QPixmap, QRegion
+from src.models.image_model import ImageModel
+from src.models.selection_model import SelectionModel
+from src.models.thumbnail_store import pyramid_level
+from src.controllers.thumbnail_decoder import ThumbnailDecoder
+from src.utils.constants import (
+    DRAG_AUTO_SCROLL_MARGIN, DRAG_AUTO_SCROLL_INTERVAL_MS, DRAG_AUTO_SCROLL_MIN_SPEED,
+    DRAG_AUTO_SCROLL_MAX_SPEED, DRAG_AUTO_SCROLL_ACCEL_MS, DRAG_AUTO_SCROLL_MAX_BOOST
+)
+
+
+class ThumbnailListModel(QAbstractListModel):
+    """
+    画像リストをグリッドに提供するモデル
+
+    画像リストは ImageController と共有し、コピーしない。
+    """
+
+    ImageRole = Qt.ItemDataRole.UserRole + 1
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.images: list[ImageModel] = []
+        self._move_accepted = False
+
+    def set_images(self, images: list[ImageModel]):
+        """表示する画像リストを差し替え"""
+        self.beginResetModel()
+        self.images = images
+        self.endResetModel()
+
+    def append_images(self, images: list[ImageModel]):
+        """画像を末尾に追加（共有している画像リストにも追加される）"""
+        if not images:
+            return
+        first = len(self.images)
+        self.beginInsertRows(QModelIndex(), first, first + len(images) - 1)
+        self.images.extend(images)
+        self.endInsertRows()
+
+    def apply_change(self, change, done: bool):
+        """
+        ImageControllerの差分通知をQtのモデル通知に変換
+
+        変更の直前（done=False）に begin〜、直後（done=True）に end〜 を呼ぶ。
+        画像リストはコントローラーと共有しているため、ここでは変更しない。
+
+        Args:
+            change: ImageChange
+            done: 変更後かどうか
+        """
+        parent = QModelIndex()
+        kind = change.kind
+
+        if kind == "move":
+            first, last = change.rows[0], change.rows[-1]
+            if not done:
+                # Qtの移動先は移動前の行番号で指定する
+                destination = change.destination
+                if destination > first:
+                    destination += len(change.rows)
+                self._move_accepted = self.beginMoveRows(parent, first, last, parent, destination)
+                if not self._move_accepted:
+                    self.layoutAboutToBeChanged.emit()
+            elif self._move_accepted:
+                self.endMoveRows()
+            else:
+                self.layoutChanged.emit()
+
+        elif kind == "remove":
+            if not done:
+                self.beginRemoveRows(parent, change.rows[0], change.rows[-1])
+            else:
+                self.endRemoveRows()
+
+        elif kind == "insert":
+            if not done:
+                self.beginInsertRows(parent, change.rows[0], change.rows[-1])
+            else:
+                self.endInsertRows()
+
+        elif kind == "reorder":
+            if not done:
+                self.layoutAboutToBeChanged.emit()
+            else:
+                self.layoutChanged.emit()
+
+        else:
+            if not done:
+                self.beginResetModel()
+            else:
+                self.endResetModel()
+
+    def refresh_row(self, row: int):
+        """指定行の再描画を通知"""
+        if 0 <= row < len(self.images):
+            index = self.index(row)
+            self.dataChanged.emit(index, index)
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self.images)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self.images):
+            return None
+
+        image = self.images[index.row()]
+        if role == self.ImageRole:
+            return image
+        if role == Qt.ItemDataRole.DisplayRole:
+            return image.filename
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return image.filename
+        return None
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsDragEnabled
+
+
+class ThumbnailDelegate(QStyledItemDelegate):
+    """
+    サムネイルセルの描画
+
+    サムネイル・枠・虫眼鏡ボタン・ファイル名・連番をセルごとに直接描画する
+    （セルごとのウィジェットは作らない）。
+    選択・ホバーの表現もスタイルシートではなく描画で行い、
+    ペン・ブラシ・フォント・虫眼鏡ボタンの画像は生成済みのものを使い回す。
+    """
+
+    PADDING = 5
+    TEXT_SPACING = 4
+    MAGNIFIER_SIZE = 36
+    MAGNIFIER_MARGIN = 5
+
+    def __init__(self, parent=None, thumbnail_size: int = 200, decoder: ThumbnailDecoder = None):
+        super().__init__(parent)
+        self.thumbnail_size = thumbnail_size
+        self.decoder = decoder  # 不足している解像度の生成先（Noneの場合は手持ちの解像度のみで描画）
+        self.lazy_load = True  # 未生成のサムネイルを描画時に要求するか（ストリーミング中はワーカーに任せる）
+        self.magnifier_hover_row = -1  # 虫眼鏡にホバーしている行
+        self.failed_paths: set[str] = set()  # 生成に失敗した画像（再試行しない）
+
+        self.name_font = QFont()
+        self.name_font.setPointSize(9)
+        self.number_font = QFont()
+        self.number_font.setPointSize(8)
+        self.magnifier_font = QFont()
+        self.magnifier_font.setPixelSize(16)
+
+        self.name_metrics = QFontMetrics(self.name_font)
+        self.name_height = self.name_metrics.height()
+        self.number_height = QFontMetrics(self.number_font).height()
+
+        # 背景（選択時は青系、ホバー時は薄いグレー）
+        self.selected_background = QBrush(QColor("#E3F2FD"))
+        self.hover_background = QBrush(QColor("#F5F5F5"))
+        self.thumbnail_background = QColor("white")
+
+        # 枠（選択時は太い青枠）
+        self.selected_border = QPen(QColor("#2196F3"), 5)
+        self.normal_border = QPen(QColor("#E0E0E0"), 2)
+
+        # 虫眼鏡ボタン
+        self.magnifier_pen = QPen(QColor(255, 255, 255, 200), 2)
+        self.magnifier_brush = QBrush(QColor(100, 100, 100, 180))
+        self.magnifier_hover_pen = QPen(QColor("white"), 2)
+        self.magnifier_hover_brush = QBrush(QColor(33, 150, 243, 220))
+        self.magnifier_text_color = QColor("white")
+        self._magnifier_pixmaps: dict[tuple[bool, float], QPixmap] = {}  # (ホバー中か, 倍率) -> 描画済みのボタン
+
+        self.number_color = QColor("#666")
+
+    def cell_size(self) -> QSize:
+        """セルのサイズ（全セル共通）"""
+        width = self.thumbnail_size + self.PADDING * 2
+        height = (
+            self.PADDING + self.thumbnail_size + self.TEXT_SPACING
+            + self.name_height + self.number_height + self.PADDING
+        )
+        return QSize(width, height)
+
+    def sizeHint(self, option, index: QModelIndex) -> QSize:
+        return self.cell_size()
+
+    def thumbnail_for(self, image: ImageModel):
+        """
+        描画するサムネイルを取得
+
+        表示サイズに合う解像度がない場合（ズーム後・ストアから破棄された後・未生成で遅延生成が
+        有効な場合）は、手持ちの解像度で描画しつつバックグラウンドでの生成を要求する
+        （描画は生成を待たない）。
+        """
+        level = pyramid_level(self.thumbnail_size)
+        pixmap, size = image.thumbnail_at(level)
+        if size != level and self.decoder is not None and image.file_path not in self.failed_paths \
+                and (image.has_thumbnail or self.lazy_load):
+            self.decoder.request(image, level)
+        return pixmap
+
+    def thumbnail_rect(self, cell_rect: QRect, pixmap) -> QRect:
+        """セル内でサムネイルを描画する矩形（アスペクト比を維持して中央に配置）"""
+        box = QRect(cell_rect.x() + self.PADDING, cell_rect.y() + self.PADDING, self.thumbnail_size, self.thumbnail_size)
+        box.moveLeft(cell_rect.x() + (cell_rect.width() - self.thumbnail_size) // 2)
+        if pixmap is None or pixmap.isNull():
+            return box
+
+        size = pixmap.size().scaled(box.size(), Qt.AspectRatioMode.KeepAspectRatio)
+        rect = QRect(QPoint(0, 0), size)
+        rect.moveCenter(box.center())
+        return rect
+
+    def magnifier_rect(self, thumbnail_rect: QRect) -> QRect:
+        """虫眼鏡ボタンの矩形（サムネイルの右下）"""
+        return QRect(
+            thumbnail_rect.right() - self.MAGNIFIER_MARGIN - self.MAGNIFIER_SIZE + 1,
+            thumbnail_rect.bottom() - self.MAGNIFIER_MARGIN - self.MAGNIFIER_SIZE + 1,
+            self.MAGNIFIER_SIZE,
+            self.MAGNIFIER_SIZE
+        )
+
+    def magnifier_pixmap(self, hovered: bool, ratio: float) -> QPixmap:
+        """
+        虫眼鏡ボタンの画像（状態・倍率ごとに1回だけ描画して使い回す）
+
+        Args:
+            hovered: ホバー中か
+            ratio: 描画先のデバイスピクセル比
+        """
+        key = (hovered, ratio)
+        pixmap = self._magnifier_pixmaps.get(key)
+        if pixmap is not None:
+            return pixmap
+
+        size = round(self.MAGNIFIER_SIZE * ratio)
+        pixmap = QPixmap(size, size)
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.GlobalColor.transparent)
+
+        rect = QRect(0, 0, self.MAGNIFIER_SIZE, self.MAGNIFIER_SIZE)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(self.magnifier_hover_pen if hovered else self.magnifier_pen)
+        painter.setBrush(self.magnifier_hover_brush if hovered else self.magnifier_brush)
+        painter.drawEllipse(rect.adjusted(1, 1, -1, -1))
+        painter.setFont(self.magnifier_font)
+        painter.setPen(self.magnifier_text_color)
+        painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, "🔍")
+        painter.end()
+
+        self._magnifier_pixmaps[key] = pixmap
+        return pixmap
+
+    def paint(self, painter, option, index: QModelIndex):
+        image = index.data(ThumbnailListModel.ImageRole)
+        if image is None:
+            return
+
+        rect = option.rect
+        selected = image.selected
+        hovered = bool(option.state & QStyle.StateFlag.State_MouseOver)
+
+        painter.save()
+        painter.setRenderHint(painter.RenderHint.Antialiasing)
+        painter.setRenderHint(painter.RenderHint.SmoothPixmapTransform)
+
+        # 背景（選択時は青系、ホバー時は薄いグレー）
+        if selected or hovered:
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(self.selected_background if selected else self.hover_background)
+            painter.drawRoundedRect(rect, 8, 8)
+
+        # サムネイル（未生成の場合は枠のみ）
+        pixmap = self.thumbnail_for(image)
+        thumb_rect = self.thumbnail_rect(rect, pixmap)
+        painter.fillRect(thumb_rect, self.thumbnail_background)
+        if pixmap is not None and not pixmap.isNull():
+            painter.drawPixmap(thumb_rect, pixmap)
+
+        # 枠（選択時は太い青枠）
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        if selected:
+            painter.setPen(self.selected_border)
+            painter.drawRoundedRect(thumb_rect.adjusted(2, 2, -2, -2), 4, 4)
+        else:
+            painter.setPen(self.normal_border)
+            painter.drawRoundedRect(thumb_rect.adjusted(1, 1, -1, -1), 2, 2)
+
+        # 虫眼鏡ボタン（右下にオーバーレイ）
+        magnifier = self.magnifier_rect(thumb_rect)
+        hovered_magnifier = index.row() == self.magnifier_hover_row
+        painter.drawPixmap(
+            magnifier.topLeft(), self.magnifier_pixmap(hovered_magnifier, painter.device().devicePixelRatioF())
+        )
+
+        # ファイル名
+        text_top = rect.y() + self.PADDING + self.thumbnail_size + self.TEXT_SPACING
+        name_rect = QRect(rect.x() + 2, text_top, rect.width() - 4, self.name_height)
+        painter.setFont(self.name_font)
+        painter.setPen(option.palette.color(option.palette.ColorRole.Text))
+        name = self.name_metrics.elidedText(
+            image.filename, Qt.TextElideMode.ElideMiddle, name_rect.width()
+        )
+        painter.drawText(name_rect, Qt.AlignmentFlag.AlignCenter, name)
+
+        # 連番
+        number_rect = QRect(rect.x(), name_rect.bottom() + 1, rect.width(), self.number_height)
+        painter.setFont(self.number_font)
+        painter.setPen(self.number_color)
+        painter.drawText(number_rect, Qt.AlignmentFlag.AlignCenter, f"{index.row() + 1:03d}")
+
+        painter.restore()
+
+
+class SelectionMimeData(QMimeData):
+    """
+    グリッド内の並べ替え用のドラッグデータ
+
+    インデックスを文字列にせず、選択状態への参照とドラッグした行だけを持つ
+    （同じプロセス内でのみ有効）。移動する行はドロップ時に一度だけ取り出す。
+    """
+
+    MIME_TYPE = "application/x-sortsnap-selection"
+
+    def __init__(self, selection: SelectionModel, row: int):
+        """
+        Args:
+            selection: ドラッグ元の選択状態
+            row: ドラッグした行
+        """
+        super().__init__()
+        self.selection = selection
+        self.row = row
+        self.setData(self.MIME_TYPE, b"")
+
+    def rows(self) -> list[int]:
+        """移動する行（ドラッグした行が選択中なら選択中の全行、昇順）"""
+        if len(self.selection) > 1 and self.row in self.selection:
+            return self.selection.indices()
+        return [self.row]
+
+
+class ThumbnailGridView(QAbstractItemView):
+    """
+    サムネイルのグリッド表示
+
+    セルは全て同じ大きさのため、位置は行番号と列数から計算で求める
+    （QListViewのように全セルの配置を保持・再計算しない）。
+    描画・レイアウトとも表示中のセルのみで、件数によらずリサイズ・ズームのコストは一定。
+    選択状態は SelectionModel で管理し（操作は PreviewArea が行う）、
+    Qtの選択モデルは使わない。
+    """
+
+    clicked_index = pyqtSignal(int, Qt.KeyboardModifier)
+    double_clicked_index = pyqtSignal(int)  # ダブルクリックシグナル
+    preview_requested = pyqtSignal(int)  # 虫眼鏡クリック・ホバーシグナル
+    drag_started = pyqtSignal(int)
+    drop_received = pyqtSignal(int, int)  # (from_index, to_index)
+    drop_received_multiple = pyqtSignal(list, int)  # (from_indices, to_index) - 複数選択時
+
+    GRID_SPACING = 10
+    DROP_INDICATOR_WIDTH = 4
+
+    def __init__(self, parent=None, thumbnail_size: int = 200):
+        super().__init__(parent)
+
+        self.thumbnail_model = ThumbnailListModel(self)
+        self.selection = SelectionModel()
+        self.decoder = ThumbnailDecoder(self)
+        self.decoder.decoded.connect(self._on_thumbnail_decoded)
+        self.thumbnail_model.modelReset.connect(self.decoder.cancel_pending)
+        self.delegate = ThumbnailDelegate(self, thumbnail_size, self.decoder)
+        self.setModel(self.thumbnail_model)
+        self.setItemDelegate(self.delegate)
+
+        # 件数が変わったらスクロール範囲を更新（セルの位置は計算で求めるため再配置はない）
+        for signal in (
+            self.thumbnail_model.rowsInserted, self.thumbnail_model.rowsRemoved, self.thumbnail_model.rowsMoved,
+            self.thumbnail_model.layoutChanged, self.thumbnail_model.modelReset
+        ):
+            signal.connect(lambda *args: self.scheduleDelayedItemsLayout())
+
+        # グリッドの配置（列数はビューポートの幅から決まる）
+        self._grid_size = QSize(1, 1)
+        self._columns = 1
+        self._hover_row = -1
+
+        self.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setMouseTracking(True)
+        self.viewport().setAttribute(Qt.WidgetAttribute.WA_Hover)
+
+        # ドラッグ&ドロップ（並べ替えは独自に処理）
+        self.setDragEnabled(False)
+        self.setAcceptDrops(True)
+        self.setDropIndicatorShown(False)
+        self.drag_start_position = None
+        self.drag_row = -1
+        self.drop_position: tuple[int, int] = None  # 挿入位置の表示 (段, 列の境界) - ドラッグ中のみ
+        self.drop_indicator_color = QColor("#2196F3")
+
+        # ドラッグ中の自動スクロール
+        self.auto_scroll_timer = QTimer(self)
+        self.auto_scroll_timer.setInterval(DRAG_AUTO_SCROLL_INTERVAL_MS)
+        self.auto_scroll_timer.timeout.connect(self._on_auto_scroll)
+        self.auto_scroll_elapsed = QElapsedTimer()
+        self.auto_scroll_step = 0.0  # 端からの深さに応じた1回あたりのスクロール量（符号が方向）
+        self.drag_position: QPoint = None  # ドラッグ中のカーソル位置（ビューポート座標）
+
+        # クリック・ホバーの判定はビュー全体で1組のタイマーを共有する
+        # ダブルクリック検出用
+        self.click_timer = QTimer(self)
+        self.click_timer.setSingleShot(True)
+        self.click_timer.timeout.connect(self._handle_single_click)
+        self.pending_click_event = None
+
+        # ホバータイマー（虫眼鏡ホバー時に拡大表示）
+        self.hover_timer = QTimer(self)
+        self.hover_timer.setSingleShot(True)
+        self.hover_timer.timeout.connect(self._on_hover_timeout)
+
+        self._update_grid_size()
+
+    @property
+    def images(self) -> list[ImageModel]:
+        return self.thumbnail_model.images
+
+    def set_thumbnail_size(self, size: int):
+        """
+        サムネイルサイズを変更
+
+        セルを再配置するだけで、その場では生成しない（表示中のセルが描画時に
+        不足している解像度をバックグラウンドで要求する）
+        """
+        if pyramid_level(size) != pyramid_level(self.delegate.thumbnail_size):
+            # 前の解像度の生成待ちは不要
+            self.decoder.cancel_pending()
+        self.delegate.thumbnail_size = size
+        self._update_grid_size()
+
+    def _on_thumbnail_decoded(self, image: ImageModel, size: int, result):
+        """バックグラウンドでのサムネイル生成完了時"""
+        if result is None:
+            self.delegate.failed_paths.add(image.file_path)
+            return
+
+        data, width, height, _ = result
+        image.set_thumbnail_data(size, data, width, height)
+
+        row = image.index
+        if 0 <= row < len(self.images) and self.images[row] is image:
+            self.thumbnail_model.refresh_row(row)
+
+    def _update_grid_size(self):
+        """サムネイルサイズからグリッドのセルサイズを設定（先頭に表示中の画像を保って再配置）"""
+        anchor = self._anchor()
+        cell = self.delegate.cell_size()
+        self._grid_size = QSize(cell.width() + self.GRID_SPACING, cell.height() + self.GRID_SPACING)
+        self._reflow(anchor, force=True)
+
+    def gridSize(self) -> QSize:
+        """グリッドの1マスの大きさ（セル + 間隔）"""
+        return self._grid_size
+
+    def column_count(self) -> int:
+        """現在の列数"""
+        return self._columns
+
+    def _fit_columns(self) -> int:
+        """現在の幅に収まる列数"""
+        return max(1, self.viewport().width() // max(1, self._grid_size.width()))
+
+    def _anchor(self) -> tuple[int, int]:
+        """(先頭に表示中の画像の行, その段の上端からのスクロール量)"""
+        row_height = max(1, self._grid_size.height())
+        offset = self.verticalScrollBar().value()
+        return (offset // row_height) * self._columns, offset % row_height
+
+    def _reflow(self, anchor: tuple[int, int], force: bool = False):
+        """
+        列数を幅に合わせて再配置
+
+        列数が変わらない場合は何もしない（Qtが新しく見えた領域だけを描画する）。
+        列数が変わった場合も移動するセルは計算で求まるため、件数によらず一定時間で済む。
+        先頭に表示していた画像が再配置後も先頭に来るようにスクロールする。
+
+        Args:
+            anchor: _anchor() の結果（リサイズ・ズーム前に取得したもの）
+            force: 列数が同じでもセルの大きさが変わった場合など
+        """
+        columns = self._fit_columns()
+        if columns == self._columns and not force:
+            self.updateGeometries()
+            return
+
+        self._columns = columns
+        self.updateGeometries()
+
+        row, offset = anchor
+        row_height = self._grid_size.height()
+        self.verticalScrollBar().setValue((row // columns) * row_height + min(offset, row_height - 1))
+        self.viewport().update()
+
+    def _content_rect(self, row: int) -> QRect:
+        """セルの矩形（スクロール前の座標）"""
+        grid = self._grid_size
+        cell = self.delegate.cell_size()
+        column, line = row % self._columns, row // self._columns
+        return QRect(
+            column * grid.width() + (grid.width() - cell.width()) // 2,
+            line * grid.height(),
+            cell.width(),
+            cell.height()
+        )
+
+    def _rows_in(self, top: int, bottom: int) -> range:
+        """y座標（スクロール前）が top〜bottom にかかるセルの行の範囲"""
+        count = self.thumbnail_model.rowCount()
+        row_height = max(1, self._grid_size.height())
+        first = max(0, top // row_height) * self._columns
+        last = min(count, (max(0, bottom) // row_height + 1) * self._columns)
+        return range(min(first, count), last)
+
+    def visible_range(self) -> tuple[int, int]:
+        """
+        表示中の行の範囲を返す
+
+        Returns:
+            (先頭行, 末尾行)（表示中の行がない場合は (0, -1)）
+        """
+        top = self.verticalScrollBar().value()
+        rows = self._rows_in(top, top + self.viewport().height() - 1)
+        if not rows:
+            return 0, -1
+        return rows.start, rows.stop - 1
+
+    # --- QAbstractItemView の実装（位置は計算で求める） ---
+
+    def visualRect(self, index: QModelIndex) -> QRect:
+        if not index.isValid():
+            return QRect()
+        return self._content_rect(index.row()).translated(0, -self.verticalOffset())
+
+    def indexAt(self, point: QPoint) -> QModelIndex:
+        x, y = point.x(), point.y() + self.verticalOffset()
+        grid = self._grid_size
+        if x < 0 or y < 0 or x >= grid.width() * self._columns:
+            return QModelIndex()
+
+        row = (y // grid.height()) * self._columns + x // grid.width()
+        if row >= self.thumbnail_model.rowCount() or not self._content_rect(row).contains(x, y):
+            return QModelIndex()
+        return self.thumbnail_model.index(row)
+
+    def scrollTo(self, index: QModelIndex, hint=QAbstractItemView.ScrollHint.EnsureVisible):
+        if not index.isValid():
+            return
+        rect = self._content_rect(index.row())
+        scroll_bar = self.verticalScrollBar()
+        height = self.viewport().height()
+        if hint == QAbstractItemView.ScrollHint.PositionAtTop:
+            scroll_bar.setValue(rect.top())
+        elif hint == QAbstractItemView.ScrollHint.PositionAtBottom:
+            scroll_bar.setValue(rect.bottom() - height + 1)
+        elif hint == QAbstractItemView.ScrollHint.PositionAtCenter:
+            scroll_bar.setValue(rect.center().y() - height // 2)
+        elif rect.top() < scroll_bar.value():
+            scroll_bar.setValue(rect.top())
+        elif rect.bottom() >= scroll_bar.value() + height:
+            scroll_bar.setValue(rect.bottom() - height + 1)
+
+    def moveCursor(self, action, modifiers) -> QModelIndex:
+        count = self.thumbnail_model.rowCount()
+        if count == 0:
+            return QModelIndex()
+
+        current = self.currentIndex().row() if self.currentIndex().isValid() else 0
+        page = max(1, self.viewport().height() // max(1, self._grid_size.height())) * self._columns
+        steps = {
+            QAbstractItemView.CursorAction.MoveLeft: -1,
+            QAbstractItemView.CursorAction.MoveRight: 1,
+            QAbstractItemView.CursorAction.MoveUp: -self._columns,
+            QAbstractItemView.CursorAction.MoveDown: self._columns,
+            QAbstractItemView.CursorAction.MovePageUp: -page,
+            QAbstractItemView.CursorAction.MovePageDown: page,
+            QAbstractItemView.CursorAction.MoveHome: -count,
+            QAbstractItemView.CursorAction.MoveEnd: count,
+        }
+        row = max(0, min(count - 1, current + steps.get(action, 0)))
+        return self.thumbnail_model.index(row)
+
+    def horizontalOffset(self) -> int:
+        return 0
+
+    def verticalOffset(self) -> int:
+        return self.verticalScrollBar().value()
+
+    def isIndexHidden(self, index: QModelIndex) -> bool:
+        return False
+
+    def setSelection(self, rect: QRect, command):
+        # 選択は SelectionModel で管理する
+        pass
+
+    def visualRegionForSelection(self, selection) -> QRegion:
+        return QRegion()
+
+    def updateGeometries(self):
+        """スクロール範囲を件数と列数から設定"""
+        count = self.thumbnail_model.rowCount()
+        row_height = self._grid_size.height()
+        lines = -(-count // self._columns)
+        height = self.viewport().height()
+
+        scroll_bar = self.verticalScrollBar()
+        scroll_bar.setSingleStep(max(1, row_height // 4))
+        scroll_bar.setPageStep(height)
+        scroll_bar.setRange(0, max(0, lines * row_height - height))
+        super().updateGeometries()
+
+    def resizeEvent(self, event):
+        """リサイズ時（列数が変わった場合のみ再配置）"""
+        anchor = self._anchor()
+        super().resizeEvent(event)
+        self._reflow(anchor)
+
+    def paintEvent(self, event):
+        """表示中のセルのうち再描画が必要な範囲だけを描画"""
+        area = event.rect()
+        offset = self.verticalOffset()
+        rows = self._rows_in(area.top() + offset, area.bottom() + offset)
+        if not rows:
+            return
+
+        option = QStyleOptionViewItem()
+        self.initViewItemOption(option)
+        base_state = option.state
+
+        painter = QPainter(self.viewport())
+        for row in rows:
+            rect = self._content_rect(row).translated(0, -offset)
+            if not rect.intersects(area):
+                continue
+            option.rect = rect
+            option.state = base_state
+            if row == self._hover_row:
+                option.state |= QStyle.StateFlag.State_MouseOver
+            self.delegate.paint(painter, option, self.thumbnail_model.index(row))
+
+        # ドロップ時の挿入位置
+        if self.drop_position is not None:
+            indicator = self._drop_indicator_rect()
+            if indicator.intersects(area):
+                painter.fillRect(indicator, self.drop_indicator_color)
+        painter.end()
+
+    def viewportEvent(self, event) -> bool:
+        """
+        ホバーの追跡（セル背景のハイライト・虫眼鏡ボタン）
+
+        全セルのホバーをビューポートのイベントだけで判定する（セルごとのタイマー・
+        イベント処理は持たない）。ボタンを押している間（ドラッグ準備中）は虫眼鏡を反応させない。
+        """
+        event_type = event.type()
+        if event_type in (QEvent.Type.HoverEnter, QEvent.Type.HoverMove):
+            pos = event.position().toPoint()
+            self._set_hover_row(self._row_at(pos))
+            if not QApplication.mouseButtons() & Qt.MouseButton.LeftButton:
+                self._set_magnifier_hover(self._magnifier_row_at(pos))
+        elif event_type == QEvent.Type.HoverLeave:
+            self._set_hover_row(-1)
+            self._set_magnifier_hover(-1)
+        return super().viewportEvent(event)
+
+    def _set_hover_row(self, row: int):
+        """ホバー中のセルを更新（前後のセルのみ再描画）"""
+        previous = self._hover_row
+        if row == previous:
+            return
+        self._hover_row = row
+        for changed in (previous, row):
+            if 0 <= changed < self.thumbnail_model.rowCount():
+                self.viewport().update(self.visualRect(self.thumbnail_model.index(changed)))
+
+    def update_rows(self, rows: set[int]):
+        """
+        指定行のうち表示中のセルだけを再描画
+
+        Args:
+            rows: 再描画する行の集合
+        """
+        first, last = self.visible_range()
+        if len(rows) > last - first + 1:
+            # 全選択などで件数が多い場合は表示範囲の方を走査
+            targets = [row for row in range(first, last + 1) if row in rows]
+        else:
+            targets = [row for row in rows if first <= row <= last]
+
+        viewport = self.viewport()
+        for row in targets:
+            viewport.update(self.visualRect(self.thumbnail_model.index(row)))
+
+    def _row_at(self, pos: QPoint) -> int:
+        """座標にあるセルの行（ない場合は-1）"""
+        index = self.indexAt(pos)
+        return index.row() if index.isValid() else -1
+
+    def _magnifier_row_at(self, pos: QPoint) -> int:
+        """座標にある虫眼鏡ボタンの行（ない場合は-1）"""
+        row = self._row_at(pos)
+        if row < 0:
+            return -1
+        thumb_rect = self.delegate.thumbnail_rect(self.visualRect(self.thumbnail_model.index(row)), self.images[row].thumbnail)
+        return row if self.delegate.magnifier_rect(thumb_rect).contains(pos) else -1
+
+    def _set_magnifier_hover(self, row: int):
+        """虫眼鏡のホバー状態を更新"""
+        previous = self.delegate.magnifier_hover_row
+        if row == previous:
+            return
+
+        self.delegate.magnifier_hover_row = row
+        for changed in (previous, row):
+            if changed >= 0:
+                self.viewport().update(self.visualRect(self.thumbnail_model.index(changed)))
+
+        if row >= 0:
+            self.hover_timer.start(500)  # 500ms後にプレビュー表示
+        else:
+            self.hover_timer.stop()
+
+    def _on_hover_timeout(self):
+        """虫眼鏡ホバーが続いた場合"""
+        if self.delegate.magnifier_hover_row >= 0:
+            self.preview_requested.emit(self.delegate.magnifier_hover_row)
+
+    def mousePressEvent(self, event):
+        """マウス押下時"""
+        if event.button() != Qt.MouseButton.LeftButton:
+            return
+
+        pos = event.position().toPoint()
+        row = self._row_at(pos)
+        self.drag_start_position = None
+        self.setFocus()
+        if row < 0:
+            return
+
+        # 虫眼鏡ボタン
+        if self._magnifier_row_at(pos) == row:
+            self.preview_requested.emit(row)
+            return
+
+        self.drag_start_position = pos
+        self.drag_row = row
+
+        # ダブルクリック検出のため、シングルクリックを遅延処理
+        if self.click_timer.isActive():
+            # 既にタイマーが動いている = ダブルクリック
+            self.click_timer.stop()
+            self.double_clicked_index.emit(row)
+            self.pending_click_event = None
+        else:
+            # シングルクリックの可能性
+            self.pending_click_event = (row, QApplication.keyboardModifiers())
+            self.click_timer.start(QApplication.doubleClickInterval())
+
+    def mouseDoubleClickEvent(self, event):
+        """ダブルクリック時（2回目の押下として処理）"""
+        self.mousePressEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        """マウスリリース時"""
+        self.drag_start_position = None
+
+    def _handle_single_click(self):
+        """シングルクリック処理（ダブルクリックでなかった場合）"""
+        if self.pending_click_event:
+            row, modifiers = self.pending_click_event
+            self.pending_click_event = None
+            self.clicked_index.emit(row, modifiers)
+
+    def mouseMoveEvent(self, event):
+        """マウス移動時（ドラッグ開始の判定、ホバーは viewportEvent で処理）"""
+        if not (event.buttons() & Qt.MouseButton.LeftButton) or self.drag_start_position is None:
+            return
+
+        pos = event.position().toPoint()
+
+        # ドラッグ距離チェック
+        if (pos - self.drag_start_position).manhattanLength() < QApplication.startDragDistance():
+            return
+
+        self.drag_start_position = None
+        self._start_drag(self.drag_row)
+
+    def _start_drag(self, row: int):
+        """ドラッグ開始"""
+        # ダブルクリック待機中ならキャンセル
+        if self.click_timer.isActive():
+            self.click_timer.stop()
+            self.pending_click_event = None
+
+        self.drag_started.emit(row)
+
+        drag = QDrag(self)
+
+        # 複数選択されている場合は選択中の全行を移動（インデックスの列挙はドロップ時に一度だけ）
+        drag.setMimeData(SelectionMimeData(self.selection, row))
+
+        # ドラッグ時のプレビュー画像
+        thumbnail = self.images[row].thumbnail
+        if thumbnail:
+            pixmap = thumbnail.scaled(100, 100, Qt.AspectRatioMode.KeepAspectRatio)
+            drag.setPixmap(pixmap)
+            drag.setHotSpot(QPoint(pixmap.width() // 2, pixmap.height() // 2))
+
+        drag.exec(Qt.DropAction.MoveAction)
+
+        # キャンセル時など、ドロップされずに終わった場合の後始末
+        self._end_drag_feedback()
+
+    def _accepts_drag(self, event) -> bool:
+        """グリッド内の並べ替えのドラッグか"""
+        return event.source() is self and isinstance(event.mimeData(), SelectionMimeData)
+
+    def dragEnterEvent(self, event):
+        """ドラッグ侵入時"""
+        if self._accepts_drag(event):
+            event.acceptProposedAction()
+            self._update_drag_position(event.position().toPoint())
+        else:
+            event.ignore()
+
+    def dragMoveEvent(self, event):
+        """ドラッグ移動時（挿入位置の表示・端での自動スクロール）"""
+        if self._accepts_drag(event):
+            event.acceptProposedAction()
+            self._update_drag_position(event.position().toPoint())
+        else:
+            event.ignore()
+
+    def dragLeaveEvent(self, event):
+        """ドラッグがビューから出た時"""
+        self._end_drag_feedback()
+        super().dragLeaveEvent(event)
+
+    def dropEvent(self, event):
+        """ドロップ時（挿入位置に移動）"""
+        if not self._accepts_drag(event):
+            event.ignore()
+            return
+
+        gap = self._insertion_at(event.position().toPoint())[0]
+        self._end_drag_feedback()
+
+        rows = event.mimeData().rows()
+        if len(rows) > 1:
+            # 移動先は取り出す前の位置で指定する
+            self.drop_received_multiple.emit(rows, gap)
+        else:
+            # 単一の場合は移動後の位置で指定する
+            from_index = rows[0]
+            self.drop_received.emit(from_index, gap if gap <= from_index else gap - 1)
+
+        event.acceptProposedAction()
+
+    def _insertion_at(self, pos: QPoint) -> tuple[int, int, int]:
+        """
+        座標に対応する挿入位置
+
+        Args:
+            pos: ビューポート座標
+
+        Returns:
+            (挿入位置（この行の前に挿入、末尾は件数）, 段, 列の境界（0〜列数）)
+        """
+        count = self.thumbnail_model.rowCount()
+        grid = self._grid_size
+        line = max(0, (pos.y() + self.verticalOffset()) // grid.height())
+        column = max(0, min(self._columns, round(pos.x() / grid.width())))
+
+        gap = line * self._columns + column
+        if gap >= count:
+            # 末尾より後ろは最後のセルの直後
+            gap = count
+            line, column = divmod(count, self._columns)
+            if column == 0 and line > 0:
+                line, column = line - 1, self._columns
+        return gap, line, column
+
+    def _drop_indicator_rect(self) -> QRect:
+        """挿入位置の表示（セルの間の縦線）の矩形"""
+        line, column = self.drop_position
+        x = column * self._grid_size.width() - self.DROP_INDICATOR_WIDTH // 2
+        x = max(0, min(self.viewport().width() - self.DROP_INDICATOR_WIDTH, x))
+        y = line * self._grid_size.height() - self.verticalOffset()
+        return QRect(x, y, self.DROP_INDICATOR_WIDTH, self.delegate.cell_size().height())
+
+    def _set_drop_position(self, position: tuple[int, int] | None):
+        """挿入位置の表示を更新（前後の表示部分のみ再描画）"""
+        if position == self.drop_position:
+            return
+        if self.drop_position is not None:
+            self.viewport().update(self._drop_indicator_rect())
+        self.drop_position = position
+        if position is not None:
+            self.viewport().update(self._drop_indicator_rect())
+
+    def _update_drag_position(self, pos: QPoint):
+        """ドラッグ中のカーソル位置から挿入位置と自動スクロールを更新"""
+        self.drag_position = pos
+        self._set_drop_position(self._insertion_at(pos)[1:])
+
+        # 上下端からの深さ（0〜1）に応じてスクロール量を決める
+        height = self.viewport().height()
+        margin = min(DRAG_AUTO_SCROLL_MARGIN, height // 4)
+        if pos.y() < margin:
+            depth = (margin - pos.y()) / max(1, margin)
+            direction = -1
+        elif pos.y() >= height - margin:
+            depth = (pos.y() - (height - margin) + 1) / max(1, margin)
+            direction = 1
+        else:
+            self._stop_auto_scroll()
+            return
+
+        depth = min(1.0, depth)
+        speed = DRAG_AUTO_SCROLL_MIN_SPEED + (DRAG_AUTO_SCROLL_MAX_SPEED - DRAG_AUTO_SCROLL_MIN_SPEED) * depth
+        if not self.auto_scroll_timer.isActive() or (self.auto_scroll_step > 0) != (direction > 0):
+            # 端に入った（または反対側の端に移った）時点から加速を数える
+            self.auto_scroll_elapsed.start()
+            self.auto_scroll_timer.start()
+        self.auto_scroll_step = direction * speed
+
+    def _on_auto_scroll(self):
+        """自動スクロール（端に留まっている時間に応じて加速）"""
+        progress = min(1.0, self.auto_scroll_elapsed.elapsed() / DRAG_AUTO_SCROLL_ACCEL_MS)
+        boost = 1 + (DRAG_AUTO_SCROLL_MAX_BOOST - 1) * progress
+
+        scroll_bar = self.verticalScrollBar()
+        before = scroll_bar.value()
+        scroll_bar.setValue(before + round(self.auto_scroll_step * boost))
+        if scroll_bar.value() == before:
+            return
+
+        # カーソルは動いていなくても下のセルが変わるため挿入位置を更新
+        if self.drag_position is not None:
+            self._set_drop_position(self._insertion_at(self.drag_position)[1:])
+
+    def _stop_auto_scroll(self):
+        """自動スクロールを停止"""
+        self.auto_scroll_timer.stop()
+        self.auto_scroll_step = 0.0
+
+    def _end_drag_feedback(self):
+        """挿入位置の表示と自動スクロールを終了"""
+        self._stop_auto_scroll()
+        self._set_drop_position(None)
+        self.drag_position = None
+
+    def keyPressEvent(self, event):
+        """キーボードイベント（削除・選択操作は PreviewArea に任せる）"""
+        key = event.key()
+        ctrl = event.modifiers() & Qt.KeyboardModifier.ControlModifier
+        if key in (Qt.Key.Key_Delete, Qt.Key.Key_Space, Qt.Key.Key_Escape) or \
+                (ctrl and key in (Qt.Key.Key_A, Qt.Key.Key_D)):
+            event.ignore()
+            return
+        super().keyPressEvent(event)